@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""애니메이션 WebP 테스트"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from webp_converter import ConversionEngine, ConversionOptions, EncodeStats, iter_jpg_bytes
+
+COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (0, 255, 255)]
+
+
+def animated_webp():
+    frames = [Image.new('RGB', (32, 32), color) for color in COLORS]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, 'WEBP', save_all=True, append_images=frames[1:], duration=50,
+                   lossless=True)
+    return buffer.getvalue()
+
+
+def center_color(data):
+    with Image.open(io.BytesIO(data)) as img:
+        return img.getpixel((img.width // 2, img.height // 2))
+
+
+def close_to(actual, expected):
+    return all(abs(a - b) <= 8 for a, b in zip(actual, expected))
+
+
+def test_first_frame_by_default():
+    [(size, frame, data)] = iter_jpg_bytes(animated_webp())
+    assert frame is None
+    assert close_to(center_color(data), COLORS[0])
+
+
+def test_frame_number():
+    [(size, frame, data)] = iter_jpg_bytes(animated_webp(), ConversionOptions(frames=3))
+    assert close_to(center_color(data), COLORS[2])
+    with pytest.raises(ValueError):
+        list(iter_jpg_bytes(animated_webp(), ConversionOptions(frames=9)))
+
+
+def test_all_frames_in_order():
+    """모든 프레임을 여러 스레드로 인코딩해도 순서대로, 첫 프레임은 대표 이미지로도"""
+    stats = EncodeStats()
+    options = ConversionOptions(frames='all', frame_threads=3)
+
+    outputs = list(iter_jpg_bytes(animated_webp(), options, stats))
+
+    assert [frame for size, frame, data in outputs] == [None, 0, 1, 2, 3, 4]
+    for (size, frame, data), color in zip(outputs[1:], COLORS):
+        assert close_to(center_color(data), color)
+    assert stats.animations == 1 and stats.frames == 5
+
+
+def test_contact_sheet():
+    """프레임 5개는 3 x 2 격자 한 장, 남는 칸은 배경색"""
+    [(size, frame, data)] = iter_jpg_bytes(animated_webp(), ConversionOptions(frames='sheet'))
+    with Image.open(io.BytesIO(data)) as img:
+        assert img.size == (96, 64)
+        assert close_to(img.getpixel((16 + 32, 16 + 32)), COLORS[4])
+        assert close_to(img.getpixel((16 + 64, 16 + 32)), (255, 255, 255))
+
+
+def test_engine_writes_frame_files(tmp_path):
+    (tmp_path / 'a.webp').write_bytes(animated_webp())
+    output = tmp_path / 'out'
+
+    ConversionEngine(output, emit=lambda *args: None,
+                     options=ConversionOptions(frames='all')).convert_items([tmp_path / 'a.webp'])
+
+    assert sorted(path.name for path in output.iterdir()) == \
+        ['a.jpg'] + [f'a_f{frame:04d}.jpg' for frame in range(1, 6)]
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""중첩 아카이브 변환 테스트"""
+
+import io
+import tarfile
+import threading
+import zipfile
+
+import pytest
+from PIL import Image
+
+import webp_converter
+from webp_converter import ConversionEngine
+
+
+def webp_bytes(color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (16, 16), color).save(buffer, 'WEBP')
+    return buffer.getvalue()
+
+
+def zip_bytes(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_zip_with_only_nested_archive(tmp_path, jobs):
+    """WebP 없이 안쪽 ZIP 만 있는 ZIP 도 변환"""
+    bundle = tmp_path / 'bundle.zip'
+    bundle.write_bytes(zip_bytes({'inner.zip': zip_bytes({'a.webp': webp_bytes()})}))
+    output = tmp_path / 'out'
+
+    engine = ConversionEngine(output, emit=lambda *args: None, jobs=jobs)
+    summary = engine.convert_items([str(bundle)])
+
+    assert summary.successful_count == 1
+    assert not summary.failed_files
+    with zipfile.ZipFile(output / 'bundle.zip') as zf:
+        assert zf.namelist() == ['inner.zip']
+        with zipfile.ZipFile(io.BytesIO(zf.read('inner.zip'))) as inner:
+            assert inner.namelist() == ['a.jpg']
+
+
+@pytest.mark.parametrize('name', ['big.zip', 'big.tar.gz'])
+def test_cancel_between_members(tmp_path, monkeypatch, name):
+    """중단 요청이 있으면 아카이브 멤버 사이에서 멈추고 임시 출력을 지움"""
+    source = tmp_path / name
+    members = {f'p{index}.webp': webp_bytes() for index in range(3)}
+    if name.endswith('.zip'):
+        source.write_bytes(zip_bytes(members))
+        convert = webp_converter.convert_zip_stream
+    else:
+        with tarfile.open(source, 'w:gz') as tf:
+            for member, data in members.items():
+                info = tarfile.TarInfo(member)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+        convert = webp_converter.convert_tar_stream
+    cancel = threading.Event()
+    cancel.set()
+    monkeypatch.setattr(webp_converter, 'cancel_request', cancel)
+    output = tmp_path / 'out' / name
+    output.parent.mkdir()
+
+    with pytest.raises(webp_converter.ConversionCancelled):
+        convert(source, output)
+    assert list(output.parent.iterdir()) == []
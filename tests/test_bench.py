@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""벤치마크 도구 테스트"""
+
+import random
+import zipfile
+
+import pytest
+from PIL import Image
+
+import webp_bench
+from webp_bench import load_corpus, make_synthetic_image, percentile
+
+SMALL_CORPUS = (
+    ('photo', 4, (64, 48), 'RGB', {'quality': 80}, 1),
+    ('animated', 2, (32, 24), 'RGBA', {'quality': 80}, 3),
+)
+
+
+@pytest.mark.parametrize('fraction, expected', [(0.5, 2), (0.95, 4), (1.0, 4), (0.0, 1)])
+def test_percentile(fraction, expected):
+    assert percentile([1, 2, 3, 4], fraction) == expected
+
+
+def test_percentile_empty():
+    assert percentile([], 0.5) is None
+
+
+def test_synthetic_image_reproducible():
+    first = make_synthetic_image(random.Random(3), (32, 16), 'RGBA')
+    second = make_synthetic_image(random.Random(3), (32, 16), 'RGBA')
+    assert first.mode == 'RGBA' and first.tobytes() == second.tobytes()
+
+
+def test_generate_corpus(tmp_path, monkeypatch):
+    """배율만큼 파일을 만들고, 같은 설정이면 다시 만들지 않음"""
+    monkeypatch.setattr(webp_bench, 'CORPUS', SMALL_CORPUS)
+    monkeypatch.setattr(webp_bench, 'ZIP_CORPUS', ('many_small', 10, (16, 16)))
+
+    manifest = load_corpus(tmp_path, scale=0.5)
+
+    assert {name: category['files'] for name, category in manifest['categories'].items()} == \
+        {'photo': 2, 'animated': 1, 'many_small': 5}
+    with Image.open(tmp_path / 'images' / 'animated_0000.webp') as img:
+        assert img.n_frames == 3
+    with zipfile.ZipFile(tmp_path / 'archives' / 'many_small.zip') as zf:
+        assert len(zf.namelist()) == 5
+
+    (tmp_path / 'images' / 'photo_0000.webp').unlink()
+    assert load_corpus(tmp_path, scale=0.5) == manifest
+    assert not (tmp_path / 'images' / 'photo_0000.webp').exists()
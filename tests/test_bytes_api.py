@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""메모리 바이트 변환 API 테스트"""
+
+import io
+import mmap
+
+import pytest
+from PIL import Image, UnidentifiedImageError
+
+from webp_converter import (ConversionOptions, EncodeStats, convert_bytes, convert_into,
+                            iter_convert_bytes)
+
+
+def webp_bytes(size=(32, 24), color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'WEBP')
+    return buffer.getvalue()
+
+
+def test_buffer_types_give_same_jpg(tmp_path):
+    """bytes, bytearray, memoryview, mmap 모두 같은 JPG"""
+    data = webp_bytes()
+    path = tmp_path / 'a.webp'
+    path.write_bytes(data)
+    expected = convert_bytes(data)
+
+    assert convert_bytes(bytearray(data)) == expected
+    assert convert_bytes(memoryview(data)) == expected
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert convert_bytes(mapped) == expected
+    with Image.open(io.BytesIO(expected)) as img:
+        assert img.format == 'JPEG' and img.size == (32, 24)
+
+
+def test_convert_into_reuses_output():
+    """같은 BytesIO 를 다시 넘기면 처음부터 덮어쓰고 남는 부분은 잘라냄"""
+    output = io.BytesIO()
+    large = convert_into(webp_bytes((200, 200)), output)
+    small = convert_into(webp_bytes((8, 8)), output)
+
+    assert small < large
+    assert output.getvalue() == convert_bytes(webp_bytes((8, 8)))
+
+
+def test_first_output_only():
+    """크기가 여러 개면 가장 큰 크기 하나만"""
+    options = ConversionOptions(sizes=(16, 8))
+    with Image.open(io.BytesIO(convert_bytes(webp_bytes(), options=options))) as img:
+        assert img.size == (16, 12)
+
+
+def test_iter_convert_bytes_continues_after_error():
+    stats = EncodeStats()
+    results = list(iter_convert_bytes([webp_bytes(), b'not a webp', webp_bytes()], stats=stats))
+
+    assert [error is None for data, error in results] == [True, False, True]
+    assert results[1] == (None, "이미지 형식을 인식할 수 없습니다")
+    assert stats.images == 2 and len(stats.latencies) == 2
+
+
+def test_unknown_format_message():
+    with pytest.raises(UnidentifiedImageError, match="이미지 형식을 인식할 수 없습니다"):
+        convert_bytes(memoryview(b'not a webp'))
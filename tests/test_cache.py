@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""증분 변환 매니페스트 테스트"""
+
+import os
+import sqlite3
+
+from PIL import Image
+
+from webp_cache import MANIFEST_NAME, ConversionCache
+from webp_converter import ConversionEngine
+
+
+def make_folder(folder, count):
+    folder.mkdir()
+    for index in range(count):
+        Image.new('RGB', (8, 8), (index % 256, 0, 0)).save(folder / f'p{index:03}.webp')
+
+
+def manifest_count(output):
+    with sqlite3.connect(output / MANIFEST_NAME) as connection:
+        return connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def quiet(*args):
+    pass
+
+
+def test_unchanged_files_skipped(tmp_path):
+    """두 번째 실행은 바뀐 파일만 변환"""
+    source, output = tmp_path / 'in', tmp_path / 'out'
+    make_folder(source, 5)
+    ConversionEngine(output, emit=quiet, incremental=True).convert_items([source])
+    os.utime(source / 'p002.webp', ns=(0, 10 ** 9))
+
+    summary = ConversionEngine(output, emit=quiet, incremental=True).convert_items([source])
+
+    assert summary.converted_images == 1
+    assert summary.skipped_images == 4
+
+
+def test_cancel_keeps_manifest(tmp_path):
+    """중단된 증분 실행은 아직 스캔하지 않은 파일의 기록을 지우지 않음"""
+    source, output = tmp_path / 'in', tmp_path / 'out'
+    make_folder(source, 200)
+    ConversionEngine(output, emit=quiet, incremental=True).convert_items([source])
+    assert manifest_count(output) == 200
+    # 앞쪽 파일이 바뀌어야 스캔이 끝까지 가기 전에 중단됨
+    for index in range(150):
+        os.utime(source / f'p{index:03}.webp', ns=(0, 10 ** 9))
+
+    def cancel_on_first_image(message_type, data):
+        if message_type == 'log' and '→' in data:
+            engine.cancel()
+
+    engine = ConversionEngine(output, emit=cancel_on_first_image, incremental=True, readers=0)
+    summary = engine.convert_items([source])
+
+    assert summary.cancelled
+    assert manifest_count(output) == 200
+
+
+def test_evict_missing_after_full_run(tmp_path):
+    """끝까지 실행하면 사라진 원본의 기록은 정리"""
+    source, output = tmp_path / 'in', tmp_path / 'out'
+    make_folder(source, 3)
+    ConversionEngine(output, emit=quiet, incremental=True).convert_items([source])
+    (source / 'p001.webp').unlink()
+
+    ConversionEngine(output, emit=quiet, incremental=True).convert_items([source])
+
+    cache = ConversionCache(output, None)
+    try:
+        assert sorted(os.path.basename(key) for key in cache.entries) == ['p000.webp', 'p002.webp']
+    finally:
+        cache.close()
+
+
+def test_hash_check_skips_touched_file(tmp_path):
+    """수정 시간만 바뀐 파일은 내용 해시가 같으면 건너뜀"""
+    source, output = tmp_path / 'in', tmp_path / 'out'
+    make_folder(source, 2)
+    ConversionEngine(output, emit=quiet, incremental=True, hash_check=True).convert_items([source])
+    os.utime(source / 'p000.webp', ns=(0, 10 ** 9))
+
+    summary = ConversionEngine(output, emit=quiet, incremental=True,
+                               hash_check=True).convert_items([source])
+
+    assert summary.converted_images == 0
+    assert summary.skipped_images == 2
+
+
+def test_settings_change_or_missing_output_converts(tmp_path):
+    """변환 설정이 바뀌거나 출력이 지워진 입력은 다시 변환"""
+    source, output = tmp_path / 'in', tmp_path / 'out'
+    make_folder(source, 1)
+    webp, jpg = source / 'p000.webp', output / 'in' / 'p000.jpg'
+    cache = ConversionCache(tmp_path, 'standard')
+    try:
+        assert not cache.is_fresh(webp, jpg)
+        jpg.parent.mkdir(parents=True)
+        jpg.write_bytes(b'jpg')
+        cache.record(webp, jpg)
+        assert cache.is_fresh(webp, jpg)
+        cache.settings_key = 'web'
+        assert not cache.is_fresh(webp, jpg)
+        cache.settings_key = 'standard'
+        jpg.unlink()
+        assert not cache.is_fresh(webp, jpg)
+    finally:
+        cache.close()
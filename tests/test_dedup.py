@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""중복 입력 제거 테스트"""
+
+import os
+
+from PIL import Image
+
+import webp_dedup
+from webp_converter import ConversionEngine, ConversionOptions
+from webp_dedup import QUICK_HASH_BYTES, clone_file, group_duplicates
+
+
+def test_group_duplicates(tmp_path):
+    """내용이 같은 파일만 입력 순서대로 묶음 (크기가 같아도 내용이 다르면 제외)"""
+    paths = []
+    for name, data in [('a', b'same'), ('b', b'diff'), ('c', b'same'), ('d', b'other data')]:
+        (tmp_path / name).write_bytes(data)
+        paths.append(str(tmp_path / name))
+
+    assert group_duplicates(paths + [str(tmp_path / 'missing')]) == [[paths[0], paths[2]]]
+
+
+def test_quick_hash_collision_checked(tmp_path):
+    """앞/뒤가 같고 가운데만 다른 큰 파일은 전체 해시로 구분"""
+    edge = b'x' * QUICK_HASH_BYTES
+    (tmp_path / 'a').write_bytes(edge + b'1' * 10 + edge)
+    (tmp_path / 'b').write_bytes(edge + b'2' * 10 + edge)
+
+    assert group_duplicates([str(tmp_path / 'a'), str(tmp_path / 'b')]) == []
+
+
+def test_clone_falls_back_to_copy(tmp_path, monkeypatch):
+    """reflink 를 지원하지 않으면 복사, hardlink 는 같은 inode"""
+    source = tmp_path / 'source.jpg'
+    source.write_bytes(b'jpg data')
+
+    def unsupported(source, target):
+        raise OSError("not supported")
+
+    monkeypatch.setattr(webp_dedup, 'reflink_file', unsupported)
+    assert clone_file(source, tmp_path / 'copy' / 'a.jpg') == 'copy'
+    assert (tmp_path / 'copy' / 'a.jpg').read_bytes() == b'jpg data'
+
+    assert clone_file(source, tmp_path / 'link.jpg', mode='hardlink') == 'hardlink'
+    assert os.path.samefile(source, tmp_path / 'link.jpg')
+
+
+def test_engine_encodes_duplicates_once(tmp_path):
+    """같은 내용의 입력은 한 번만 인코딩하고 나머지는 복제"""
+    source = tmp_path / 'in'
+    (source / 'sub').mkdir(parents=True)
+    Image.new('RGB', (8, 8), 'red').save(source / 'a.webp')
+    (source / 'sub' / 'b.webp').write_bytes((source / 'a.webp').read_bytes())
+    output = tmp_path / 'out'
+
+    engine = ConversionEngine(output, emit=lambda *args: None,
+                              options=ConversionOptions(dedup=True, dedup_link='copy'))
+    summary = engine.convert_items([source])
+
+    assert summary.converted_images == 2
+    assert summary.encodes_saved == 1
+    assert (output / 'in' / 'a.jpg').read_bytes() == (output / 'in' / 'sub' / 'b.jpg').read_bytes()
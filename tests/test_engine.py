@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""변환 엔진 / CLI 테스트"""
+
+import signal
+import zipfile
+
+from PIL import Image
+
+import webp2jpg
+from webp_converter import ConversionEngine
+
+
+def quiet(*args):
+    pass
+
+
+def make_inputs(tmp_path):
+    source = tmp_path / 'in'
+    (source / 'sub').mkdir(parents=True)
+    Image.new('RGB', (8, 8), 'red').save(source / 'a.webp')
+    Image.new('RGBA', (8, 8), (0, 0, 255, 128)).save(source / 'sub' / 'b.webp')
+    Image.new('RGB', (8, 8), 'green').save(tmp_path / 'single.webp')
+    return source, tmp_path / 'single.webp'
+
+
+def test_folder_and_file(tmp_path):
+    """폴더 구조를 유지해서 변환하고 단일 WebP 는 출력 폴더 바로 아래에"""
+    source, single = make_inputs(tmp_path)
+    output = tmp_path / 'out'
+
+    summary = ConversionEngine(output, emit=quiet).convert_items([source, single])
+
+    assert summary.successful_count == 2
+    assert summary.converted_images == 3
+    assert not summary.failed_files
+    for path in ('in/a.jpg', 'in/sub/b.jpg', 'single.jpg'):
+        with Image.open(output / path) as img:
+            assert img.format == 'JPEG' and img.mode == 'RGB'
+
+
+def test_broken_input_reported(tmp_path):
+    """깨진 WebP 는 실패로 기록하고 나머지는 계속 변환"""
+    source, _ = make_inputs(tmp_path)
+    (source / 'broken.webp').write_bytes(b'not a webp')
+
+    summary = ConversionEngine(tmp_path / 'out', emit=quiet).convert_items([source])
+
+    assert summary.converted_images == 2
+    assert summary.failed_images == 1
+
+
+def test_cli_convert(tmp_path, monkeypatch):
+    """convert 명령은 성공하면 0, 출력 ZIP 에 JPG 멤버"""
+    monkeypatch.setattr(signal, 'signal', lambda *args: None)
+    bundle = tmp_path / 'bundle.zip'
+    with zipfile.ZipFile(bundle, 'w') as zf:
+        with zf.open('x.webp', 'w') as member:
+            Image.new('RGB', (8, 8), 'red').save(member, 'WEBP')
+    output = tmp_path / 'out'
+
+    assert webp2jpg.main(['convert', str(bundle), '-o', str(output), '--jobs', '1']) == 0
+
+    with zipfile.ZipFile(output / 'bundle.zip') as zf:
+        assert zf.namelist() == ['x.jpg']
+
+
+def test_cli_missing_source(tmp_path, monkeypatch):
+    """변환한 것이 없으면 0 이 아닌 종료 코드"""
+    monkeypatch.setattr(signal, 'signal', lambda *args: None)
+    code = webp2jpg.main(['convert', str(tmp_path / 'none'), '-o', str(tmp_path / 'out')])
+    assert code != 0
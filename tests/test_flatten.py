@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""알파 합성 테스트"""
+
+import random
+
+import pytest
+from PIL import Image
+
+from webp_bench import legacy_flatten
+from webp_converter import flatten_alpha
+
+
+def noisy_rgba(size=32):
+    rng = random.Random(1)
+    img = Image.new('RGBA', (size, size))
+    img.putdata([tuple(rng.randrange(256) for _ in range(4)) for _ in range(size * size)])
+    return img
+
+
+def test_rgba_matches_legacy():
+    """이전 방식 (split 마스크) 과 픽셀이 같음"""
+    img = noisy_rgba()
+    assert flatten_alpha(img).tobytes() == legacy_flatten(img).tobytes()
+
+
+def test_rgb_returned_as_is():
+    img = Image.new('RGB', (4, 4), 'red')
+    assert flatten_alpha(img) is img
+
+
+@pytest.mark.parametrize('mode', ['P', 'L'])
+def test_transparency_uses_background(mode):
+    """투명색이 지정된 P/L 이미지도 배경색으로 합성"""
+    img = Image.new(mode, (4, 4), 0)
+    img.info['transparency'] = 0
+
+    result = flatten_alpha(img, background=(10, 20, 30))
+
+    assert result.mode == 'RGB'
+    assert result.getpixel((0, 0)) == (10, 20, 30)
+
+
+def test_la_background():
+    img = Image.new('LA', (4, 4), (200, 0))
+    assert flatten_alpha(img, background=(1, 2, 3)).getpixel((0, 0)) == (1, 2, 3)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""체크포인트 / 이어서 변환 테스트"""
+
+from PIL import Image
+
+from webp_converter import ConversionEngine
+from webp_journal import JOURNAL_NAME, CheckpointJournal, run_key
+
+
+def test_journal_resume(tmp_path):
+    """같은 실행 키면 완료 기록을 이어받고, 쓰다 만 마지막 줄은 무시"""
+    key = run_key([tmp_path / 'in'], 'settings')
+    journal = CheckpointJournal(tmp_path, key)
+    journal.record(tmp_path / 'a.webp')
+    journal.record(tmp_path / 'a.webp')
+    journal.close()
+    with open(tmp_path / JOURNAL_NAME, 'a', encoding='utf-8') as f:
+        f.write('{"done": "/trunc')
+
+    journal = CheckpointJournal(tmp_path, key)
+    assert journal.resumed
+    assert journal.completed == {str(tmp_path / 'a.webp')}
+    (tmp_path / 'a.jpg').write_bytes(b'jpg')
+    assert journal.is_done(tmp_path / 'a.webp', tmp_path / 'a.jpg')
+    assert not journal.is_done(tmp_path / 'a.webp', tmp_path / 'missing.jpg')
+    journal.finish()
+    assert not (tmp_path / JOURNAL_NAME).exists()
+
+
+def test_other_run_starts_over(tmp_path):
+    """입력 목록이나 설정이 다르면 이전 기록을 쓰지 않음"""
+    journal = CheckpointJournal(tmp_path, run_key([tmp_path / 'in'], 'standard'))
+    journal.record(tmp_path / 'a.webp')
+    journal.close()
+
+    journal = CheckpointJournal(tmp_path, run_key([tmp_path / 'in'], 'web'))
+    try:
+        assert not journal.resumed and journal.completed == set()
+    finally:
+        journal.close()
+
+
+def test_engine_resumes_cancelled_run(tmp_path):
+    """중단한 실행을 다시 시작하면 완료한 입력은 건너뛰고, 끝나면 기록 삭제"""
+    source, output = tmp_path / 'in', tmp_path / 'out'
+    source.mkdir()
+    for index in range(20):
+        Image.new('RGB', (8, 8), (index, 0, 0)).save(source / f'p{index:02}.webp')
+
+    def cancel_on_first_image(message_type, data):
+        if message_type == 'log' and '.webp →' in data:
+            engine.cancel()
+
+    engine = ConversionEngine(output, emit=cancel_on_first_image, readers=0)
+    first = engine.convert_items([source])
+    assert first.cancelled
+    assert 0 < first.converted_images < 20
+    assert (output / JOURNAL_NAME).exists()
+
+    second = ConversionEngine(output, emit=lambda *args: None).convert_items([source])
+
+    assert second.resumed_images == first.converted_images
+    assert second.converted_images + second.resumed_images == 20
+    assert not (output / JOURNAL_NAME).exists()
+    assert len(list((output / 'in').glob('*.jpg'))) == 20
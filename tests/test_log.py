@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""로그 링 버퍼 테스트"""
+
+import threading
+
+from webp_log import LogBuffer
+
+
+def test_drain_returns_pending_once():
+    buffer = LogBuffer(max_lines=10)
+    buffer.append("a")
+    buffer.append("b")
+
+    assert buffer.drain() == (["a", "b"], 0)
+    assert buffer.drain() == ([], 0)
+    assert list(buffer.lines) == ["a", "b"]
+
+
+def test_ring_keeps_latest_lines():
+    """그리기 전에 밀려난 줄 수를 세고, 메모리에는 최근 N줄만"""
+    buffer = LogBuffer(max_lines=3)
+    for index in range(5):
+        buffer.append(str(index))
+
+    assert buffer.drain() == (["2", "3", "4"], 2)
+    assert list(buffer.lines) == ["2", "3", "4"]
+
+
+def test_spill_keeps_full_log(tmp_path):
+    """로그 파일에는 밀려난 줄까지 모두, clear 해도 파일은 그대로"""
+    path = tmp_path / 'webp2jpg.log'
+    buffer = LogBuffer(max_lines=2)
+    buffer.open_spill(path)
+    for index in range(4):
+        buffer.append(str(index))
+    buffer.clear()
+    buffer.close_spill()
+    buffer.append("after")
+
+    assert path.read_text(encoding='utf-8') == "0\n1\n2\n3\n"
+    assert buffer.drain() == (["after"], 0)
+
+
+def test_append_from_threads():
+    buffer = LogBuffer(max_lines=10000)
+
+    def worker(name):
+        for index in range(500):
+            buffer.append(f"{name}{index}")
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in "abcd"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines, dropped = buffer.drain()
+    assert len(lines) == 2000 and dropped == 0
+    assert [line for line in lines if line.startswith("a")] == [f"a{index}" for index in range(500)]
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""메모리 예산 스케줄링 테스트"""
+
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from webp_memory import MemoryScheduler, estimate_image_memory, webp_dimensions
+
+
+@pytest.mark.parametrize('mode, kwargs, expected', [
+    ('RGB', {}, (300, 200, False, False)),
+    ('RGB', {'lossless': True}, (300, 200, False, False)),
+    ('RGBA', {}, (300, 200, True, False)),
+])
+def test_webp_dimensions(mode, kwargs, expected):
+    """디코딩하지 않고 헤더에서 크기와 알파 여부 읽기"""
+    buffer = io.BytesIO()
+    Image.new(mode, (300, 200)).save(buffer, 'WEBP', **kwargs)
+    assert webp_dimensions(buffer.getvalue()[:30]) == expected
+    assert webp_dimensions(b'not a webp' * 3) is None
+
+
+def test_estimate_grows_with_alpha():
+    assert estimate_image_memory(100, 100, True) > estimate_image_memory(100, 100, False)
+
+
+def gated(task):
+    started, release = task
+    started.set()
+    release.wait(5)
+    return task
+
+
+def make_task():
+    return threading.Event(), threading.Event()
+
+
+def test_admission_under_budget():
+    """예산을 넘는 작업은 앞 작업이 끝날 때까지 시작하지 않음 (들어온 순서 유지)"""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        scheduler = MemoryScheduler(executor, gated, budget=100, max_running=4,
+                                    owns_executor=False)
+        tasks = [make_task() for _ in range(3)]
+        jobs = [scheduler.add(task, cost) for task, cost in zip(tasks, (60, 30, 50))]
+
+        assert tasks[0][0].wait(5) and tasks[1][0].wait(5)
+        assert jobs[2].future is None
+        assert scheduler.used == 90
+
+        tasks[0][1].set()
+        assert scheduler.result(jobs[0]) is tasks[0]
+        scheduler.admit()
+        assert tasks[2][0].wait(5)
+        assert scheduler.used == 80
+
+        for task in tasks[1:]:
+            task[1].set()
+        for job in jobs[1:]:
+            scheduler.result(job)
+        scheduler.admit()
+        assert scheduler.used == 0 and scheduler.peak == 90
+
+
+def test_oversize_job_runs_alone():
+    """예산보다 큰 작업도 실행 중인 작업이 없으면 혼자 시작"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        scheduler = MemoryScheduler(executor, gated, budget=10, max_running=2,
+                                    owns_executor=False)
+        big, small = make_task(), make_task()
+        big_job = scheduler.add(big, 50)
+        small_job = scheduler.add(small, 1)
+
+        assert big[0].wait(5)
+        assert small_job.future is None
+        big[1].set()
+        small[1].set()
+        assert scheduler.result(small_job) is small
+        assert scheduler.result(big_job) is big
+
+
+def test_max_running_limits_jobs():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        scheduler = MemoryScheduler(executor, gated, budget=1000, max_running=1,
+                                    owns_executor=False)
+        tasks = [make_task(), make_task()]
+        jobs = [scheduler.add(task, 1) for task in tasks]
+
+        assert len(scheduler.running) == 1 and len(scheduler.waiting) == 1
+        for task in tasks:
+            task[1].set()
+        assert [scheduler.result(job) for job in jobs] == tasks
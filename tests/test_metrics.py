@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""단계별 시간/카운터 수집 테스트"""
+
+import json
+import pickle
+
+from webp_metrics import StageMetrics, prometheus_text, write_metrics
+
+
+def sample_metrics():
+    metrics = StageMetrics()
+    metrics.observe('encode', 0.002)
+    metrics.observe('encode', 20.0)
+    metrics.observe('custom', 0.0)
+    metrics.observe('read', 0.0005)
+    metrics.count('bytes_in', 10)
+    return metrics
+
+
+def test_observe_and_order():
+    """STAGES 순서, 그 밖의 단계는 뒤에 - 구간 밖의 시간은 +Inf"""
+    stages = sample_metrics().ordered_stages()
+
+    assert [stage for stage, *rest in stages] == ['read', 'encode', 'custom']
+    stage, count, seconds, buckets = stages[1]
+    assert (count, seconds) == (2, 20.002)
+    assert buckets[1] == 1 and buckets[-1] == 1
+
+
+def test_merge_from_worker():
+    """워커에서 돌아온 (pickle 된) 수집 결과를 합침"""
+    metrics = sample_metrics()
+    metrics.merge(pickle.loads(pickle.dumps(sample_metrics())))
+
+    assert metrics.stages['encode'][0] == 4
+    assert sum(metrics.stages['encode'][2]) == 4
+    assert metrics.counters == {'bytes_in': 20}
+
+
+def test_prometheus_text():
+    """히스토그램 구간은 누적, 실행 정보 중 숫자만 gauge"""
+    text = prometheus_text(sample_metrics(), {'jobs': 2, 'cancelled': False, 'profile': 'web'})
+
+    assert 'webp2jpg_stage_seconds_bucket{stage="encode",le="0.001"} 0' in text
+    assert 'webp2jpg_stage_seconds_bucket{stage="encode",le="0.005"} 1' in text
+    assert 'webp2jpg_stage_seconds_bucket{stage="encode",le="+Inf"} 2' in text
+    assert 'webp2jpg_stage_seconds_count{stage="encode"} 2' in text
+    assert 'webp2jpg_bytes_in_total 10' in text
+    assert 'webp2jpg_run_jobs 2' in text
+    assert 'cancelled' not in text and 'profile' not in text
+
+
+def test_write_metrics_formats(tmp_path):
+    """jsonl 은 실행마다 추가, .prom 은 통째로 교체"""
+    jsonl, prom = tmp_path / 'metrics.jsonl', tmp_path / 'metrics.prom'
+    for _ in range(2):
+        write_metrics(jsonl, sample_metrics(), {'jobs': 1, 'timestamp': 1.0})
+        write_metrics(prom, sample_metrics(), {'jobs': 1})
+
+    records = [json.loads(line) for line in jsonl.read_text(encoding='utf-8').splitlines()]
+    assert [record['type'] for record in records].count('run') == 2
+    assert {record['stage'] for record in records if record['type'] == 'stage'} == \
+        {'read', 'encode', 'custom'}
+    assert prom.read_text(encoding='utf-8').count('# TYPE webp2jpg_run_jobs gauge') == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['metrics.jsonl', 'metrics.prom']
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""프로세스 풀 병렬 변환 테스트"""
+
+from PIL import Image
+
+from webp_converter import ConversionEngine
+
+
+def quiet(*args):
+    pass
+
+
+def output_files(output):
+    return {str(path.relative_to(output)): path.read_bytes()
+            for path in sorted(output.rglob('*.jpg'))}
+
+
+def test_parallel_matches_serial(tmp_path):
+    """워커 2개로 변환한 결과가 워커 1개와 같고, 결과는 입력 순서대로 보고"""
+    source = tmp_path / 'in'
+    source.mkdir()
+    for index in range(12):
+        Image.new('RGB', (24 + index, 16), (index * 20, 0, 0)).save(source / f'p{index:02}.webp')
+
+    results = {}
+    labels = {}
+    for jobs in (1, 2):
+        output = tmp_path / f'out{jobs}'
+        logged = []
+
+        def emit(message_type, data):
+            if message_type == 'log' and '.webp →' in data:
+                logged.append(data)
+
+        summary = ConversionEngine(output, emit=emit, jobs=jobs).convert_items([source])
+        assert summary.converted_images == 12
+        results[jobs] = output_files(output)
+        labels[jobs] = logged
+
+    assert len(results[1]) == 12 and results[1] == results[2]
+    assert len(labels[1]) == 12 and labels[1] == labels[2]
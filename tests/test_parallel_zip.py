@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""ZIP 멤버 병렬 변환 테스트"""
+
+import io
+import zipfile
+
+from PIL import Image
+
+import webp_converter
+from webp_converter import ConversionEngine, ConversionOptions, convert_zip_stream
+
+
+def webp_bytes(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (24, 16), color).save(buffer, 'WEBP')
+    return buffer.getvalue()
+
+
+def make_bundle(path):
+    """WebP, 중복 WebP, 깨진 WebP, 안쪽 ZIP, 폴더, 텍스트가 섞인 ZIP"""
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, 'w') as zf:
+        zf.writestr('deep.webp', webp_bytes('white'))
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.comment = b'bundle'
+        zf.writestr('folder/', b'')
+        for index in range(20):
+            zf.writestr(f'folder/{index:02}.webp', webp_bytes((index * 12, 40, 80)))
+        zf.writestr('copy.webp', webp_bytes((0, 40, 80)))
+        zf.writestr('broken.webp', b'not a webp')
+        zf.writestr('inner.zip', inner.getvalue())
+        zf.writestr('notes.txt', b'notes ' * 100)
+
+
+def test_parallel_zip_matches_serial(tmp_path, monkeypatch):
+    """워커 2개로 멤버를 나눠 변환한 ZIP 이 직렬 변환 결과와 바이트 그대로 같음"""
+    started = []
+    original_open = webp_converter.ParallelZipJob.open
+
+    def spy_open(job):
+        started.append(job.input_path)
+        return original_open(job)
+
+    monkeypatch.setattr(webp_converter.ParallelZipJob, 'open', spy_open)
+    bundle = tmp_path / 'bundle.zip'
+    make_bundle(bundle)
+    options = ConversionOptions()
+    results, stats = convert_zip_stream(bundle, tmp_path / 'serial.zip', options)
+
+    output = tmp_path / 'out'
+    summary = ConversionEngine(output, emit=lambda *args: None, jobs=2,
+                               options=options).convert_items([bundle])
+
+    assert started == [str(bundle)]
+    assert summary.converted_images == 22
+    assert summary.failed_images == 1
+    assert [name for name, success, error in results if not success] == ['broken.webp']
+    assert (output / 'bundle.zip').read_bytes() == (tmp_path / 'serial.zip').read_bytes()
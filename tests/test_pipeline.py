@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""읽기/변환/쓰기 파이프라인 테스트"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from webp_memory import MemoryScheduler
+from webp_pipeline import ConversionPipeline, write_atomic
+
+
+def reverse_encode(job):
+    """뒤에 넣은 작업일수록 빨리 끝나는 변환 - 결과는 입력 바이트를 뒤집어서 기록"""
+    data, (kind, input_path, output_path, options) = job
+    time.sleep(options)
+    return str(input_path), [(output_path, data[::-1])]
+
+
+def failure(error):
+    return f"실패: {error}"
+
+
+def make_pipeline(workers=4):
+    scheduler = MemoryScheduler(ThreadPoolExecutor(max_workers=workers), None,
+                                budget=1 << 30, max_running=workers)
+    return ConversionPipeline(scheduler, reverse_encode, failure, readers=2, writers=2,
+                              read_ahead=4, write_behind=4)
+
+
+def test_results_in_input_order(tmp_path):
+    """변환이 끝나는 순서와 상관없이 결과는 넣은 순서대로 받고 출력은 모두 기록"""
+    pipeline = make_pipeline()
+    jobs = []
+    try:
+        for index in range(8):
+            source = tmp_path / f'{index}.in'
+            source.write_bytes(b'abc%d' % index)
+            delay = (8 - index) * 0.01
+            jobs.append(pipeline.add(('image', source, tmp_path / 'out' / f'{index}.out', delay)))
+
+        assert [pipeline.result(job) for job in jobs] == \
+            [str(tmp_path / f'{index}.in') for index in range(8)]
+    finally:
+        pipeline.shutdown()
+
+    for index in range(8):
+        assert (tmp_path / 'out' / f'{index}.out').read_bytes() == (b'abc%d' % index)[::-1]
+    counts = {stage: count for stage, count, seconds, buckets in pipeline.metrics.ordered_stages()}
+    assert counts['read'] == counts['write'] == 8
+
+
+def test_read_failure_reported(tmp_path):
+    pipeline = make_pipeline()
+    try:
+        job = pipeline.add(('image', tmp_path / 'missing.in', tmp_path / 'x.out', 0))
+        assert pipeline.result(job).startswith("실패: ")
+    finally:
+        pipeline.shutdown()
+    assert not (tmp_path / 'x.out').exists()
+
+
+def test_write_atomic_leaves_no_partial_file(tmp_path):
+    """쓰기에 실패하면 임시 파일도 출력도 남지 않음"""
+    target = tmp_path / 'a.jpg'
+    write_atomic(target, b'first')
+
+    with pytest.raises(TypeError):
+        write_atomic(target, 'not bytes')
+
+    assert target.read_bytes() == b'first'
+    assert [path.name for path in tmp_path.iterdir()] == ['a.jpg']
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""JPEG 인코딩 프로필 테스트"""
+
+import io
+
+from PIL import Image
+
+from webp_converter import ConversionOptions, convert_bytes
+from webp_settings import DEFAULT_PROFILE, EXIF_HEADER, PROFILES
+
+
+def webp_bytes(exif=None):
+    buffer = io.BytesIO()
+    kwargs = {'exif': exif} if exif else {}
+    Image.new('RGB', (640, 480), 'red').save(buffer, 'WEBP', **kwargs)
+    return buffer.getvalue()
+
+
+def test_save_kwargs():
+    """품질 덮어쓰기, 서브샘플링 표기 변환, 설정에 따른 메타데이터 유지"""
+    assert PROFILES[DEFAULT_PROFILE].save_kwargs() == {
+        'quality': 95, 'subsampling': 2, 'progressive': False, 'optimize': False}
+    archive = PROFILES['archive'].save_kwargs(quality=80, exif=b'exif', icc_profile=b'icc')
+    assert archive['quality'] == 80 and archive['subsampling'] == 0
+    assert archive['exif'] == EXIF_HEADER + b'exif' and archive['icc_profile'] == b'icc'
+    assert PROFILES['archive'].save_kwargs(exif=EXIF_HEADER + b'x')['exif'] == EXIF_HEADER + b'x'
+    assert 'exif' not in PROFILES['web'].save_kwargs(exif=b'exif')
+
+
+def test_thumbnail_profile_limits_size():
+    """크기 설정이 없으면 프로필의 최대 크기 적용"""
+    assert ConversionOptions(profile='thumbnail').sizes == (320,)
+    assert ConversionOptions(profile='thumbnail', sizes=(100,)).sizes == (100,)
+
+    with Image.open(io.BytesIO(convert_bytes(webp_bytes(), profile='thumbnail'))) as img:
+        assert img.size == (320, 240)
+
+
+def test_exif_kept_only_by_archive():
+    """WebP 의 EXIF (머리 없음) 도 archive 프로필에서는 JPEG 에 그대로 남음"""
+    exif = Image.Exif()
+    exif[0x010f] = 'maker'
+    data = webp_bytes(exif.tobytes())
+
+    for profile, expected in [('archive', 'maker'), ('standard', None)]:
+        with Image.open(io.BytesIO(convert_bytes(data, profile=profile))) as img:
+            assert img.getexif().get(0x010f) == expected
+
+
+def test_profile_changes_cache_key():
+    """프로필이 바뀌면 증분 변환 캐시 키도 바뀜 (중복 제거 설정은 무관)"""
+    assert ConversionOptions().cache_key() != ConversionOptions(profile='web').cache_key()
+    assert ConversionOptions().cache_key() == ConversionOptions(dedup=True).cache_key()
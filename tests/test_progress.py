@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""이미지 단위 진행률 테스트"""
+
+import io
+import zipfile
+
+import pytest
+from PIL import Image
+
+from webp_converter import ConversionEngine
+from webp_progress import ProgressTracker, describe_rate, format_duration
+
+
+@pytest.mark.parametrize('seconds, text', [(0, '00:00'), (75.4, '01:15'), (3725, '1:02:05')])
+def test_format_duration(seconds, text):
+    assert format_duration(seconds) == text
+
+
+def test_percent_by_bytes_then_images():
+    """바이트를 알면 바이트 기준, 모르면 이미지 수 기준"""
+    tracker = ProgressTracker(lambda *args: None)
+    tracker.discover(1, 100)
+    tracker.discover(1, 300)
+    tracker.complete(1, 100)
+    assert tracker.percent() == 25
+
+    tracker = ProgressTracker(lambda *args: None)
+    tracker.discover(4, 0)
+    tracker.complete(1, 0)
+    assert tracker.percent() == 25
+
+
+def test_reports_throttled():
+    """간격 안의 완료는 모아서 보내고, 스캔 완료는 바로 보냄"""
+    messages = []
+    tracker = ProgressTracker(lambda *args: messages.append(args), interval=60)
+    tracker.discover(3, 30)
+    for _ in range(3):
+        tracker.complete(1, 10)
+    assert messages == []
+
+    tracker.finish_scan()
+    assert [message_type for message_type, data in messages] == ['progress', 'rate']
+    rate = messages[1][1]
+    assert rate['images_done'] == 3 and not rate['scanning']
+    assert describe_rate(rate).startswith("이미지 3/3 · ")
+
+
+def test_engine_counts_zip_members(tmp_path):
+    """ZIP 하나도 안에 든 WebP 수만큼 이미지로 셈"""
+    bundle = tmp_path / 'bundle.zip'
+    with zipfile.ZipFile(bundle, 'w') as zf:
+        for index in range(3):
+            buffer = io.BytesIO()
+            Image.new('RGB', (8, 8), (index, 0, 0)).save(buffer, 'WEBP')
+            zf.writestr(f'{index}.webp', buffer.getvalue())
+        zf.writestr('notes.txt', b'notes')
+    Image.new('RGB', (8, 8)).save(tmp_path / 'single.webp')
+    rates = []
+
+    def emit(message_type, data):
+        if message_type == 'rate':
+            rates.append(data)
+
+    ConversionEngine(tmp_path / 'out', emit=emit).convert_items([bundle, tmp_path / 'single.webp'])
+
+    assert rates[-1]['images_total'] == rates[-1]['images_done'] == 4
+    assert rates[-1]['bytes_done'] == rates[-1]['bytes_total']
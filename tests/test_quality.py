@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""목표 화질 탐색 테스트"""
+
+import io
+import random
+
+import pytest
+from PIL import Image
+
+import webp_quality
+from webp_converter import ConversionEngine, ConversionOptions
+from webp_quality import (KNOWN_QUALITIES, MIN_QUALITY, QualityCache, load_known_qualities,
+                          load_numpy, metric_array, search_quality, ssim)
+
+needs_numpy = pytest.mark.skipif(load_numpy() is None, reason="NumPy 필요")
+
+
+def textured(size=96):
+    rng = random.Random(2)
+    img = Image.new('RGB', (size, size))
+    img.putdata([(x * 2, y * 2, rng.randrange(64)) for y in range(size) for x in range(size)])
+    return img
+
+
+@needs_numpy
+def test_search_meets_target():
+    """찾은 품질은 목표 SSIM 을 만족하고 프로필 품질보다 높지 않음"""
+    img = textured()
+    search = search_quality(img, {'quality': 95}, 0.95, max_trials=7)
+
+    assert MIN_QUALITY <= search.quality <= 95
+    assert search.trials <= 7
+    assert len(search.data) <= search.baseline_bytes
+    with Image.open(io.BytesIO(search.data)) as decoded:
+        assert ssim(metric_array(img), metric_array(decoded)) >= 0.95
+
+
+@needs_numpy
+def test_flat_image_uses_low_quality():
+    search = search_quality(Image.new('RGB', (64, 64), 'gray'), {'quality': 95}, 0.99)
+    assert search.quality < 60
+
+
+def test_quality_cache_round_trip(tmp_path):
+    """기록한 품질은 같은 설정으로 다시 열 때만 보임"""
+    cache = QualityCache(tmp_path, 'settings')
+    cache.record({'key': (70, 1234)})
+    cache.close()
+
+    cache = QualityCache(tmp_path, 'settings')
+    other = QualityCache(tmp_path, 'other')
+    try:
+        assert cache.entries == {'key': (70, 1234)}
+        assert other.entries == {}
+    finally:
+        cache.close()
+        other.close()
+
+
+@needs_numpy
+def test_second_run_reuses_qualities(tmp_path):
+    """두 번째 실행은 출력 폴더의 품질 캐시로 탐색 없이 같은 결과"""
+    textured().save(tmp_path / 'a.webp', lossless=True)
+    options = ConversionOptions(target_ssim=0.95)
+    outputs, trials = [], []
+    for run in range(2):
+        output = tmp_path / 'out'
+        summary = ConversionEngine(output, emit=lambda *args: None, options=options,
+                                   resume=False).convert_items([tmp_path / 'a.webp'])
+        outputs.append((output / 'a.jpg').read_bytes())
+        trials.append(summary.encode_stats.trials)
+        load_known_qualities({})
+
+    assert trials[0] > 1 and trials[1] == 1
+    assert outputs[0] == outputs[1]
+
+
+def test_known_qualities_bounded(monkeypatch):
+    """기억한 품질은 상한을 넘지 않고, 가장 오래 안 쓴 것부터 버림"""
+    monkeypatch.setattr(webp_quality, 'MAX_KNOWN_QUALITIES', 2)
+    load_known_qualities({'a': (60, 100), 'b': (70, 100)})
+    img = Image.new('RGB', (16, 16), 'red')
+
+    # 'a' 를 쓰면 'b' 가 가장 오래 안 쓴 품질이 됨
+    assert search_quality(img, {'quality': 95}, 0.9, key='a').cached
+    search_quality(img, {'quality': 95}, 0.9, key='c')
+
+    assert list(KNOWN_QUALITIES) == ['a', 'c']
+    load_known_qualities({})
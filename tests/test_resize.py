@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""출력 크기별 축소 테스트"""
+
+from PIL import Image
+
+from webp_converter import (ConversionEngine, ConversionOptions, iter_variants, output_names,
+                            resize_image)
+
+
+def test_fit_keeps_aspect_and_never_enlarges():
+    options = ConversionOptions(sizes=(100,))
+    img = Image.new('RGB', (400, 200))
+
+    assert resize_image(img, 100, options).size == (100, 50)
+    assert resize_image(img, 1000, options) is img
+
+
+def test_fill_crops_center_square():
+    """fill 은 가운데 정사각형을 잘라서 축소"""
+    options = ConversionOptions(sizes=(50,), resize_mode='fill')
+    img = Image.new('RGB', (300, 100), 'red')
+    img.paste((0, 0, 255), (100, 0, 200, 100))
+
+    result = resize_image(img, 50, options)
+
+    assert result.size == (50, 50)
+    assert result.getpixel((25, 25)) == (0, 0, 255)
+
+
+def test_variants_largest_first():
+    """크기는 큰 것부터, 각 크기는 한 번씩"""
+    options = ConversionOptions(sizes=(64, 256, 128, 64))
+    img = Image.new('RGB', (512, 256))
+
+    assert [(size, variant.size) for size, variant in iter_variants(img, options)] == \
+        [(256, (256, 128)), (128, (128, 64)), (64, (64, 32))]
+
+
+def test_output_names():
+    """크기가 여러 개면 이름에 크기를, 프레임별 출력에는 프레임 번호를 붙임"""
+    assert output_names('a.jpg', ConversionOptions(sizes=(320,))) == ['a.jpg']
+    assert output_names('a.jpg', ConversionOptions(sizes=(320, 64)), frame_count=1) == \
+        ['a_320.jpg', 'a_64.jpg', 'a_320_f0001.jpg', 'a_64_f0001.jpg']
+
+
+def test_engine_writes_every_size(tmp_path):
+    Image.new('RGB', (400, 300), 'red').save(tmp_path / 'a.webp')
+    output = tmp_path / 'out'
+
+    ConversionEngine(output, emit=lambda *args: None,
+                     options=ConversionOptions(sizes=(200, 100))).convert_items([tmp_path / 'a.webp'])
+
+    for name, size in [('a_200.jpg', (200, 150)), ('a_100.jpg', (100, 75))]:
+        with Image.open(output / name) as img:
+            assert img.size == size
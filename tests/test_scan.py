@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""폴더 스캔 테스트"""
+
+import os
+
+import pytest
+
+from webp_scan import classify, scan_tree
+
+
+@pytest.mark.parametrize('name, kind', [
+    ('a.webp', 'webp'),
+    ('A.WEBP', 'webp'),
+    ('b.JPEG', 'jpg'),
+    ('c.png', 'png'),
+    ('d.zip', 'zip'),
+    ('e.tar.gz', 'tar'),
+    ('f.TGZ', 'tar'),
+    ('g.gz', 'other'),
+    ('README', 'other'),
+])
+def test_classify(name, kind):
+    assert classify(name) == kind
+
+
+def test_scan_order_and_kinds(tmp_path):
+    """폴더마다 이름순, 파일을 먼저 반환한 뒤 하위 폴더를 이름순으로 방문"""
+    for name in ['b/z.webp', 'b/a.png', 'a/x.WEBP', 'c.zip', 'd.txt', 'a/sub/y.webp']:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'')
+
+    found = [(os.path.relpath(path, tmp_path), kind) for path, kind in scan_tree(tmp_path)]
+
+    assert found == [
+        ('c.zip', 'zip'),
+        ('d.txt', 'other'),
+        (os.path.join('a', 'x.WEBP'), 'webp'),
+        (os.path.join('a', 'sub', 'y.webp'), 'webp'),
+        (os.path.join('b', 'a.png'), 'png'),
+        (os.path.join('b', 'z.webp'), 'webp'),
+    ]
+
+
+def test_symlink_loop_visited_once(tmp_path):
+    """자기 자신을 가리키는 링크 폴더는 한 번만 방문"""
+    (tmp_path / 'a.webp').write_bytes(b'')
+    os.symlink(tmp_path, tmp_path / 'loop')
+
+    assert [os.path.basename(path) for path, kind in scan_tree(tmp_path)] == ['a.webp']
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""로컬 HTTP 변환 서비스 테스트"""
+
+import http.client
+import io
+import json
+import os
+import threading
+
+import pytest
+from PIL import Image
+
+import webp_server
+from webp_converter import ConversionOptions
+from webp_server import ConversionServer
+
+
+def crash_worker(data, options):
+    """워커 프로세스를 바로 죽임 (BrokenProcessPool)"""
+    os._exit(1)
+
+
+@pytest.fixture
+def server():
+    server = ConversionServer(('127.0.0.1', 0), ConversionOptions(), jobs=2,
+                              emit=lambda *args: None)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def post(server, path, body):
+    connection = http.client.HTTPConnection('127.0.0.1', server.port, timeout=30)
+    try:
+        connection.request('POST', path, body, {'Content-Type': 'image/webp'})
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def test_worker_crash_returns_500(server, monkeypatch):
+    """워커가 죽으면 연결을 끊지 않고 500 JSON 을 보내고, 다음 요청은 새 풀에서 변환"""
+    buffer = io.BytesIO()
+    Image.new('RGB', (16, 16), 'red').save(buffer, 'WEBP')
+    webp = buffer.getvalue()
+
+    monkeypatch.setattr(webp_server, 'convert_request', crash_worker)
+    status, body = post(server, '/convert', webp)
+    assert status == 500
+    assert 'error' in json.loads(body)
+    assert server.metrics.counters['http_errors'] == 1
+
+    monkeypatch.undo()
+    status, body = post(server, '/convert', webp)
+    assert status == 200
+    assert body[:2] == b'\xff\xd8'
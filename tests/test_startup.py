@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""시작 시간 / 지연 import 테스트"""
+
+import json
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+import webp_to_jpg_gui
+from webp_startup import StartupTimer
+
+
+def test_timer_report(tmp_path, capsys):
+    """같은 단계는 처음 도달한 시각만, 리포트는 ms 단위"""
+    timer = StartupTimer(started=0.0)
+    timer.mark("imports")
+    first = timer.stages["imports"]
+    timer.mark("imports")
+    with timer.measure("module"):
+        pass
+
+    report = timer.report()
+    assert timer.stages["imports"] == first
+    assert report["stages_ms"]["imports"] == round(first * 1000, 1)
+    assert set(report["imports_ms"]) == {"module"}
+
+    timer.write(tmp_path / "startup.json")
+    assert json.loads((tmp_path / "startup.json").read_text(encoding="utf-8")) == report
+    timer.write("-")
+    assert json.loads(capsys.readouterr().out) == report
+
+
+@pytest.mark.parametrize('argv, expected', [
+    ([], None),
+    (["--startup-time"], "-"),
+    (["--startup-time", "out.json"], "out.json"),
+    (["--startup-time", "--other"], "-"),
+])
+def test_startup_report_path(argv, expected):
+    assert webp_to_jpg_gui.startup_report_path(argv) == expected
+
+
+def test_cli_import_is_lazy():
+    """CLI 를 불러와도 서버/감시 모듈과 multiprocessing 은 불러오지 않음"""
+    code = ("import sys, webp2jpg; "
+            "print(sorted(name for name in ('webp_server', 'webp_watch', 'multiprocessing',"
+            " 'http.server') if name in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True,
+                            cwd=os.path.dirname(os.path.abspath(webp_to_jpg_gui.__file__)))
+    assert result.stdout.strip() == "[]"
+
+
+class FakeTk:
+    def __init__(self):
+        self.calls = []
+
+    def call(self, *args):
+        self.calls.append(args)
+
+
+class FakeRoot:
+    def __init__(self):
+        self.tk = FakeTk()
+
+
+def test_load_dnd_without_require(monkeypatch):
+    """tkinterdnd2 에 _require 가 없으면 Tcl 에서 tkdnd 패키지를 직접 불러옴"""
+    module = types.ModuleType("tkinterdnd2")
+    module.DND_FILES = "DND_Files"
+    module.TkinterDnD = types.SimpleNamespace()
+    monkeypatch.setitem(sys.modules, "tkinterdnd2", module)
+    root = FakeRoot()
+
+    assert webp_to_jpg_gui.load_dnd(root) == ("DND_Files", None)
+    assert root.tk.calls == [("package", "require", "tkdnd")]
+
+
+def test_load_dnd_missing_package(monkeypatch):
+    monkeypatch.setitem(sys.modules, "tkinterdnd2", None)
+    dnd_files, reason = webp_to_jpg_gui.load_dnd(FakeRoot())
+    assert dnd_files is None and "pip install tkinterdnd2" in reason
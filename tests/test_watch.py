@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""감시 폴더 모드 테스트"""
+
+import os
+from pathlib import Path
+
+from PIL import Image
+
+from webp_converter import ConversionEngine
+from webp_watch import FolderWatch
+
+
+def write_webp(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new('RGB', (16, 16), 'blue').save(path, 'WEBP')
+
+
+def test_batch_converted_in_one_call(tmp_path):
+    """하위 폴더가 달라도 준비된 파일은 convert 한 번에 넘김"""
+    paths = [str(tmp_path / 'x.webp'), str(tmp_path / 'a' / 'y.webp'),
+             str(tmp_path / 'b' / 'c' / 'z.webp')]
+    for path in paths:
+        write_webp(Path(path))
+    calls = []
+
+    def convert(batch, relatives):
+        calls.append((list(batch), dict(relatives)))
+        return []
+
+    watch = FolderWatch([str(tmp_path)], convert, lambda *args: None, settle=0)
+    watch.touch(paths)
+    watch.convert_batch(watch.settled())
+
+    assert len(calls) == 1
+    assert calls[0][0] == paths
+    assert calls[0][1] == {paths[0]: '', paths[1]: 'a', paths[2]: os.path.join('b', 'c')}
+
+
+def test_engine_keeps_workers_between_runs(tmp_path):
+    """keep_workers 엔진은 실행마다 같은 워커를 쓰고 입력별 출력 폴더를 따름"""
+    first, second = tmp_path / 'in' / 'a' / 'x.webp', tmp_path / 'in' / 'b' / 'y.webp'
+    write_webp(first)
+    write_webp(second)
+    output = tmp_path / 'out'
+    engine = ConversionEngine(output, emit=lambda *args: None, jobs=2, keep_workers=True)
+    try:
+        summary = engine.convert_items([first], {first: output / 'a'})
+        executor = engine.executor
+        assert summary.successful_count == 1 and executor is not None
+        summary = engine.convert_items([second], {second: output / 'b'})
+        assert summary.successful_count == 1
+        assert engine.executor is executor
+    finally:
+        engine.close()
+    assert engine.executor is None
+    assert (output / 'a' / 'x.jpg').exists()
+    assert (output / 'b' / 'y.jpg').exists()
+
+
+def test_output_containing_inbox_not_excluded(tmp_path, monkeypatch):
+    """기본 출력 폴더 '.' 아래의 감시 폴더도 변환 (출력 폴더 안에 있어도 제외하지 않음)"""
+    monkeypatch.chdir(tmp_path)
+    path = os.path.abspath(os.path.join('inbox', 'x.webp'))
+    write_webp(Path(path))
+    outside = os.path.abspath(os.path.join('out', 'y.webp'))
+    write_webp(Path(outside))
+
+    watch = FolderWatch(['inbox'], lambda *args: [], lambda *args: None, settle=0,
+                        exclude=['.', 'out'])
+    watch.touch([path, outside])
+
+    assert watch.settled() == [path]
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""ZIP 스트리밍 변환 / 멤버 원본 복사 테스트"""
+
+import io
+import struct
+import zipfile
+
+import pytest
+from PIL import Image
+
+from webp_converter import (ZIP64_EXTRA_ID, convert_zip_stream, copy_raw_member,
+                            member_compress_type, strip_zip64_extra)
+
+
+def make_zip(path, **extra):
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.comment = b'archive comment'
+        zf.writestr('stored.txt', b'stored ' * 100, compress_type=zipfile.ZIP_STORED)
+        zf.writestr('deflated.txt', b'deflated ' * 100, compress_type=zipfile.ZIP_DEFLATED)
+        info = zipfile.ZipInfo('folder/')
+        info.external_attr = 0o40755 << 16 | 0x10
+        zf.writestr(info, b'')
+        for name, data in extra.items():
+            zf.writestr(name, data)
+
+
+def webp_bytes(color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (16, 16), color).save(buffer, 'WEBP')
+    return buffer.getvalue()
+
+
+def test_webp_members_converted_in_order(tmp_path):
+    """WebP 멤버만 JPG 로 바꾸고 멤버 순서와 수정 시간은 원본 그대로"""
+    source, target = tmp_path / 'in.zip', tmp_path / 'out.zip'
+    with zipfile.ZipFile(source, 'w') as zf:
+        zf.writestr(zipfile.ZipInfo('a.webp', date_time=(2020, 1, 2, 3, 4, 6)), webp_bytes())
+        zf.writestr('notes.txt', b'notes')
+        zf.writestr('b.webp', webp_bytes('blue'))
+        zf.writestr('b.jpg', b'old jpg')
+
+    results, stats = convert_zip_stream(source, target)
+
+    assert results == [('a.webp', True, None), ('b.webp', True, None)]
+    with zipfile.ZipFile(target) as zf:
+        assert zf.namelist() == ['a.jpg', 'notes.txt', 'b.jpg']
+        assert zf.getinfo('a.jpg').date_time == (2020, 1, 2, 3, 4, 6)
+        assert zf.read('notes.txt') == b'notes'
+        with Image.open(io.BytesIO(zf.read('b.jpg'))) as img:
+            assert img.format == 'JPEG'
+
+
+def test_broken_webp_member_kept(tmp_path):
+    """변환에 실패한 WebP 멤버는 실패로 보고하고 원본 그대로 유지"""
+    source, target = tmp_path / 'in.zip', tmp_path / 'out.zip'
+    with zipfile.ZipFile(source, 'w') as zf:
+        zf.writestr('broken.webp', b'not a webp')
+        zf.writestr('ok.webp', webp_bytes())
+
+    results, stats = convert_zip_stream(source, target)
+
+    assert [(name, success) for name, success, error in results] == \
+        [('broken.webp', False), ('ok.webp', True)]
+    with zipfile.ZipFile(target) as zf:
+        assert zf.namelist() == ['broken.webp', 'ok.jpg']
+        assert zf.read('broken.webp') == b'not a webp'
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('a.jpg', zipfile.ZIP_STORED),
+    ('dir/B.JPEG', zipfile.ZIP_STORED),
+    ('inner.zip', zipfile.ZIP_STORED),
+    ('notes.txt', zipfile.ZIP_DEFLATED),
+    ('data.json', zipfile.ZIP_DEFLATED),
+])
+def test_member_compress_type(name, expected):
+    assert member_compress_type(name) == expected
+
+
+def test_converted_jpg_stored(tmp_path):
+    """변환한 JPG 멤버는 다시 압축하지 않고 STORED 로 기록"""
+    source, target = tmp_path / 'in.zip', tmp_path / 'out.zip'
+    with zipfile.ZipFile(source, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('a.webp', webp_bytes())
+        zf.writestr('b.webp', webp_bytes('blue'))
+
+    results, stats = convert_zip_stream(source, target)
+
+    assert stats.stored_count == 2 and stats.deflated_count == 0
+    assert stats.stored_bytes > 0
+    with zipfile.ZipFile(target) as zf:
+        assert {info.compress_type for info in zf.infolist()} == {zipfile.ZIP_STORED}
+
+
+def test_round_trip_byte_identical(tmp_path):
+    """WebP 가 없는 ZIP 은 STORED / DEFLATED 멤버와 주석까지 바이트 그대로"""
+    source, target = tmp_path / 'in.zip', tmp_path / 'out.zip'
+    make_zip(source)
+
+    results, stats = convert_zip_stream(source, target)
+
+    assert results == []
+    assert stats.copied_count == 3
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_existing_zip64_extra_not_duplicated(tmp_path):
+    """원본 extra 의 zip64 레코드는 복사하지 않음 (필요하면 zipfile 이 새로 붙임)"""
+    data = b'zip64 ' * 50
+    source, target = tmp_path / 'in.zip', tmp_path / 'out.zip'
+    other = struct.pack('<HH', 0x7075, 3) + b'abc'
+    with zipfile.ZipFile(source, 'w') as zf:
+        info = zipfile.ZipInfo('big.bin')
+        info.extra = struct.pack('<HHQQ', ZIP64_EXTRA_ID, 16, len(data), len(data)) + other
+        zf.writestr(info, data)
+
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(target, 'w') as zout:
+        copy_raw_member(zin, zout, zin.getinfo('big.bin'))
+
+    with zipfile.ZipFile(target) as zf:
+        assert zf.testzip() is None
+        assert zf.read('big.bin') == data
+        assert zf.getinfo('big.bin').extra == other
+
+
+@pytest.mark.parametrize('extra, expected', [
+    (b'', b''),
+    (struct.pack('<HHQ', ZIP64_EXTRA_ID, 8, 1), b''),
+    (struct.pack('<HH', 0x5455, 1) + b'x' + struct.pack('<HHQ', ZIP64_EXTRA_ID, 8, 1),
+     struct.pack('<HH', 0x5455, 1) + b'x'),
+])
+def test_strip_zip64_extra(extra, expected):
+    assert strip_zip64_extra(extra) == expected
+
+
+def test_copy_without_private_attributes(tmp_path):
+    """ZipFile 내부 속성이 없으면 다시 압축해서 복사 (내용은 같음)"""
+    source, target = tmp_path / 'in.zip', tmp_path / 'out.zip'
+    make_zip(source)
+
+    class PublicZipFile:
+        """ZipFile 의 공개 API 만 노출"""
+
+        def __init__(self, zf):
+            self.open = zf.open
+
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(target, 'w') as zout:
+        for info in zin.infolist():
+            copy_raw_member(zin, PublicZipFile(zout), info)
+
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(target) as zf:
+        assert [(info.filename, info.compress_type) for info in zf.infolist()] == \
+            [(info.filename, info.compress_type) for info in zin.infolist()]
+        for info in zin.infolist():
+            assert zf.read(info.filename) == zin.read(info)
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Converter CLI
+헤드리스 배치 변환기 - GUI 없이 cron / CI 에서 실행
+
+사용 예:
+    python webp2jpg.py convert SRC [SRC ...] -o OUT --jobs 4
+"""
+
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+
+from pathlib import Path
+
+from webp_converter import (ConversionEngine, ConversionOptions, DEFAULT_FRAME_THREADS,
+                            DEFAULT_PROFILE, FRAME_MODES, PROFILES, RESAMPLE_FILTERS,
+                            RESIZE_MODES, default_jobs, print_emit)
+from webp_archive import DEFAULT_MAX_DEPTH, DEFAULT_MAX_EXPANDED
+from webp_dedup import LINK_MODES
+from webp_metrics import profiled, write_metrics
+from webp_pipeline import DEFAULT_READERS, DEFAULT_WRITERS
+from webp_quality import DEFAULT_MAX_TRIALS
+from webp_settings import (DEFAULT_BATCH, DEFAULT_HOST, DEFAULT_INTERVAL, DEFAULT_MAX_BODY,
+                           DEFAULT_PORT, DEFAULT_QUEUE_PER_JOB, DEFAULT_SETTLE)
+
+
+def options_from_args(args):
+    """convert / watch 공통 변환 설정 - --target-ssim 인데 NumPy가 없으면 None"""
+    if args.target_ssim:
+        from webp_quality import load_numpy
+        if load_numpy() is None:
+            print("❌ --target-ssim 에는 NumPy가 필요합니다 (pip install numpy)", file=sys.stderr)
+            return None
+    return ConversionOptions(zip_compresslevel=args.zip_level,
+                             dedup=args.dedup, dedup_link=args.dedup_link,
+                             sizes=args.size or (), resize_mode=args.resize_mode,
+                             resample=args.resample, background=args.background,
+                             profile=args.profile, quality=args.quality,
+                             target_ssim=args.target_ssim, max_trials=args.max_trials,
+                             frames=args.frames, frame_threads=args.frame_threads,
+                             max_depth=args.max_depth, max_expanded=args.max_expanded)
+
+
+def create_engine(args, output, options, **kwargs):
+    """convert / watch 공통 엔진 설정으로 변환 엔진 생성"""
+    return ConversionEngine(output, jobs=args.jobs, options=options,
+                            hash_check=args.hash_check, memory_budget=args.memory_budget,
+                            readers=args.readers, writers=args.writers,
+                            read_ahead=args.read_ahead, write_behind=args.write_behind, **kwargs)
+
+
+def cmd_convert(args):
+    """convert 명령 - 폴더/ZIP/WebP 일괄 변환"""
+    options = options_from_args(args)
+    if options is None:
+        return 2
+    engine = create_engine(args, args.output, options, incremental=args.incremental,
+                           resume=not args.no_resume)
+
+    # 첫 Ctrl+C 는 실행 중인 작업을 마무리하고 멈춤, 두 번째는 바로 종료
+    def interrupt(signum, frame):
+        print("\n⏹️ 중단 요청 - 실행 중인 작업을 마무리하는 중 (한 번 더 누르면 바로 종료)",
+              file=sys.stderr, flush=True)
+        engine.cancel()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGINT, interrupt)
+
+    started = time.time()
+    with profiled(engine.emit, cprofile_path=args.cprofile, tracemalloc_top=args.tracemalloc):
+        summary = engine.convert_items(args.sources)
+    if args.metrics:
+        run = {'timestamp': round(started, 3), 'elapsed': round(time.time() - started, 3),
+               'jobs': engine.jobs, 'profile': options.profile,
+               'sources': summary.total_count, 'succeeded': summary.successful_count,
+               'failed': len(summary.failed_files), 'images': summary.converted_images,
+               'failed_images': summary.failed_images, 'skipped_images': summary.skipped_images,
+               'resumed_images': summary.resumed_images, 'cancelled': summary.cancelled}
+        write_metrics(args.metrics, summary.encode_stats.metrics, run, args.metrics_format)
+    if summary.cancelled:
+        return 130
+    return 0 if summary.successful_count and not summary.failed_files else 1
+
+
+def cmd_watch(args):
+    """watch 명령 - 감시 폴더에 들어오는 WebP/ZIP/tar 를 계속 변환 (Ctrl+C 로 종료)"""
+    from webp_watch import FolderWatch
+
+    options = options_from_args(args)
+    if options is None:
+        return 2
+    output = Path(args.output)
+    # 엔진과 변환 워커는 상주하는 동안 계속 재사용
+    # 증분 변환 매니페스트로 재시작해도 이미 변환한 파일은 건너뜀
+    engine = create_engine(args, output, options, incremental=True, resume=False,
+                           keep_workers=True)
+
+    def convert(paths, relatives):
+        """감시 폴더의 상대 폴더 구조대로 출력 - 실패한 입력 경로 반환"""
+        summary = engine.convert_items(paths, {path: output / relative
+                                               for path, relative in relatives.items()})
+        if summary.cancelled:
+            # 어느 파일까지 끝났는지 모름 - 옮기지 않고 다음 실행에서 증분 변환으로 이어감
+            return paths
+        return summary.failed_files
+
+    watch = FolderWatch(args.directories, convert, print_emit, settle=args.settle,
+                        interval=args.interval, batch=args.batch, polling=args.polling,
+                        processed_directory=args.processed,
+                        exclude=[path for path in (args.output, args.processed) if path])
+
+    # Ctrl+C - 진행 중인 변환을 마무리하고 종료, 두 번째는 바로 종료
+    def interrupt(signum, frame):
+        print("\n⏹️ 종료 요청 - 실행 중인 작업을 마무리하는 중 (한 번 더 누르면 바로 종료)",
+              file=sys.stderr, flush=True)
+        watch.stop()
+        engine.cancel()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGINT, interrupt)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, interrupt)
+
+    try:
+        watch.run()
+    finally:
+        engine.close()
+    return 0
+
+
+def cmd_serve(args):
+    """serve 명령 - 로컬 HTTP 변환 서비스 (Ctrl+C 로 종료)"""
+    from webp_server import ConversionServer
+
+    options = options_from_args(args)
+    if options is None:
+        return 2
+    server = ConversionServer((args.host, args.port), options, jobs=args.jobs, queue=args.queue,
+                              max_body=args.max_body, spool_directory=args.spool)
+    print(f"🌐 변환 서버 시작: http://{args.host}:{server.port} "
+          f"(워커 {server.jobs}개, 동시 요청 상한 {server.capacity}개)", flush=True)
+
+    # Ctrl+C - 처리 중인 요청을 마무리하고 종료 (shutdown 은 serve_forever 와 다른 스레드에서)
+    def interrupt(signum, frame):
+        print("\n⏹️ 종료 요청 - 처리 중인 요청을 마무리하는 중", file=sys.stderr, flush=True)
+        threading.Thread(target=server.shutdown, daemon=True).start()
+    signal.signal(signal.SIGINT, interrupt)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, interrupt)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+    print("👋 서버 종료", flush=True)
+    return 0
+
+
+def cmd_bench(args):
+    """bench 명령 - 성능 측정 결과를 JSON으로 출력"""
+    import webp_bench
+
+    width, height = args.size
+    if args.suite == "throughput":
+        modes = args.modes.split(",") if args.modes else webp_bench.THROUGHPUT_MODES
+        unknown = set(modes) - set(webp_bench.THROUGHPUT_MODES)
+        if unknown:
+            print(f"❌ 알 수 없는 처리 방식: {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 2
+        report = webp_bench.bench_throughput(jobs=args.jobs, scale=args.scale, seed=args.seed,
+                                             modes=modes, corpus=args.corpus)
+    elif args.suite == "profiles":
+        report = webp_bench.bench_profiles(width, height, repeat=args.repeat,
+                                           input_path=args.input)
+    else:
+        report = webp_bench.bench_flatten(width, height, repeat=args.repeat)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+def parse_frames(value):
+    """프레임 설정 파싱 - first/all/sheet 또는 프레임 번호(1부터)"""
+    if value in FRAME_MODES:
+        return value
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"프레임은 {', '.join(FRAME_MODES)} 또는 1 이상의 번호여야 합니다: {value}")
+    return number
+
+
+def parse_ssim(value):
+    """0보다 크고 1보다 작은 SSIM 목표값 파싱"""
+    try:
+        target = float(value)
+    except ValueError:
+        target = None
+    if target is None or not 0 < target < 1:
+        raise argparse.ArgumentTypeError(f"SSIM 목표값은 0과 1 사이여야 합니다: {value}")
+    return target
+
+
+def parse_bytes(value):
+    """'512M', '4G' 같은 메모리 크기 파싱 (단위가 없으면 MB)"""
+    units = {'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+    text = value.strip().lower().rstrip('b')
+    multiplier = units.get(text[-1:], None)
+    try:
+        number = float(text[:-1] if multiplier else text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"메모리 크기는 512M, 4G 형식이어야 합니다: {value}")
+    return int(number * (multiplier or units['m']))
+
+
+def parse_size(value):
+    """'WIDTHxHEIGHT' 형식의 크기 파싱"""
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"크기는 WIDTHxHEIGHT 형식이어야 합니다: {value}")
+    return width, height
+
+
+def parse_color(value):
+    """'#RRGGBB' 또는 색 이름 파싱"""
+    from PIL import ImageColor
+
+    try:
+        return ImageColor.getrgb(value)[:3]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"알 수 없는 색: {value}")
+
+
+def build_parser():
+    """명령행 인자 파서 생성"""
+    parser = argparse.ArgumentParser(prog="webp2jpg",
+                                     description="WebP → JPG 변환기 (헤드리스 배치 모드)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # convert / watch 공통 - 출력, 워커/메모리, 파이프라인, 변환 설정
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-o", "--output", default=".",
+                        help="출력 폴더 (기본값: 현재 폴더)")
+    common.add_argument("-j", "--jobs", type=int, default=default_jobs(),
+                        help="변환 워커 프로세스 수 (기본값: CPU 코어 수)")
+    common.add_argument("--zip-level", type=int, default=6, choices=range(10),
+                        metavar="0-9",
+                        help="ZIP에 새로 압축하는 멤버의 deflate 레벨 (기본값: 6, JPG 등은 항상 STORED)")
+    common.add_argument("--memory-budget", type=parse_bytes, metavar="SIZE",
+                        help="동시에 변환하는 이미지들의 예상 디코딩 메모리 상한 (예: 4G, 기본값: 사용 가능한 메모리의 절반)"
+                             " - 상한보다 큰 이미지는 혼자 변환")
+    common.add_argument("--readers", type=int, default=DEFAULT_READERS,
+                        help=f"입력을 미리 읽는 스레드 수 (기본값: {DEFAULT_READERS}, 0이면 워커가 직접 읽고 씀)")
+    common.add_argument("--writers", type=int, default=DEFAULT_WRITERS,
+                        help=f"출력을 기록하는 스레드 수 (기본값: {DEFAULT_WRITERS})")
+    common.add_argument("--read-ahead", type=int, metavar="N",
+                        help="미리 읽어 둘 입력 수 (기본값: 워커 수 x 2)")
+    common.add_argument("--write-behind", type=int, metavar="N",
+                        help="기록을 기다릴 수 있는 출력 수 - 넘으면 변환을 멈춤 (기본값: 워커 수 x 2)")
+    common.add_argument("--hash-check", action="store_true",
+                        help="--incremental 사용 시 수정 시간이 바뀌어도 내용 해시가 같으면 건너뜀")
+    common.add_argument("--dedup", action="store_true",
+                        help="내용이 같은 WebP는 한 번만 인코딩하고 나머지 출력은 복제")
+    common.add_argument("--dedup-link", choices=LINK_MODES, default="auto",
+                        help="중복 출력 복제 방식 (기본값: auto = reflink, 안 되면 copy)")
+    common.add_argument("--size", type=int, action="append", metavar="PX",
+                        help="출력 최대 크기(px) - 여러 번 지정하면 크기별로 모두 저장 (예: --size 1600 --size 320)")
+    common.add_argument("--resize-mode", choices=RESIZE_MODES, default="fit",
+                        help="fit: 비율 유지, fill: 가운데를 정사각형으로 잘라서 채움 (기본값: fit)")
+    common.add_argument("--resample", choices=sorted(RESAMPLE_FILTERS), default="lanczos",
+                        help="축소 필터 (기본값: lanczos)")
+    common.add_argument("--background", type=parse_color, default=(255, 255, 255),
+                        help="투명 영역을 합성할 배경색 (기본값: #FFFFFF)")
+    common.add_argument("--frames", type=parse_frames, default="first", metavar="MODE",
+                        help="애니메이션 WebP - first: 첫 프레임 (기본값), all: 모든 프레임을 _f0001 번호로 저장, "
+                             "sheet: 프레임 격자 한 장, 숫자: 그 프레임만")
+    common.add_argument("--frame-threads", type=int, default=DEFAULT_FRAME_THREADS,
+                        help=f"--frames all 에서 프레임을 동시에 인코딩하는 스레드 수 (기본값: {DEFAULT_FRAME_THREADS})")
+    common.add_argument("--profile", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                        help="JPG 인코딩 프로필 - " + ", ".join(
+                            f"{name}: {profile.description}" for name, profile in PROFILES.items()))
+    common.add_argument("--quality", type=int, choices=range(1, 101), metavar="1-100",
+                        help="프로필의 JPG 품질 대신 사용할 값")
+    common.add_argument("--target-ssim", type=parse_ssim, metavar="0-1",
+                        help="원본과의 SSIM 이 이 값 이상인 가장 낮은 품질로 저장 (예: 0.98, NumPy 필요) "
+                             "- 품질 상한은 프로필/--quality 값")
+    common.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH, metavar="N",
+                        help=f"아카이브 안의 ZIP / tar 를 변환하는 중첩 깊이 상한 - 넘으면 원본 유지 (기본값: {DEFAULT_MAX_DEPTH})")
+    common.add_argument("--max-expanded", type=parse_bytes, default=DEFAULT_MAX_EXPANDED, metavar="SIZE",
+                        help=f"입력 하나에서 압축을 풀어 읽는 크기 상한 - 넘으면 zip bomb 으로 보고 실패 처리 "
+                             f"(기본값: {DEFAULT_MAX_EXPANDED // 1024 ** 3}G)")
+    common.add_argument("--max-trials", type=int, default=DEFAULT_MAX_TRIALS,
+                        help=f"--target-ssim 사용 시 이미지당 최대 인코딩 횟수 (기본값: {DEFAULT_MAX_TRIALS})")
+
+    convert_parser = subparsers.add_parser("convert", parents=[common],
+                                           help="폴더, ZIP, WebP 파일 변환")
+    convert_parser.add_argument("sources", nargs="+", metavar="SRC",
+                                help="변환할 폴더, ZIP, tar(.tar.gz 등) 또는 WebP 파일")
+    convert_parser.add_argument("--incremental", action="store_true",
+                                help="이전 실행 이후 바뀌지 않은 입력은 건너뜀 (출력 폴더에 매니페스트 저장)")
+    convert_parser.add_argument("--no-resume", action="store_true",
+                                help="중단된 이전 실행의 체크포인트를 무시하고 처음부터 변환")
+    convert_parser.add_argument("--metrics", metavar="FILE",
+                                help="단계별 시간/카운터 저장 (.prom 이면 Prometheus 텍스트, 그 밖에는 JSON lines 추가)")
+    convert_parser.add_argument("--metrics-format", choices=["jsonl", "prometheus"],
+                                help="--metrics 파일 형식 (기본값: 확장자로 판단)")
+    convert_parser.add_argument("--cprofile", metavar="FILE",
+                                help="실행 전체를 cProfile 로 측정해서 pstats 파일로 저장 (메인 프로세스만, -j 1 권장)")
+    convert_parser.add_argument("--tracemalloc", type=int, default=0, metavar="N",
+                                help="tracemalloc 으로 메모리 할당을 추적해서 상위 N개 위치 출력 (메인 프로세스만)")
+    convert_parser.set_defaults(func=cmd_convert)
+
+    watch_parser = subparsers.add_parser("watch", parents=[common],
+                                         help="감시 폴더에 들어오는 WebP/ZIP/tar 를 계속 변환 (상주 모드)")
+    watch_parser.add_argument("directories", nargs="+", metavar="DIR",
+                              help="감시할 폴더 (하위 폴더 포함, 출력은 같은 폴더 구조로 저장)")
+    watch_parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE, metavar="SEC",
+                              help=f"파일 크기/수정 시간이 이 시간 동안 그대로면 변환 - 복사 중인 파일 제외 (기본값: {DEFAULT_SETTLE:g}초)")
+    watch_parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, metavar="SEC",
+                              help=f"폴링 간격 / 알림 대기 시간 (기본값: {DEFAULT_INTERVAL:g}초)")
+    watch_parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, metavar="N",
+                              help=f"한 번에 변환하는 최대 파일 수 - 나머지는 다음 차례까지 대기 (기본값: {DEFAULT_BATCH})")
+    watch_parser.add_argument("--polling", action="store_true",
+                              help="inotify 대신 주기적으로 폴더를 다시 훑음 (네트워크 드라이브 등)")
+    watch_parser.add_argument("--processed", metavar="DIR",
+                              help="변환에 성공한 원본을 옮길 폴더 (기본값: 그대로 둠)")
+    watch_parser.set_defaults(func=cmd_watch)
+
+    serve_parser = subparsers.add_parser("serve", parents=[common],
+                                         help="로컬 HTTP 변환 서비스 (POST /convert, /batch, GET /metrics)")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST,
+                              help=f"받을 주소 (기본값: {DEFAULT_HOST})")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                              help=f"포트 - 0이면 빈 포트 (기본값: {DEFAULT_PORT})")
+    serve_parser.add_argument("--queue", type=int, metavar="N",
+                              help=f"워커를 기다릴 수 있는 요청 수 - 넘으면 503 (기본값: 워커 수 x {DEFAULT_QUEUE_PER_JOB})")
+    serve_parser.add_argument("--max-body", type=parse_bytes, default=DEFAULT_MAX_BODY, metavar="SIZE",
+                              help=f"요청 본문 크기 상한 - 넘으면 413 (기본값: {DEFAULT_MAX_BODY // 1024 ** 3}G)")
+    serve_parser.add_argument("--spool", metavar="DIR",
+                              help="/batch 아카이브를 받고 변환할 임시 폴더 (기본값: 시스템 임시 폴더)")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    bench_parser = subparsers.add_parser("bench", help="변환 경로 성능 측정 (JSON 출력)")
+    bench_parser.add_argument("suite", choices=["flatten", "profiles", "throughput"],
+                              help="flatten: 알파 합성 방식 비교 (이전 방식 vs flatten_alpha), "
+                                   "profiles: 인코딩 프로필별 출력 크기와 시간, "
+                                   "throughput: 합성 코퍼스로 처리 방식별 처리량/지연 시간/메모리")
+    bench_parser.add_argument("--size", type=parse_size, default=(7680, 4320),
+                              help="테스트 이미지 크기 (기본값: 7680x4320)")
+    bench_parser.add_argument("--input", metavar="WEBP",
+                              help="profiles: 합성 이미지 대신 사용할 WebP 파일")
+    bench_parser.add_argument("--repeat", type=int, default=5,
+                              help="반복 횟수 (기본값: 5)")
+    bench_parser.add_argument("--jobs", type=int, default=default_jobs(),
+                              help="throughput: folder/zip 변환 워커 수 (기본값: CPU 코어 수)")
+    bench_parser.add_argument("--modes", metavar="MODE[,MODE]",
+                              help="throughput: single, folder, zip 중 실행할 처리 방식 (기본값: 모두)")
+    bench_parser.add_argument("--scale", type=float, default=1.0,
+                              help="throughput: 코퍼스 파일 수 배율 (기본값: 1.0)")
+    bench_parser.add_argument("--seed", type=int, default=0,
+                              help="throughput: 코퍼스 생성 시드 (기본값: 0)")
+    bench_parser.add_argument("--corpus", metavar="DIR",
+                              help="throughput: 코퍼스를 만들고 재사용할 폴더 (기본값: 임시 폴더)")
+    bench_parser.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    """메인 함수"""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    # freeze_support 는 실행 파일로 묶었을 때만 필요 - 그 밖에는 multiprocessing 을 워커 풀을
+    # 만들 때 (--jobs 2 이상) 불러옴
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+    sys.exit(main())
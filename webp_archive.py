@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Archive Limits
+ZIP / tar 아카이브 판별과 중첩 아카이브 변환 제한 (zip bomb 방지)
+
+아카이브 안의 아카이브는 디스크에 풀지 않고 메모리에서 재귀적으로 변환한다.
+중첩 깊이가 상한을 넘는 아카이브는 열지 않고 원본 그대로 두고, 입력 하나에서 압축을
+풀어 읽은 바이트 합계가 상한을 넘으면 그 입력 전체를 실패로 처리한다.
+"""
+
+from webp_scan import classify
+
+# 변환할 수 있는 아카이브 종류
+ARCHIVE_KINDS = ('zip', 'tar')
+
+# 중첩 아카이브 깊이 상한 (선택한 아카이브가 0, 그 안의 아카이브가 1)
+DEFAULT_MAX_DEPTH = 3
+
+# 입력 하나(중첩 포함)에서 압축을 풀어 읽을 수 있는 바이트 합계 상한
+DEFAULT_MAX_EXPANDED = 64 * 1024 ** 3
+
+# tar 확장자 → 출력에 쓰는 압축 방식 (입력과 같은 형식으로 저장)
+TAR_COMPRESSION = {'.tar.gz': 'gz', '.tgz': 'gz', '.tar.bz2': 'bz2', '.tbz2': 'bz2',
+                   '.tar.xz': 'xz', '.txz': 'xz'}
+
+
+class ArchiveLimitError(ValueError):
+    """압축 해제 크기 상한 초과 - 그 입력 전체를 실패로 처리"""
+
+
+def archive_kind(name):
+    """아카이브 종류 ('zip', 'tar') - 아카이브가 아니면 None"""
+    kind = classify(str(name))
+    return kind if kind in ARCHIVE_KINDS else None
+
+
+def open_tar_output(fileobj, name, compresslevel=6):
+    """입력 이름과 같은 압축 방식으로 쓰기용 tar 열기 (순서대로만 기록)"""
+    import tarfile
+
+    lower = str(name).lower()
+    compression = next((value for suffix, value in TAR_COMPRESSION.items()
+                        if lower.endswith(suffix)), None)
+    if compression == 'gz':
+        return tarfile.open(fileobj=fileobj, mode='w:gz', compresslevel=compresslevel)
+    if compression == 'bz2':
+        return tarfile.open(fileobj=fileobj, mode='w:bz2', compresslevel=max(1, compresslevel))
+    if compression == 'xz':
+        return tarfile.open(fileobj=fileobj, mode='w:xz', preset=compresslevel)
+    return tarfile.open(fileobj=fileobj, mode='w')
+
+
+class ExpansionBudget:
+    """입력 하나에서 압축을 풀어 읽을 수 있는 남은 바이트"""
+
+    def __init__(self, limit=DEFAULT_MAX_EXPANDED):
+        self.limit = limit
+        self.used = 0
+
+    @property
+    def remaining(self):
+        return max(0, self.limit - self.used)
+
+    def take(self, size, name):
+        """멤버 하나를 읽기 전에 크기만큼 차감 - 상한을 넘으면 ArchiveLimitError"""
+        self.used += size
+        if self.used > self.limit:
+            raise ArchiveLimitError(f"압축 해제 크기 상한 초과 ({self.limit / (1024 ** 3):.1f} GB) "
+                                    f"- {name}: zip bomb 으로 보고 변환하지 않습니다")
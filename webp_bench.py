@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Benchmarks
+변환 경로 성능 측정 - 결과는 버전끼리 비교할 수 있도록 JSON으로 출력
+
+사용 예:
+    python webp2jpg.py bench flatten --size 7680x4320 --repeat 5
+    python webp2jpg.py bench profiles --input sample.webp
+    python webp2jpg.py bench throughput --jobs 4 --corpus bench-corpus
+"""
+
+import io
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import PIL
+from PIL import Image, ImageChops
+
+from webp_converter import (PROFILES, ConversionEngine, ConversionOptions, EncodeStats,
+                            convert_webp_to_jpg, encode_jpg_bytes, flatten_alpha)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def legacy_flatten(img):
+    """이전 방식의 알파 합성 (비교용) - Image.new + split() 마스크"""
+    if img.mode in ('RGBA', 'LA'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'RGBA':
+            background.paste(img, mask=img.split()[-1])
+        else:
+            background.paste(img)
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+FLATTEN_METHODS = {
+    'legacy': legacy_flatten,
+    'flatten_alpha': flatten_alpha,
+}
+
+
+def make_alpha_image(width, height):
+    """반투명 그라데이션이 들어간 RGBA 테스트 이미지"""
+    img = Image.merge('RGB', (
+        Image.linear_gradient('L').resize((width, height)),
+        Image.new('L', (width, height), 120),
+        Image.radial_gradient('L').resize((width, height)),
+    ))
+    img.putalpha(Image.linear_gradient('L').rotate(90).resize((width, height)))
+    return img
+
+
+def peak_rss_kb():
+    """현재 프로세스의 최대 RSS (KB) - 측정할 수 없으면 None"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _measure_flatten_memory(method, width, height, results):
+    """자식 프로세스에서 합성 한 번의 추가 최대 메모리 측정"""
+    img = make_alpha_image(width, height)
+    baseline = peak_rss_kb()
+    FLATTEN_METHODS[method](img)
+    peak = peak_rss_kb()
+    results.put(None if baseline is None else peak - baseline)
+
+
+def measure_flatten_memory(method, width, height):
+    """합성 방식별 추가 메모리(KB) - 측정마다 새 프로세스 사용"""
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_measure_flatten_memory,
+                                      args=(method, width, height, results))
+    process.start()
+    extra_kb = results.get()
+    process.join()
+    return extra_kb
+
+
+def bench_flatten(width=7680, height=4320, repeat=5):
+    """알파 합성 방식 비교 - 방식별 시간(ms)과 추가 메모리, 결과 픽셀 차이"""
+    img = make_alpha_image(width, height)
+    report = {'benchmark': 'flatten', 'width': width, 'height': height,
+              'repeat': repeat, 'methods': {}}
+
+    outputs = {}
+    for name, method in FLATTEN_METHODS.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            outputs[name] = method(img)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        report['methods'][name] = {
+            'best_ms': round(timings[0], 2),
+            'median_ms': round(timings[len(timings) // 2], 2),
+            'extra_peak_rss_kb': measure_flatten_memory(name, width, height),
+        }
+
+    # 두 방식의 결과가 같은지 확인 (채널별 최대 차이)
+    difference = ImageChops.difference(outputs['legacy'], outputs['flatten_alpha'])
+    report['max_pixel_difference'] = max(high for low, high in difference.getextrema())
+
+    legacy = report['methods']['legacy']['median_ms']
+    current = report['methods']['flatten_alpha']['median_ms']
+    report['speedup'] = round(legacy / current, 2) if current else None
+    return report
+
+
+def make_photo_image(width, height):
+    """사진과 비슷하게 색 변화가 있는 RGB 테스트 이미지 (압축률 비교용)"""
+    noise = Image.effect_noise((width, height), 40)
+    return Image.merge('RGB', (
+        ImageChops.add(Image.linear_gradient('L').resize((width, height)), noise, scale=2),
+        Image.radial_gradient('L').resize((width, height)),
+        ImageChops.subtract(Image.linear_gradient('L').rotate(90).resize((width, height)), noise),
+    ))
+
+
+def bench_profiles(width=1920, height=1080, repeat=3, input_path=None):
+    """인코딩 프로필별 출력 크기와 인코딩 시간 - 실제 변환처럼 WebP 바이트에서 시작"""
+    if input_path:
+        with open(input_path, 'rb') as f:
+            data = f.read()
+        with Image.open(io.BytesIO(data)) as img:
+            size = img.size
+    else:
+        img = make_photo_image(width, height)
+        size = img.size
+        buffer = io.BytesIO()
+        img.save(buffer, 'WEBP', quality=90)
+        data = buffer.getvalue()
+
+    report = {'benchmark': 'profiles', 'input': input_path or 'synthetic',
+              'width': size[0], 'height': size[1], 'input_bytes': len(data),
+              'repeat': repeat, 'profiles': {}}
+    for name, profile in PROFILES.items():
+        options = ConversionOptions(profile=name)
+        timings = []
+        for _ in range(repeat):
+            stats = EncodeStats()
+            started = time.perf_counter()
+            encode_jpg_bytes(data, options, stats)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        report['profiles'][name] = {
+            'description': profile.description,
+            'outputs': stats.images,
+            'output_bytes': stats.output_bytes,
+            'encode_ms': round(stats.encode_seconds * 1000, 2),
+            'total_median_ms': round(timings[len(timings) // 2], 2),
+        }
+    return report
+
+
+# 합성 코퍼스 구성 - (이름, 개수, 크기, 모드, 저장 옵션, 프레임 수)
+CORPUS = (
+    ('photo_small', 24, (640, 480), 'RGB', {'quality': 80}, 1),
+    ('photo_large', 4, (3000, 2000), 'RGB', {'quality': 80}, 1),
+    ('alpha', 12, (800, 600), 'RGBA', {'quality': 80}, 1),
+    ('lossless', 8, (800, 600), 'RGB', {'lossless': True}, 1),
+    ('animated', 4, (320, 240), 'RGBA', {'quality': 80}, 12),
+)
+
+# 작은 파일이 많은 ZIP - (이름, 개수, 크기)
+ZIP_CORPUS = ('many_small', 500, (128, 128))
+
+# 처리 방식 - single: 파일 하나씩 변환 경로 직접 호출, folder/zip: 변환 엔진
+THROUGHPUT_MODES = ('single', 'folder', 'zip')
+
+CORPUS_MANIFEST = "corpus.json"
+
+
+def make_synthetic_image(rng, size, mode):
+    """시드로 재현되는 사진 비슷한 테스트 이미지 (그라데이션 + 부드러운 노이즈)"""
+    width, height = size
+    small = (max(1, width // 4), max(1, height // 4))
+    noise = Image.frombytes('L', small, rng.randbytes(small[0] * small[1]))
+    img = Image.merge('RGB', (
+        Image.linear_gradient('L').resize(size),
+        noise.resize(size, Image.Resampling.BILINEAR),
+        Image.radial_gradient('L').resize(size),
+    ))
+    if mode == 'RGBA':
+        img.putalpha(Image.linear_gradient('L').rotate(90).resize(size))
+    return img
+
+
+def generate_corpus(root, scale=1.0, seed=0):
+    """합성 WebP 코퍼스 생성 - images/ 와 archives/many_small.zip, 구성 정보 반환"""
+    root = Path(root)
+    rng = random.Random(seed)
+    images = root / "images"
+    images.mkdir(parents=True, exist_ok=True)
+    manifest = {'scale': scale, 'seed': seed, 'categories': {}}
+
+    for name, count, size, mode, save_kwargs, frame_count in CORPUS:
+        count = max(1, round(count * scale))
+        total = 0
+        for index in range(count):
+            img = make_synthetic_image(rng, size, mode)
+            path = images / f"{name}_{index:04d}.webp"
+            if frame_count > 1:
+                frames = [ImageChops.offset(img, step * size[0] // frame_count, 0)
+                          for step in range(1, frame_count)]
+                img.save(path, 'WEBP', save_all=True, append_images=frames, duration=80,
+                         **save_kwargs)
+            else:
+                img.save(path, 'WEBP', **save_kwargs)
+            total += path.stat().st_size
+        manifest['categories'][name] = {'files': count, 'bytes': total, 'size': list(size),
+                                        'mode': mode, 'frames': frame_count}
+
+    name, count, size = ZIP_CORPUS
+    count = max(1, round(count * scale))
+    archives = root / "archives"
+    archives.mkdir(exist_ok=True)
+    zip_path = archives / f"{name}.zip"
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zout:
+        for index in range(count):
+            buffer = io.BytesIO()
+            make_synthetic_image(rng, size, 'RGB').save(buffer, 'WEBP', quality=80)
+            zout.writestr(f"{name}/{index:05d}.webp", buffer.getvalue())
+    manifest['categories'][name] = {'files': count, 'bytes': zip_path.stat().st_size,
+                                    'size': list(size), 'mode': 'RGB', 'frames': 1}
+
+    (root / CORPUS_MANIFEST).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    return manifest
+
+
+def load_corpus(root, scale=1.0, seed=0):
+    """같은 설정으로 만든 코퍼스가 있으면 재사용, 없으면 생성"""
+    manifest_path = Path(root) / CORPUS_MANIFEST
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        if manifest.get('scale') == scale and manifest.get('seed') == seed:
+            return manifest
+    return generate_corpus(root, scale, seed)
+
+
+def percentile(values, fraction):
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+def children_peak_rss_kb():
+    """끝난 자식 프로세스(변환 워커) 중 최대 RSS (KB) - 측정할 수 없으면 None"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+
+def _run_throughput_mode(mode, corpus_root, jobs, results):
+    """자식 프로세스에서 처리 방식 하나 실행 - 결과를 큐로 전달"""
+    corpus_root = Path(corpus_root)
+    output = Path(tempfile.mkdtemp(prefix="webp2jpg-bench-"))
+    try:
+        if mode == 'single':
+            files = sorted((corpus_root / "images").glob("*.webp"))
+            input_bytes = sum(path.stat().st_size for path in files)
+            options = ConversionOptions()
+            latencies = []
+            started = time.perf_counter()
+            for path in files:
+                file_started = time.perf_counter()
+                convert_webp_to_jpg(path, output / path.with_suffix('.jpg').name, options)
+                latencies.append(time.perf_counter() - file_started)
+            elapsed = time.perf_counter() - started
+            images = len(files)
+        else:
+            if mode == 'folder':
+                target = corpus_root / "images"
+                input_bytes = sum(path.stat().st_size for path in target.glob("*.webp"))
+            else:
+                target = corpus_root / "archives" / f"{ZIP_CORPUS[0]}.zip"
+                input_bytes = target.stat().st_size
+            engine = ConversionEngine(output, emit=lambda message_type, data: None, jobs=jobs)
+            started = time.perf_counter()
+            summary = engine.convert_items([target])
+            elapsed = time.perf_counter() - started
+            latencies = list(summary.encode_stats.latencies)
+            images = summary.converted_images
+
+        latencies.sort()
+        results.put({
+            'images': images,
+            'input_mb': round(input_bytes / (1024 * 1024), 3),
+            'seconds': round(elapsed, 3),
+            'images_per_s': round(images / elapsed, 2) if elapsed else None,
+            'mb_per_s': round(input_bytes / (1024 * 1024) / elapsed, 2) if elapsed else None,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+            'peak_rss_kb': peak_rss_kb(),
+            'workers_peak_rss_kb': children_peak_rss_kb(),
+        })
+    except Exception as e:
+        results.put({'error': str(e)})
+    finally:
+        shutil.rmtree(output, ignore_errors=True)
+
+
+def bench_throughput(jobs=1, scale=1.0, seed=0, modes=THROUGHPUT_MODES, corpus=None):
+    """변환 경로 처리량 - 처리 방식별 images/s, MB/s, p50/p99 지연 시간, 최대 RSS
+
+    corpus 폴더를 주면 코퍼스를 그곳에 만들고 다음 실행에서 재사용한다.
+    처리 방식마다 새 프로세스에서 실행해서 최대 RSS 가 서로 섞이지 않는다.
+    """
+    temporary = None
+    if corpus is None:
+        temporary = corpus = tempfile.mkdtemp(prefix="webp2jpg-corpus-")
+    try:
+        manifest = load_corpus(corpus, scale, seed)
+        report = {
+            'benchmark': 'throughput',
+            'environment': {
+                'python': platform.python_version(),
+                'pillow': PIL.__version__,
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+            },
+            'jobs': jobs,
+            'corpus': manifest,
+            'modes': {},
+        }
+        for mode in modes:
+            results = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_run_throughput_mode,
+                                              args=(mode, str(corpus), jobs, results))
+            process.start()
+            report['modes'][mode] = results.get()
+            process.join()
+        return report
+    finally:
+        if temporary is not None:
+            shutil.rmtree(temporary, ignore_errors=True)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Conversion Cache
+증분 변환용 매니페스트 - 이전 실행 이후 바뀌지 않은 입력은 다시 변환하지 않음
+
+출력 폴더의 SQLite 파일에 원본 경로별 (크기, 수정 시간, 내용 해시, 변환 설정, 출력 경로)를
+기록한다. 실행 시작 시 한 번 읽어서 메모리 dict로 조회하므로 입력 하나당 O(1)로 판단한다.
+"""
+
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+
+# 출력 폴더에 생성되는 매니페스트 파일 이름
+MANIFEST_NAME = ".webp2jpg-cache.sqlite"
+
+# 이 개수만큼 기록이 쌓이면 디스크에 반영
+COMMIT_INTERVAL = 1000
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """파일 내용 해시 (스트리밍으로 읽어서 메모리 사용량 일정)"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """증분 변환 매니페스트 (원본 경로 → 마지막 변환 정보)"""
+
+    def __init__(self, output_directory, settings_key, hash_check=False):
+        self.path = Path(output_directory) / MANIFEST_NAME
+        self.settings_key = settings_key
+        # True면 크기/수정 시간이 달라도 내용 해시가 같으면 건너뜀
+        self.hash_check = hash_check
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " source TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " content_hash TEXT,"
+            " settings TEXT NOT NULL,"
+            " output TEXT NOT NULL)")
+        self.entries = {
+            row[0]: row[1:]
+            for row in self.connection.execute(
+                "SELECT source, size, mtime_ns, content_hash, settings, output FROM entries")
+        }
+        self.pending = []
+        self.seen = set()
+        self.skipped_count = 0
+
+    @staticmethod
+    def source_key(source):
+        """매니페스트 키 - 절대 경로 문자열"""
+        return os.path.abspath(source)
+
+    def is_fresh(self, source, output):
+        """이전 실행과 같은 입력/설정이고 출력이 남아 있으면 True (변환 생략 가능)"""
+        key = self.source_key(source)
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+
+        size, mtime_ns, content_hash, settings, previous_output = entry
+        if settings != self.settings_key or previous_output != str(output):
+            return False
+        if not os.path.exists(output):
+            return False
+
+        stat = os.stat(source)
+        if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+            self.skipped_count += 1
+            return True
+
+        # 수정 시간만 바뀐 경우 (복사, touch 등) - 내용 해시로 한 번 더 확인
+        if self.hash_check and content_hash and stat.st_size == size:
+            if file_digest(source) == content_hash:
+                self.record(source, output, content_hash=content_hash)
+                self.skipped_count += 1
+                return True
+        return False
+
+    def record(self, source, output, content_hash=None):
+        """변환에 성공한 입력 기록"""
+        key = self.source_key(source)
+        stat = os.stat(source)
+        if content_hash is None and self.hash_check:
+            content_hash = file_digest(source)
+        entry = (stat.st_size, stat.st_mtime_ns, content_hash, self.settings_key, str(output))
+        self.entries[key] = entry
+        self.seen.add(key)
+        self.pending.append((key,) + entry)
+        if len(self.pending) >= COMMIT_INTERVAL:
+            self.flush()
+
+    def evict_missing(self, roots):
+        """이번 실행에서 스캔한 폴더 아래에 더 이상 없는 원본 기록 삭제 - 삭제 개수 반환"""
+        prefixes = tuple(os.path.join(self.source_key(root), '') for root in roots)
+        if not prefixes:
+            return 0
+        stale = [key for key in self.entries
+                 if key.startswith(prefixes) and key not in self.seen]
+        for key in stale:
+            del self.entries[key]
+        self.flush()
+        if stale:
+            self.connection.executemany("DELETE FROM entries WHERE source = ?",
+                                        [(key,) for key in stale])
+            self.connection.commit()
+        return len(stale)
+
+    def flush(self):
+        """쌓인 기록을 디스크에 반영"""
+        if self.pending:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO entries"
+                " (source, size, mtime_ns, content_hash, settings, output)"
+                " VALUES (?, ?, ?, ?, ?, ?)", self.pending)
+            self.connection.commit()
+            self.pending = []
+
+    def close(self):
+        """매니페스트 저장 후 닫기"""
+        self.flush()
+        self.connection.close()
@@ -0,0 +1,2088 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Conversion Engine
+GUI와 CLI가 함께 사용하는 변환 엔진 - tkinter 없이 동작 (헤드리스 서버, cron, CI 용)
+"""
+
+import hashlib
+import io
+import json
+import math
+import os
+import shutil
+import signal
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from array import array
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from PIL import Image, UnidentifiedImageError
+from webp_archive import (ARCHIVE_KINDS, DEFAULT_MAX_DEPTH, DEFAULT_MAX_EXPANDED,
+                          ArchiveLimitError, ExpansionBudget, archive_kind, open_tar_output)
+from webp_cache import ConversionCache
+from webp_dedup import clone_file, group_duplicates
+from webp_memory import (MemoryScheduler, ScheduledJob, default_memory_budget,
+                         estimate_file_memory, estimate_member_memory, estimate_zip_memory)
+from webp_metrics import StageMetrics
+from webp_journal import CheckpointJournal, run_key
+from webp_pipeline import (DEFAULT_READERS, DEFAULT_WRITERS, ConversionPipeline, PipelineJob,
+                           temporary_path, write_atomic)
+from webp_progress import ProgressTracker
+from webp_quality import DEFAULT_MAX_TRIALS, QualityCache, load_known_qualities, search_quality
+from webp_scan import classify, scan_tree
+from webp_settings import DEFAULT_PROFILE, FRAME_MODES, PROFILES, EncodeProfile, default_jobs
+
+
+# 이미 압축된 형식 - ZIP에 다시 deflate 해도 거의 줄지 않으므로 그대로 저장(STORED)
+STORED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.avif', '.heic',
+                     '.zip', '.gz', '.bz2', '.xz', '.7z', '.rar',
+                     '.mp3', '.mp4', '.m4a', '.mov', '.webm')
+
+# 압축 절약 효과 추정용 샘플 크기
+COMPRESSION_SAMPLE_SIZE = 256 * 1024
+
+# 축소 필터
+RESAMPLE_FILTERS = {
+    'nearest': Image.Resampling.NEAREST,
+    'box': Image.Resampling.BOX,
+    'bilinear': Image.Resampling.BILINEAR,
+    'hamming': Image.Resampling.HAMMING,
+    'bicubic': Image.Resampling.BICUBIC,
+    'lanczos': Image.Resampling.LANCZOS,
+}
+
+# fit: 비율 유지하며 최대 크기 안에 맞춤, fill: 가운데를 정사각형으로 잘라서 채움
+RESIZE_MODES = ('fit', 'fill')
+
+# 모든 프레임 저장 시 프레임 인코딩 스레드 수 (워커 프로세스 하나당)
+DEFAULT_FRAME_THREADS = 4
+
+# 프레임 격자(contact sheet)의 칸 하나 최대 크기(px)
+SHEET_CELL = 256
+
+# 진행률 전체 수를 일찍 알기 위해 변환보다 앞서 스캔해 두는 작업 수 상한과
+# 작업 하나를 보고할 때마다 더 스캔하는 항목 수
+SCAN_AHEAD_LIMIT = 100000
+SCAN_AHEAD_STEP = 64
+
+# ZIP 멤버 병렬 변환 - 워커 프로세스마다 열어 두는 입력 ZIP 수, 변환이 기록보다
+# 앞서갈 수 있는 묶음 수 (워커 수 배수)
+ARCHIVE_HANDLES = 4
+ZIP_WINDOW_PER_JOB = 4
+
+# zip64 확장 필드 헤더 ID (ZIP APPNOTE 4.5.3)
+ZIP64_EXTRA_ID = 0x0001
+
+# 아카이브 작업을 기다리는 동안 중단 요청을 확인하는 간격 (초)
+CANCEL_POLL_INTERVAL = 0.2
+
+# 중단으로 멈춘 아카이브 작업의 오류 메시지 (실패로 보고하지 않음)
+CANCELLED_ERROR = "변환 중단"
+
+# 워커 프로세스에서 열어 둔 입력 ZIP - (경로, (크기, 수정 시간)) → ZipFile
+open_archives = {}
+
+# 아카이브 멤버 사이에서 확인하는 중단 요청 (Event) - 워커 프로세스는 init_worker 에서,
+# 같은 프로세스에서 변환할 때는 엔진이 convert_items 동안 설정
+cancel_request = None
+
+# 목표 크기의 이 배수보다 크면 정수 배 reduce()로 먼저 빠르게 줄인 뒤 필터 적용
+REDUCING_GAP = 2.0
+
+
+class ConversionCancelled(Exception):
+    """중단 요청으로 아카이브 변환을 멈춤 - 쓰던 임시 출력은 지움"""
+
+
+def check_cancelled():
+    """중단 요청이 있으면 ConversionCancelled"""
+    if cancel_request is not None and cancel_request.is_set():
+        raise ConversionCancelled(CANCELLED_ERROR)
+
+
+class EncodeStats:
+    """인코딩 통계 (출력 크기, 인코딩 시간, 목표 화질 탐색 결과)"""
+
+    def __init__(self):
+        self.images = 0
+        self.output_bytes = 0
+        self.encode_seconds = 0.0
+        # 목표 화질 모드 - 탐색/캐시 사용 수, 시험 인코딩 수, 고정 품질 대비 크기
+        self.searched = 0
+        self.cache_hits = 0
+        self.trials = 0
+        self.baseline_bytes = 0
+        self.targeted_bytes = 0
+        self.qualities = {}         # 새로 찾은 품질 {키: (품질, 고정 품질 출력 크기)}
+        # 모든 프레임을 저장한 애니메이션 수와 프레임 수
+        self.animations = 0
+        self.frames = 0
+        # 이미지 하나당 변환 시간(초) - 벤치마크의 p50/p99 지연 시간 계산용
+        self.latencies = array('d')
+        # 단계별 시간과 바이트/픽셀 카운터
+        self.metrics = StageMetrics()
+
+    def add(self, other):
+        self.images += other.images
+        self.output_bytes += other.output_bytes
+        self.encode_seconds += other.encode_seconds
+        self.searched += other.searched
+        self.cache_hits += other.cache_hits
+        self.trials += other.trials
+        self.baseline_bytes += other.baseline_bytes
+        self.targeted_bytes += other.targeted_bytes
+        self.animations += other.animations
+        self.frames += other.frames
+        self.latencies.extend(other.latencies)
+        self.metrics.merge(other.metrics)
+
+
+class ConversionOptions:
+    """변환 설정 (프로세스 풀 워커로 그대로 전달됨)"""
+
+    # 출력 내용에 영향을 주지 않는 설정 - 증분 변환 캐시 키에서 제외
+    OUTPUT_NEUTRAL = ('dedup', 'dedup_link', 'frame_threads', 'max_expanded')
+
+    def __init__(self, zip_compresslevel=6, dedup=False, dedup_link='auto',
+                 sizes=(), resize_mode='fit', resample='lanczos', background=(255, 255, 255),
+                 profile=DEFAULT_PROFILE, quality=None, target_ssim=None,
+                 max_trials=DEFAULT_MAX_TRIALS, frames='first',
+                 frame_threads=DEFAULT_FRAME_THREADS, max_depth=DEFAULT_MAX_DEPTH,
+                 max_expanded=DEFAULT_MAX_EXPANDED):
+        # 새로 기록하는 ZIP 멤버의 deflate 압축 레벨 (0-9)
+        self.zip_compresslevel = zip_compresslevel
+        # JPEG 인코딩 프로필과 품질 덮어쓰기 (None 이면 프로필 값)
+        self.profile = profile
+        self.quality = quality
+        # 목표 화질 모드 - SSIM 이 target_ssim 이상인 가장 낮은 품질 사용 (None 이면 고정 품질)
+        self.target_ssim = target_ssim
+        self.max_trials = max_trials
+        # 출력 최대 크기(px) 목록 - 비어 있으면 원본 크기, 여러 개면 한 번 디코딩으로 모두 생성
+        if not sizes and PROFILES[profile].max_size:
+            sizes = (PROFILES[profile].max_size,)
+        self.sizes = tuple(sorted(set(sizes), reverse=True))
+        self.resize_mode = resize_mode
+        self.resample = resample
+        # 투명 영역을 합성할 배경색 (R, G, B)
+        self.background = tuple(background)
+        # 내용이 같은 입력은 한 번만 인코딩하고 나머지는 복제
+        self.dedup = dedup
+        self.dedup_link = dedup_link    # 'auto', 'reflink', 'hardlink', 'copy'
+        # 애니메이션 WebP - FRAME_MODES 중 하나 또는 프레임 번호(1부터)
+        self.frames = frames
+        self.frame_threads = max(1, frame_threads)
+        # 중첩 아카이브 - 깊이 상한, 입력 하나에서 압축을 풀어 읽는 바이트 상한 (zip bomb 방지)
+        self.max_depth = max_depth
+        self.max_expanded = max_expanded
+
+    @property
+    def encode_profile(self):
+        return PROFILES[self.profile]
+
+    def save_kwargs(self, img):
+        """원본 이미지의 메타데이터를 반영한 JPEG 저장 인자"""
+        return self.encode_profile.save_kwargs(quality=self.quality,
+                                               exif=img.info.get('exif'),
+                                               icc_profile=img.info.get('icc_profile'))
+
+    def cache_key(self):
+        """증분 변환 매니페스트에 기록하는 설정 값 - 설정이 바뀌면 다시 변환"""
+        settings = {key: value for key, value in vars(self).items()
+                    if key not in self.OUTPUT_NEUTRAL}
+        return json.dumps(settings, sort_keys=True, default=str)
+
+
+def print_emit(message_type, data):
+    """기본 메시지 출력 (콘솔) - GUI 없이 실행할 때 사용"""
+    if message_type == "log":
+        print(data, flush=True)
+
+
+def flatten_alpha(img, background=(255, 255, 255)):
+    """JPG 저장을 위해 RGB로 변환 - 투명 영역은 배경색으로 합성
+
+    배경색 캔버스 하나만 만들고 paste(img, mask=img)로 알파 채널을 그대로 마스크로 써서
+    한 번에 합성한다 (split()으로 채널별 이미지를 따로 만들지 않음).
+    투명색이 지정된 P/L 모드 이미지도 검정이 아니라 배경색으로 합성한다.
+    """
+    if img.mode == 'RGB' and 'transparency' not in img.info:
+        return img
+
+    # 알파를 RGBA/LA 형태로 맞추기 (투명색 P, 미리 곱해진 알파 등)
+    if img.mode in ('PA', 'La', 'RGBa') or 'transparency' in img.info:
+        img = img.convert('RGBA')
+
+    if img.mode in ('RGBA', 'LA'):
+        canvas = Image.new('RGB', img.size, background)
+        canvas.paste(img, mask=img)
+        return canvas
+    return img.convert('RGB')
+
+
+def resize_image(img, size, options):
+    """최대 크기 size에 맞게 축소 (확대는 하지 않음)"""
+    resample = RESAMPLE_FILTERS[options.resample]
+    width, height = img.size
+
+    if options.resize_mode == 'fill':
+        # 가운데 정사각형 영역만 box로 지정해서 잘라내기와 축소를 한 번에
+        crop = min(width, height)
+        side = min(size, crop)
+        if side == width == height:
+            return img
+        left = (width - crop) / 2
+        top = (height - crop) / 2
+        return img.resize((side, side), resample, box=(left, top, left + crop, top + crop),
+                          reducing_gap=REDUCING_GAP)
+
+    scale = size / max(width, height)
+    if scale >= 1:
+        return img
+    target = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return img.resize(target, resample, reducing_gap=REDUCING_GAP)
+
+
+def iter_variants(img, options, metrics=None):
+    """디코딩 한 번으로 출력 크기별 이미지 생성 - (크기, 이미지), 크기가 None이면 원본
+
+    큰 크기부터 만들고, 다음 크기는 바로 앞 결과에서 줄여서 계산량을 줄인다.
+    metrics 를 주면 디코딩/축소 시간과 디코딩한 픽셀 수를 기록한다.
+    """
+    metrics = metrics if metrics is not None else StageMetrics()
+    if options.sizes:
+        # draft를 지원하는 형식(JPEG 등)은 디코딩 단계에서 바로 축소
+        # (Pillow의 WebP 디코더는 축소 디코딩을 지원하지 않아 원본 크기로 디코딩됨)
+        largest = options.sizes[0]
+        img.draft('RGB', (largest, largest))
+
+    # Pillow 는 처음 픽셀을 쓸 때 디코딩하므로 여기서 디코딩 시간을 따로 잼
+    with metrics.time('decode'):
+        img.load()
+    metrics.count('pixels', img.width * img.height)
+
+    if not options.sizes:
+        yield None, img
+        return
+
+    current = img
+    for size in options.sizes:
+        with metrics.time('resize'):
+            current = resize_image(current, size, options)
+        yield size, current
+
+
+def variant_name(name, size, options):
+    """크기가 여러 개면 출력 이름에 크기 붙이기 (photo.jpg → photo_320.jpg)"""
+    if size is None or len(options.sizes) == 1:
+        return name
+    stem, extension = os.path.splitext(name)
+    return f"{stem}_{size}{extension}"
+
+
+def frame_name(name, frame):
+    """프레임 번호 붙이기 (sticker.jpg → sticker_f0001.jpg) - frame 은 0부터, None 이면 그대로"""
+    if frame is None:
+        return name
+    stem, extension = os.path.splitext(name)
+    return f"{stem}_f{frame + 1:04d}{extension}"
+
+
+def output_name(name, size, frame, options):
+    """출력 크기와 프레임 번호를 반영한 출력 이름"""
+    return frame_name(variant_name(name, size, options), frame)
+
+
+def output_names(name, options, frame_count=0):
+    """출력 경로(또는 ZIP 멤버 이름) 하나에서 만들어지는 실제 출력 이름 목록
+
+    frame_count 는 모든 프레임을 저장한 애니메이션의 프레임 수 (프레임별 출력 포함)
+    """
+    names = [variant_name(name, size, options) for size in (options.sizes or (None,))]
+    return names + [frame_name(variant, frame) for frame in range(frame_count) for variant in names]
+
+
+def flatten_variant(variant, options, stats=None):
+    """flatten_alpha + 합성 시간 기록"""
+    if stats is None:
+        return flatten_alpha(variant, options.background)
+    with stats.metrics.time('flatten'):
+        return flatten_alpha(variant, options.background)
+
+
+def encode_variant(rgb, save_kwargs, options, stats=None, key=None, output=None):
+    """RGB 이미지 하나를 JPG 바이트로 인코딩 - 목표 화질 모드면 품질 탐색
+
+    output(BytesIO 등 tell 이 되는 파일 객체)을 주면 현재 위치부터 바로 인코딩하고
+    JPG 바이트 대신 기록한 바이트 수를 반환한다.
+    """
+    started = time.perf_counter()
+    if options.target_ssim:
+        search = search_quality(rgb, save_kwargs, options.target_ssim,
+                                max_trials=options.max_trials, key=key)
+        data = search.data
+        length = len(data)
+        if output is not None:
+            output.write(data)
+    else:
+        buffer = output if output is not None else io.BytesIO()
+        start = buffer.tell()
+        rgb.save(buffer, 'JPEG', **save_kwargs)
+        length = buffer.tell() - start
+        data = buffer.getvalue() if output is None else None
+
+    if stats is not None:
+        elapsed = time.perf_counter() - started
+        stats.encode_seconds += elapsed
+        stats.metrics.observe('encode', elapsed)
+        stats.metrics.count('bytes_out', length)
+        stats.output_bytes += length
+        stats.images += 1
+        if options.target_ssim:
+            stats.trials += search.trials
+            stats.baseline_bytes += search.baseline_bytes
+            stats.targeted_bytes += length
+            if search.cached:
+                stats.cache_hits += 1
+            else:
+                stats.searched += 1
+                if key is not None:
+                    stats.qualities[key] = (search.quality, search.baseline_bytes)
+    return data if output is None else length
+
+
+def quality_key(content_hash, size, frame=None):
+    """목표 화질 모드에서 찾은 품질을 기억하는 키 (입력 내용 해시 + 출력 크기 + 프레임)"""
+    if content_hash is None:
+        return None
+    key = f"{content_hash}:{size or 0}"
+    return key if frame is None else f"{key}:{frame}"
+
+
+def select_frame(img, number):
+    """애니메이션에서 프레임 번호(1부터)로 이동"""
+    if not 1 <= number <= img.n_frames:
+        raise ValueError(f"프레임 {number}이(가) 없습니다 (전체 {img.n_frames}개)")
+    img.seek(number - 1)
+
+
+def contact_sheet(img, options):
+    """모든 프레임을 축소해서 격자로 배치한 한 장 - 프레임은 하나씩 디코딩해서 바로 붙임"""
+    count = img.n_frames
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    scale = min(1, SHEET_CELL / max(img.size))
+    cell = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+
+    sheet = Image.new('RGB', (cell[0] * columns, rows * cell[1]), options.background)
+    resample = RESAMPLE_FILTERS[options.resample]
+    for frame in range(count):
+        img.seek(frame)
+        thumbnail = img.resize(cell, resample, reducing_gap=REDUCING_GAP)
+        sheet.paste(flatten_alpha(thumbnail, options.background),
+                    ((frame % columns) * cell[0], (frame // columns) * cell[1]))
+    return sheet
+
+
+def encode_frame(frame_image, frame, save_kwargs, options, content_hash):
+    """프레임 하나를 크기별 JPG 바이트로 (프레임 인코딩 스레드) - (목록, 통계) 반환"""
+    stats = EncodeStats()
+    encoded = []
+    for size, variant in iter_variants(frame_image, options, stats.metrics):
+        rgb = flatten_variant(variant, options, stats)
+        key = quality_key(content_hash, size, frame)
+        encoded.append((size, encode_variant(rgb, save_kwargs, options, stats, key)))
+    return encoded, stats
+
+
+def iter_frame_jpgs(img, save_kwargs, options, stats, content_hash):
+    """애니메이션의 모든 프레임을 (크기, 프레임, JPG 바이트)로 순서대로 반환
+
+    프레임은 앞 프레임에 겹쳐 그리는 방식이라 디코딩은 순서대로 하고, 인코딩은
+    스레드로 병렬 처리한다. 디코딩한 프레임은 대기 중인 인코딩 수만큼만 메모리에 있다.
+    첫 프레임은 원래 출력 이름으로도 저장한다 (정지 이미지와 같은 대표 이미지).
+    """
+    pending = deque()
+    limit = options.frame_threads * 2
+    with ThreadPoolExecutor(max_workers=options.frame_threads) as executor:
+        for frame in range(img.n_frames):
+            # 다음 seek 에서 버퍼가 바뀌므로 복사해서 넘김
+            with stats.metrics.time('decode'):
+                img.seek(frame)
+                frame_image = img.copy()
+            pending.append((frame, executor.submit(encode_frame, frame_image, frame,
+                                                   save_kwargs, options, content_hash)))
+            while len(pending) >= limit or (pending and pending[0][1].done()):
+                yield from finish_frame(*pending.popleft(), stats)
+        while pending:
+            yield from finish_frame(*pending.popleft(), stats)
+
+    stats.animations += 1
+    stats.frames += img.n_frames
+
+
+def finish_frame(frame, future, stats):
+    """인코딩이 끝난 프레임의 출력 반환 (통계는 순서대로 합침)"""
+    encoded, frame_stats = future.result()
+    stats.add(frame_stats)
+    for size, jpg_data in encoded:
+        if frame == 0:
+            yield size, None, jpg_data
+        yield size, frame, jpg_data
+
+
+def iter_jpg_bytes(data, options=None, stats=None, output=None):
+    """WebP 바이트를 메모리에서 JPG 바이트로 변환 - (크기, 프레임, JPG 바이트)를 만드는 대로 반환
+
+    data 는 bytes, bytearray, memoryview, mmap 중 하나. bytes 는 복사하지 않고 그대로 디코더에
+    넘기고, 나머지는 Pillow 의 WebP 디코더가 bytes 를 요구하므로 한 번만 복사한다.
+    프레임은 애니메이션의 모든 프레임을 저장할 때만 번호(0부터), 그 밖에는 None
+    output 을 주면 JPG 를 output 에 바로 인코딩하고 바이트 대신 기록한 바이트 수를 반환한다
+    (모든 프레임 저장 설정이어도 대표 프레임만).
+    """
+    options = options or ConversionOptions()
+    stats = stats if stats is not None else EncodeStats()
+    if not isinstance(data, bytes):
+        # 버퍼를 바로 놓아서 mmap 을 닫을 수 있게 함
+        with memoryview(data) as view:
+            data = view.tobytes()
+    stats.metrics.count('bytes_in', len(data))
+    # 목표 화질 모드에서 찾은 품질은 입력 내용 해시 + 출력 크기별로 기억
+    content_hash = None
+    if options.target_ssim:
+        content_hash = hashlib.blake2b(data, digest_size=20).hexdigest()
+
+    try:
+        img = Image.open(io.BytesIO(data))
+    except UnidentifiedImageError:
+        # 메모리 버퍼 객체 대신 알아볼 수 있는 메시지로
+        raise UnidentifiedImageError("이미지 형식을 인식할 수 없습니다") from None
+
+    with img:
+        save_kwargs = options.save_kwargs(img)
+        source = img
+        # 애니메이션만 프레임 설정 적용 (정지 이미지는 그대로)
+        if getattr(img, 'n_frames', 1) > 1:
+            if options.frames == 'all' and output is None:
+                yield from iter_frame_jpgs(img, save_kwargs, options, stats, content_hash)
+                return
+            if options.frames == 'sheet':
+                # 프레임마다 디코딩과 축소를 번갈아 하므로 시트 전체를 축소 시간으로 기록
+                with stats.metrics.time('resize'):
+                    source = contact_sheet(img, options)
+            elif isinstance(options.frames, int):
+                select_frame(img, options.frames)
+
+        for size, variant in iter_variants(source, options, stats.metrics):
+            rgb = flatten_variant(variant, options, stats)
+            key = quality_key(content_hash, size)
+            yield size, None, encode_variant(rgb, save_kwargs, options, stats, key, output)
+
+
+def encode_jpg_bytes(data, options=None, stats=None):
+    """WebP 바이트를 메모리에서 JPG 바이트로 변환 - (크기, 프레임, JPG 바이트) 목록 반환"""
+    started = time.perf_counter()
+    encoded = list(iter_jpg_bytes(data, options, stats))
+    if stats is not None:
+        stats.latencies.append(time.perf_counter() - started)
+    return encoded
+
+
+def convert_bytes(buffer, profile=DEFAULT_PROFILE, options=None, stats=None):
+    """WebP 버퍼(bytes, bytearray, memoryview, mmap)를 JPG 바이트로 - 파일을 거치지 않는 라이브러리 API
+
+    options 를 주면 profile 대신 그 설정을 사용한다. 크기/프레임 설정으로 출력이 여러 개면
+    첫 번째 출력(가장 큰 크기, 대표 프레임)만 반환 - 모두 필요하면 iter_jpg_bytes 사용
+    """
+    output = io.BytesIO()
+    convert_into(buffer, output, profile, options, stats)
+    return output.getvalue()
+
+
+def convert_into(buffer, output, profile=DEFAULT_PROFILE, options=None, stats=None):
+    """WebP 버퍼를 변환해서 output(BytesIO 등)에 처음부터 기록 - 기록한 바이트 수 반환
+
+    같은 BytesIO 를 요청마다 다시 넘기면 출력 버퍼를 새로 만들지 않고 재사용한다
+    (이전 내용은 덮어쓰고 남는 부분은 잘라냄).
+    """
+    options = options or ConversionOptions(profile=profile)
+    started = time.perf_counter()
+    output.seek(0)
+    encoded = iter_jpg_bytes(buffer, options, stats, output)
+    try:
+        _, _, length = next(encoded)
+    finally:
+        # 나머지 크기는 만들지 않음
+        encoded.close()
+    output.truncate()
+    if stats is not None:
+        stats.latencies.append(time.perf_counter() - started)
+    return length
+
+
+def iter_convert_bytes(buffers, profile=DEFAULT_PROFILE, options=None, stats=None):
+    """WebP 버퍼 여러 개를 순서대로 JPG 로 - (JPG 바이트, 오류 메시지)를 하나씩 반환
+
+    변환에 실패한 버퍼는 (None, 오류 메시지), 나머지 버퍼는 계속 변환한다.
+    """
+    options = options or ConversionOptions(profile=profile)
+    for buffer in buffers:
+        try:
+            yield convert_bytes(buffer, options=options, stats=stats), None
+        except Exception as e:
+            yield None, str(e)
+
+
+def convert_webp_to_jpg(input_path, output_path, options=None, stats=None):
+    """WebP 파일 하나를 JPG로 변환해서 저장 (크기/프레임별 출력은 만드는 즉시 저장)"""
+    options = options or ConversionOptions()
+    stats = stats if stats is not None else EncodeStats()
+    started = time.perf_counter()
+    with stats.metrics.time('read'):
+        data = Path(input_path).read_bytes()
+    for size, frame, jpg_data in iter_jpg_bytes(data, options, stats):
+        with stats.metrics.time('write'):
+            write_atomic(output_name(str(output_path), size, frame, options), jpg_data)
+    stats.latencies.append(time.perf_counter() - started)
+
+
+def is_webp_member(info):
+    """ZIP 멤버가 WebP 이미지인지 확인"""
+    return not info.is_dir() and info.filename.lower().endswith('.webp')
+
+
+def jpg_member_name(name):
+    """WebP 멤버 이름을 JPG 멤버 이름으로 변경"""
+    return name[:-len('.webp')] + '.jpg'
+
+
+def member_compress_type(name):
+    """ZIP 멤버별 압축 정책 - 이미 압축된 형식은 STORED, 나머지는 DEFLATED"""
+    if name.lower().endswith(STORED_EXTENSIONS):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+class ZipWriteStats:
+    """ZIP 기록 통계 - 압축 정책으로 절약한 시간과 크기 보고용"""
+
+    def __init__(self):
+        self.copied_count = 0           # 원본 압축 바이트 그대로 복사
+        self.copied_bytes = 0
+        self.stored_count = 0           # 새로 기록 (STORED)
+        self.stored_bytes = 0
+        self.deflated_count = 0         # 새로 기록 (DEFLATED)
+        self.deflate_input_bytes = 0
+        self.deflate_output_bytes = 0
+        self.deflate_seconds = 0.0
+        self.reused_count = 0           # 중복 멤버 - 인코딩 결과 재사용
+        # STORED 멤버 샘플로 측정한 deflate 비용 (초/바이트, 압축률)
+        self.sample_seconds_per_byte = None
+        self.sample_ratio = None
+
+    def sample_deflate_cost(self, data, compresslevel):
+        """STORED로 기록한 데이터 일부를 deflate 해서 생략한 압축 비용 추정"""
+        sample = data[:COMPRESSION_SAMPLE_SIZE]
+        if self.sample_ratio is not None or not sample:
+            return
+        started = time.perf_counter()
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+        compressed_size = len(compressor.compress(sample)) + len(compressor.flush())
+        self.sample_seconds_per_byte = (time.perf_counter() - started) / len(sample)
+        self.sample_ratio = compressed_size / len(sample)
+
+    @property
+    def estimated_seconds_saved(self):
+        if self.sample_seconds_per_byte is None:
+            return 0.0
+        return self.stored_bytes * self.sample_seconds_per_byte
+
+    @property
+    def estimated_bytes_saved(self):
+        """STORED 대신 deflate 했다면 줄었을 크기 (작을수록 STORED가 유리)"""
+        if self.sample_ratio is None:
+            return 0
+        return int(self.stored_bytes * (1 - self.sample_ratio))
+
+    def describe(self):
+        """로그용 요약 문자열"""
+        return (f"STORED {self.stored_count}개 ({self.stored_bytes / 1024:.0f} KB), "
+                f"DEFLATED {self.deflated_count}개 ({self.deflate_input_bytes / 1024:.0f} → "
+                f"{self.deflate_output_bytes / 1024:.0f} KB, {self.deflate_seconds * 1000:.1f} ms), "
+                f"원본 복사 {self.copied_count}개 ({self.copied_bytes / 1024:.0f} KB) | "
+                f"재압축 생략으로 약 {self.estimated_seconds_saved * 1000:.1f} ms 절약, "
+                f"포기한 압축 이득 약 {self.estimated_bytes_saved / 1024:.0f} KB")
+
+
+def write_member(zout, info, data, options, stats):
+    """새 ZIP 멤버 기록 - 멤버 이름에 따라 STORED / DEFLATED 선택"""
+    compress_type = member_compress_type(info.filename)
+    started = time.perf_counter()
+    zout.writestr(info, data, compress_type=compress_type,
+                  compresslevel=options.zip_compresslevel)
+    if compress_type == zipfile.ZIP_STORED:
+        stats.stored_count += 1
+        stats.stored_bytes += len(data)
+        stats.sample_deflate_cost(data, options.zip_compresslevel)
+    else:
+        written = zout.getinfo(info.filename)
+        stats.deflated_count += 1
+        stats.deflate_input_bytes += len(data)
+        stats.deflate_output_bytes += written.compress_size
+        stats.deflate_seconds += time.perf_counter() - started
+
+
+def strip_zip64_extra(extra):
+    """extra 필드에서 zip64 레코드 (0x0001) 제거 - 필요하면 FileHeader() 가 새로 붙임"""
+    records = []
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, length = struct.unpack('<HH', extra[offset:offset + 4])
+        end = offset + 4 + length
+        if header_id != ZIP64_EXTRA_ID:
+            records.append(extra[offset:end])
+        offset = end
+    return b''.join(records) + extra[offset:]
+
+
+def copy_raw_member(zin, zout, info, stats=None, chunk_size=1024 * 1024):
+    """ZIP 멤버를 압축 해제 없이 압축된 바이트 그대로 복사 (재압축 없음)
+
+    zipfile에는 원본 바이트 복사 API가 없어서 로컬 헤더를 직접 기록한다. 이때 쓰는 ZipFile
+    내부 속성이 없으면 (Python 버전 차이) 압축을 풀어서 같은 방식으로 다시 압축한다.
+    """
+    # 원본 로컬 헤더 다음의 압축 데이터 위치 계산
+    zin.fp.seek(info.header_offset)
+    header = zin.fp.read(zipfile.sizeFileHeader)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    data_offset = info.header_offset + zipfile.sizeFileHeader + name_length + extra_length
+
+    out_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+    for attr in ('compress_type', 'comment', 'create_system', 'create_version',
+                 'extract_version', 'internal_attr', 'external_attr',
+                 'CRC', 'compress_size', 'file_size'):
+        setattr(out_info, attr, getattr(info, attr))
+    # 원본의 zip64 레코드를 그대로 두면 4 GiB 넘는 멤버는 FileHeader() 가 하나 더 붙여서 헤더가 깨짐
+    out_info.extra = strip_zip64_extra(info.extra)
+    # 크기/CRC를 로컬 헤더에 바로 기록하므로 데이터 디스크립터 플래그는 제거
+    out_info.flag_bits = info.flag_bits & ~0x08
+
+    if not all(hasattr(zout, attr) for attr in ('_lock', '_seekable', 'start_dir')):
+        with zin.open(info) as source, zout.open(out_info, 'w') as target:
+            shutil.copyfileobj(source, target, chunk_size)
+        if stats is not None:
+            stats.copied_count += 1
+            stats.copied_bytes += info.compress_size
+        return
+
+    with zout._lock:
+        if zout._seekable:
+            zout.fp.seek(zout.start_dir)
+        out_info.header_offset = zout.fp.tell()
+        zout.fp.write(out_info.FileHeader())
+
+        zin.fp.seek(data_offset)
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = zin.fp.read(min(chunk_size, remaining))
+            if not chunk:
+                raise zipfile.BadZipFile(f"압축 데이터가 잘렸습니다: {info.filename}")
+            zout.fp.write(chunk)
+            remaining -= len(chunk)
+
+        zout.filelist.append(out_info)
+        zout.NameToInfo[out_info.filename] = out_info
+        zout.start_dir = zout.fp.tell()
+
+    if stats is not None:
+        stats.copied_count += 1
+        stats.copied_bytes += info.compress_size
+
+
+def plan_zip_members(infos, options):
+    """(변환 결과로 대체되는 기존 멤버 이름, 중복 후보 (CRC, 크기) 집합)
+
+    중복 후보는 중앙 디렉토리의 (CRC, 크기)가 같은 WebP 멤버 - 전체 해시로 다시 확인한다.
+    """
+    converted_names = {name for info in infos if is_webp_member(info)
+                       for name in output_names(jpg_member_name(info.filename), options)}
+    duplicate_keys = set()
+    if options.dedup:
+        counts = Counter((info.CRC, info.file_size) for info in infos if is_webp_member(info))
+        duplicate_keys = {key for key, count in counts.items() if count > 1}
+    return converted_names, duplicate_keys
+
+
+def write_variants(zout, info, variants, options, stats, metrics):
+    """WebP 멤버의 변환 결과를 원본 멤버의 수정 시간/속성으로 기록"""
+    for size, frame, jpg_data in variants:
+        out_name = output_name(jpg_member_name(info.filename), size, frame, options)
+        out_info = zipfile.ZipInfo(out_name, date_time=info.date_time)
+        out_info.external_attr = info.external_attr
+        with metrics.time('zip'):
+            write_member(zout, out_info, jpg_data, options, stats)
+
+
+def read_member(zin, info, budget, metrics):
+    """ZIP 멤버 압축 해제 - 압축 해제 크기 상한에서 먼저 차감"""
+    budget.take(info.file_size, info.filename)
+    with metrics.time('read'):
+        return zin.read(info)
+
+
+def convert_nested(name, data, options, encode_stats, budget, depth):
+    """아카이브 바이트를 메모리에서 변환 - (새 아카이브 바이트, 멤버별 결과)
+
+    depth 는 이 아카이브의 중첩 깊이, 멤버 이름은 '아카이브 이름/멤버 이름'으로 보고한다.
+    """
+    source, target = io.BytesIO(data), io.BytesIO()
+    if archive_kind(name) == 'zip':
+        results, stats = convert_zip_members(source, target, options, encode_stats, budget, depth)
+    else:
+        results = convert_tar_members(source, target, name, options, encode_stats, budget, depth)
+    return target.getvalue(), [(f"{name}/{member}", success, error)
+                               for member, success, error in results]
+
+
+def nested_member(name, read, options, encode_stats, budget, depth):
+    """아카이브 안의 아카이브 멤버 변환 - (성공 여부, 오류 메시지, (새 바이트, 멤버별 결과))
+
+    read() 는 멤버 바이트를 읽는 함수. 깊이 상한을 넘으면 열지 않고 실패로 보고하고
+    (원본 유지), 압축 해제 크기 상한 초과는 입력 전체의 실패로 그대로 올린다.
+    """
+    if depth > options.max_depth:
+        return False, f"중첩 아카이브 깊이 상한({options.max_depth}) 초과 - 원본 유지", None
+    try:
+        return True, None, convert_nested(name, read(), options, encode_stats, budget, depth)
+    except (ArchiveLimitError, ConversionCancelled):
+        raise
+    except Exception as e:
+        return False, str(e), None
+
+
+def write_nested(zin, zout, info, outcome, options, stats, metrics):
+    """중첩 아카이브 멤버의 변환 결과 기록 - 멤버별 결과 목록 반환
+
+    실패했거나 안에 WebP 가 없으면 원본 압축 바이트를 그대로 복사한다.
+    """
+    success, error, converted = outcome
+    if success and converted[1]:
+        data, results = converted
+        out_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+        out_info.external_attr = info.external_attr
+        with metrics.time('zip'):
+            write_member(zout, out_info, data, options, stats)
+        return results
+    with metrics.time('zip'):
+        copy_raw_member(zin, zout, info, stats)
+    return [] if success else [(info.filename, False, error)]
+
+
+def convert_zip_members(source, target, options, encode_stats, budget, depth=0):
+    """ZIP → ZIP 변환 (source, target 은 경로 또는 파일 객체)
+
+    WebP 멤버는 메모리에서 JPG로 변환해서 바로 기록하고, 안에 든 ZIP / tar 는 재귀적으로
+    변환하고, 나머지 멤버는 압축된 바이트를 그대로 복사한다. 멤버 순서와 수정 시간은
+    원본과 같게 유지한다. ((멤버 이름, 성공 여부, 오류 메시지) 목록, ZipWriteStats) 반환
+    """
+    metrics = encode_stats.metrics
+    results = []
+    stats = ZipWriteStats()
+    with zipfile.ZipFile(source, 'r') as zin:
+        infos = zin.infolist()
+        converted_names, duplicate_keys = plan_zip_members(infos, options)
+        encoded = {}
+
+        with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as zout:
+            zout.comment = zin.comment
+            for info in infos:
+                check_cancelled()
+                if is_webp_member(info):
+                    try:
+                        data = read_member(zin, info, budget, metrics)
+                        content_key = None
+                        if (info.CRC, info.file_size) in duplicate_keys:
+                            content_key = hashlib.blake2b(data, digest_size=20).digest()
+                        variants = encoded.get(content_key)
+                        if variants is not None:
+                            stats.reused_count += 1
+                        else:
+                            variants = encode_jpg_bytes(data, options, encode_stats)
+                            if content_key is not None:
+                                encoded[content_key] = variants
+                    except ArchiveLimitError:
+                        raise
+                    except Exception as e:
+                        # 변환에 실패한 WebP는 원본 그대로 유지
+                        results.append((info.filename, False, str(e)))
+                        with metrics.time('zip'):
+                            copy_raw_member(zin, zout, info, stats)
+                        continue
+
+                    write_variants(zout, info, variants, options, stats, metrics)
+                    results.append((info.filename, True, None))
+                elif info.filename in converted_names:
+                    # 변환 결과와 이름이 같은 기존 파일은 변환 결과로 대체
+                    continue
+                elif not info.is_dir() and archive_kind(info.filename) is not None:
+                    outcome = nested_member(info.filename,
+                                            lambda: read_member(zin, info, budget, metrics),
+                                            options, encode_stats, budget, depth + 1)
+                    results.extend(write_nested(zin, zout, info, outcome, options, stats, metrics))
+                else:
+                    with metrics.time('zip'):
+                        copy_raw_member(zin, zout, info, stats)
+    return results, stats
+
+
+def convert_zip_stream(input_zip_path, output_zip_path, options=None, encode_stats=None):
+    """ZIP → ZIP 스트리밍 변환 (임시 폴더에 압축 해제하지 않음)
+
+    결과는 임시 파일에 쓰고 끝까지 기록한 뒤에 출력 이름으로 바꾼다.
+    ((멤버 이름, 성공 여부, 오류 메시지) 목록, ZipWriteStats) 반환
+    """
+    options = options or ConversionOptions()
+    encode_stats = encode_stats if encode_stats is not None else EncodeStats()
+    budget = ExpansionBudget(options.max_expanded)
+    temporary = temporary_path(output_zip_path)
+    try:
+        results, stats = convert_zip_members(input_zip_path, temporary, options, encode_stats,
+                                             budget)
+        os.replace(temporary, output_zip_path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    return results, stats
+
+
+def add_tar_member(tout, member, name, data):
+    """원본 멤버의 수정 시간/권한/소유자로 새 tar 멤버 기록"""
+    info = tout.tarinfo(name)
+    info.size = len(data)
+    for attr in ('mtime', 'mode', 'uid', 'gid', 'uname', 'gname'):
+        setattr(info, attr, getattr(member, attr))
+    tout.addfile(info, io.BytesIO(data))
+
+
+def convert_tar_members(source, target, name, options, encode_stats, budget, depth=0):
+    """tar → tar 스트리밍 변환 - 멤버를 순서대로 하나씩 읽어서 바로 기록 (전체를 풀지 않음)
+
+    source 는 처음부터 순서대로만 읽고 (압축 방식은 자동 판별), target 에는 name 과 같은
+    압축 방식으로 기록한다. 순서대로만 읽으므로 변환 결과와 이름이 같은 기존 파일은
+    변환 결과보다 뒤에 나올 때만 건너뛴다. (멤버 이름, 성공 여부, 오류 메시지) 목록 반환
+    """
+    import tarfile
+
+    metrics = encode_stats.metrics
+    results = []
+    written = set()
+    with tarfile.open(fileobj=source, mode='r|*') as tin, \
+            open_tar_output(target, name, options.zip_compresslevel) as tout:
+        for member in tin:
+            check_cancelled()
+            if not member.isfile():
+                # 폴더, 링크 등은 그대로
+                tout.addfile(member)
+                continue
+            if member.name in written:
+                continue
+            budget.take(member.size, member.name)
+            kind = classify(member.name)
+            if kind != 'webp' and kind not in ARCHIVE_KINDS:
+                with metrics.time('zip'):
+                    tout.addfile(member, tin.extractfile(member))
+                continue
+
+            with metrics.time('read'):
+                data = tin.extractfile(member).read()
+            if kind != 'webp':
+                success, error, converted = nested_member(member.name, lambda: data, options,
+                                                          encode_stats, budget, depth + 1)
+                if not success:
+                    results.append((member.name, False, error))
+                elif converted[1]:
+                    data = converted[0]
+                    results.extend(converted[1])
+                with metrics.time('zip'):
+                    add_tar_member(tout, member, member.name, data)
+                continue
+
+            try:
+                variants = encode_jpg_bytes(data, options, encode_stats)
+            except Exception as e:
+                # 변환에 실패한 WebP는 원본 그대로 유지
+                results.append((member.name, False, str(e)))
+                with metrics.time('zip'):
+                    add_tar_member(tout, member, member.name, data)
+                continue
+            with metrics.time('zip'):
+                for size, frame, jpg_data in variants:
+                    out_name = output_name(jpg_member_name(member.name), size, frame, options)
+                    add_tar_member(tout, member, out_name, jpg_data)
+                    written.add(out_name)
+            results.append((member.name, True, None))
+    return results
+
+
+def convert_tar_stream(input_tar_path, output_tar_path, options=None, encode_stats=None):
+    """tar(.gz/.bz2/.xz) → 같은 형식의 tar 스트리밍 변환 (임시 파일에 쓰고 이름 바꾸기)
+
+    (멤버 이름, 성공 여부, 오류 메시지) 목록 반환
+    """
+    options = options or ConversionOptions()
+    encode_stats = encode_stats if encode_stats is not None else EncodeStats()
+    budget = ExpansionBudget(options.max_expanded)
+    temporary = temporary_path(output_tar_path)
+    try:
+        with open(input_tar_path, 'rb') as source, open(temporary, 'wb') as target:
+            results = convert_tar_members(source, target, Path(output_tar_path).name, options,
+                                          encode_stats, budget)
+        os.replace(temporary, output_tar_path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    return results
+
+
+def open_archive(input_path, stamp):
+    """워커 프로세스의 입력 ZIP 핸들 - 워커마다 자기 파일 핸들로 멤버를 따로 읽음
+
+    stamp(크기, 수정 시간)가 바뀌면 새로 열고, 최근에 쓴 ARCHIVE_HANDLES 개만 열어 둔다.
+    """
+    key = (input_path, stamp)
+    zin = open_archives.pop(key, None)
+    if zin is None:
+        zin = zipfile.ZipFile(input_path)
+        while len(open_archives) >= ARCHIVE_HANDLES:
+            open_archives.pop(next(iter(open_archives))).close()
+    open_archives[key] = zin
+    return zin
+
+
+def encode_members(job):
+    """ZIP 멤버 병렬 변환 단계 - 멤버 묶음을 JPG 바이트로 (프로세스 풀 워커에서 호출)
+
+    중복 후보((CRC, 크기)가 같은 멤버)는 한 묶음으로 와서 내용이 같으면 한 번만 인코딩한다.
+    안에 든 아카이브는 멤버 하나가 한 묶음이고, limit 은 그 아카이브의 압축 해제 크기 상한 몫이다.
+    ([(성공 여부, 오류 메시지, 변환 결과, 재사용 여부)], 인코딩 통계) 반환
+    - 압축 해제 크기 상한 초과는 ArchiveLimitError 로 올림 (ZIP 전체 실패)
+    """
+    input_path, stamp, indexes, options, limit = job
+    encode_stats = EncodeStats()
+    metrics = encode_stats.metrics
+    try:
+        zin = open_archive(input_path, stamp)
+        infos = zin.infolist()
+    except Exception as e:
+        return [(False, str(e), None, False)] * len(indexes), encode_stats
+
+    if limit is not None:
+        info = infos[indexes[0]]
+        budget = ExpansionBudget(limit)
+        outcome = nested_member(info.filename, lambda: read_member(zin, info, budget, metrics),
+                                options, encode_stats, budget, 1)
+        return [outcome + (False,)], encode_stats
+
+    outcomes = []
+    encoded = {}
+    for index in indexes:
+        try:
+            with metrics.time('read'):
+                data = zin.read(infos[index])
+            content_key = None
+            if len(indexes) > 1:
+                content_key = hashlib.blake2b(data, digest_size=20).digest()
+            variants = encoded.get(content_key)
+            if variants is not None:
+                outcomes.append((True, None, variants, True))
+                continue
+            variants = encode_jpg_bytes(data, options, encode_stats)
+            if content_key is not None:
+                encoded[content_key] = variants
+            outcomes.append((True, None, variants, False))
+        except Exception as e:
+            # 변환에 실패한 WebP는 쓰기 스레드가 원본 그대로 유지
+            outcomes.append((False, str(e), None, False))
+    return outcomes, encode_stats
+
+
+class MemberGroup:
+    """워커 하나가 변환하는 ZIP 멤버 묶음 (보통 1개, 중복 후보는 여러 개)"""
+
+    def __init__(self):
+        self.indexes = []       # 중앙 디렉토리의 멤버 순번
+        self.cost = 0           # 예상 메모리 (멤버는 차례로 변환하므로 가장 큰 멤버 기준)
+        self.limit = None       # 안에 든 아카이브 - 압축 해제 크기 상한 몫
+        self.job = None         # 스케줄러 ScheduledJob
+        self.outcomes = None    # 멤버별 결과 (쓰기 스레드에 넘기면 None 으로 비움)
+
+
+class ParallelZipJob:
+    """ZIP 하나를 멤버 묶음으로 나눠서 여러 워커가 변환하는 작업 (부모 프로세스에서 진행)
+
+    묶음은 스케줄러(메모리 예산)를 거쳐 워커에서 변환하고, 쓰기 스레드 하나가 결과를 원본
+    멤버 순서대로 임시 파일에 기록한 뒤 출력 이름으로 바꾼다. 변환은 기록보다 window 묶음
+    넘게 앞서가지 않는다. pump() 할 때마다 진행하고, 끝나면 result 에 convert_job 과 같은
+    형식의 결과가 들어간다.
+    """
+
+    def __init__(self, task, scheduler, window):
+        kind, self.input_path, self.output_path, self.options = task
+        self.task = task
+        self.scheduler = scheduler
+        self.window = max(1, window)
+        self.stats = ZipWriteStats()
+        self.encode_stats = EncodeStats()
+        self.write_metrics = StageMetrics()     # 쓰기 스레드 전용 - 끝나면 encode_stats 에 합침
+        self.members = []       # 멤버별 (이름, 성공 여부, 오류 메시지) - 쓰기 스레드가 채움
+        self.slots = []         # 원본 순서의 (멤버, 묶음, 묶음 안 위치) - 묶음이 None 이면 그대로 복사
+        self.groups = []
+        self.next_group = 0     # 다음에 스케줄러에 넣을 묶음
+        self.next_slot = 0      # 다음에 쓰기 스레드에 넘길 멤버
+        self.in_flight = 0      # 스케줄러에 넣었지만 결과를 아직 받지 않은 묶음 수
+        self.writes = deque()
+        self.finish = None
+        self.result = None
+        self.zin = self.zout = self.writer = None
+        self.temporary = temporary_path(self.output_path)
+        try:
+            self.open()
+        except Exception as e:
+            self.fail(e)
+
+    def open(self):
+        """중앙 디렉토리로 멤버 묶음과 기록 순서를 정하고 출력 ZIP 열기"""
+        Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+        stat = os.stat(self.input_path)
+        self.stamp = (stat.st_size, stat.st_mtime_ns)
+        # 원본을 그대로 복사하는 멤버는 쓰기 스레드가 이 핸들로 읽음
+        self.zin = zipfile.ZipFile(self.input_path)
+        infos = self.zin.infolist()
+        converted_names, duplicate_keys = plan_zip_members(infos, self.options)
+        budget = ExpansionBudget(self.options.max_expanded)
+        nested = []
+        by_key = {}
+        for index, info in enumerate(infos):
+            if is_webp_member(info):
+                budget.take(info.file_size, info.filename)
+                key = (info.CRC, info.file_size)
+                group = by_key.get(key)
+                if group is None:
+                    group = MemberGroup()
+                    self.groups.append(group)
+                    if key in duplicate_keys:
+                        by_key[key] = group
+                self.slots.append((info, group, len(group.indexes)))
+                group.indexes.append(index)
+                group.cost = max(group.cost, self.member_cost(info))
+            elif info.filename in converted_names:
+                continue
+            elif not info.is_dir() and archive_kind(info.filename) is not None:
+                group = MemberGroup()
+                group.indexes.append(index)
+                # 안의 아카이브는 워커가 메모리에서 풀고 다시 묶음 (원본 + 결과)
+                group.cost = info.file_size * 2
+                self.groups.append(group)
+                self.slots.append((info, group, 0))
+                nested.append((group, info.file_size))
+            else:
+                self.slots.append((info, None, 0))
+        # 안의 아카이브들은 남은 압축 해제 크기 상한을 원본 크기 비율로 나눠 가짐
+        total = sum(size for group, size in nested) or 1
+        for group, size in nested:
+            group.limit = budget.remaining * size // total
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webp-zip-writer")
+        self.zout = zipfile.ZipFile(self.temporary, 'w', zipfile.ZIP_DEFLATED)
+        self.zout.comment = self.zin.comment
+
+    def member_cost(self, info):
+        """멤버 하나의 예상 메모리 - 헤더를 읽지 못하면 원본 크기 (워커에서 실패로 보고됨)"""
+        try:
+            return estimate_member_memory(self.zin, info, self.options)
+        except Exception:
+            return info.file_size
+
+    def pump(self):
+        """끝난 묶음의 결과를 멤버 순서대로 쓰기 스레드에 넘기고 다음 묶음을 스케줄러에 넣음"""
+        if self.result is not None:
+            return
+        try:
+            while self.writes and self.writes[0].done():
+                self.writes.popleft().result()
+            self.feed()
+            self.drain()
+            self.feed()
+            if self.next_slot == len(self.slots) and self.finish is None:
+                self.finish = self.writer.submit(self.close_output)
+            if self.finish is not None and self.finish.done():
+                self.finish.result()
+                self.writer.shutdown()
+                self.encode_stats.metrics.merge(self.write_metrics)
+                self.result = (True, None, self.members, self.stats, self.encode_stats)
+        except Exception as e:
+            self.fail(e)
+
+    def feed(self):
+        """기록을 window 묶음 넘게 앞서가지 않는 만큼 묶음을 스케줄러에 넣기"""
+        while self.next_group < len(self.groups) and self.in_flight < self.window:
+            group = self.groups[self.next_group]
+            group.job = self.scheduler.add(
+                (self.input_path, self.stamp, group.indexes, self.options, group.limit),
+                group.cost, encode_members)
+            self.next_group += 1
+            self.in_flight += 1
+
+    def drain(self):
+        """맨 앞 멤버부터 결과가 나온 만큼 쓰기 스레드에 넘기기 (쓰기 대기열은 window 개까지)"""
+        while self.next_slot < len(self.slots) and len(self.writes) < self.window:
+            info, group, position = self.slots[self.next_slot]
+            if group is None:
+                self.writes.append(self.writer.submit(self.copy_member, info))
+            else:
+                if group.outcomes is None:
+                    if group.job is None or not self.scheduler.ready(group.job):
+                        break
+                    group.outcomes = self.receive(group)
+                    self.in_flight -= 1
+                outcome, group.outcomes[position] = group.outcomes[position], None
+                self.writes.append(self.writer.submit(self.write_member, info, outcome))
+            self.next_slot += 1
+
+    def receive(self, group):
+        """끝난 묶음의 멤버별 결과 - 인코딩 통계는 합침"""
+        try:
+            outcomes, encode_stats = group.job.future.result()
+        except ArchiveLimitError:
+            raise
+        except Exception as e:
+            # 워커가 죽은 경우 등 - 묶음의 멤버는 모두 원본 유지
+            outcomes = [(False, str(e), None, False)] * len(group.indexes)
+        else:
+            self.encode_stats.add(encode_stats)
+            self.encode_stats.qualities.update(encode_stats.qualities)
+        group.job = None
+        return list(outcomes)
+
+    def copy_member(self, info):
+        """멤버를 원본 압축 바이트 그대로 복사 (쓰기 스레드)"""
+        with self.write_metrics.time('zip'):
+            copy_raw_member(self.zin, self.zout, info, self.stats)
+
+    def write_member(self, info, outcome):
+        """WebP 멤버의 변환 결과 기록 - 실패하면 원본 유지 (쓰기 스레드)"""
+        success, error, variants, reused = outcome
+        if archive_kind(info.filename) is not None:
+            self.members.extend(write_nested(self.zin, self.zout, info, outcome[:3], self.options,
+                                             self.stats, self.write_metrics))
+            return
+        if not success:
+            self.members.append((info.filename, False, error))
+            self.copy_member(info)
+            return
+        if reused:
+            self.stats.reused_count += 1
+        write_variants(self.zout, info, variants, self.options, self.stats, self.write_metrics)
+        self.members.append((info.filename, True, None))
+
+    def close_output(self):
+        """중앙 디렉토리를 기록하고 출력 이름으로 바꾸기 (쓰기 스레드)"""
+        self.zout.close()
+        self.zin.close()
+        os.replace(self.temporary, self.output_path)
+
+    def futures(self):
+        """이 작업이 기다리는 쓰기 Future"""
+        futures = list(self.writes)
+        if self.finish is not None:
+            futures.append(self.finish)
+        return futures
+
+    def fail(self, error):
+        """실패 - 남은 묶음을 취소하고 임시 파일 삭제"""
+        self.abort()
+        self.result = (False, str(error), None, None, self.encode_stats)
+
+    def abort(self):
+        """중단 - 쓰기 스레드를 멈추고 (진행 중인 기록은 마저 함) 임시 파일 삭제"""
+        for group in self.groups:
+            if group.job is not None:
+                self.scheduler.cancel(group.job)
+                group.job = None
+        if self.writer is not None:
+            self.writer.shutdown(wait=True, cancel_futures=True)
+        for archive in (self.zout, self.zin):
+            if archive is not None:
+                try:
+                    archive.close()
+                except Exception:
+                    pass    # 기록 중 실패한 출력 - 어차피 지움
+        self.temporary.unlink(missing_ok=True)
+
+
+def convert_job(job):
+    """변환 작업 하나 실행 (프로세스 풀 워커에서 호출)
+
+    (성공 여부, 오류 메시지, ZIP 멤버별 결과, ZIP 기록 통계, 인코딩 통계) 반환
+    - 단일 이미지 작업은 멤버 결과와 ZIP 기록 통계가 None
+    """
+    kind, input_path, output_path, options = job
+    encode_stats = EncodeStats()
+    try:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        if kind == 'zip':
+            members, zip_stats = convert_zip_stream(input_path, output_path, options, encode_stats)
+            return True, None, members, zip_stats, encode_stats
+        if kind == 'tar':
+            members = convert_tar_stream(input_path, output_path, options, encode_stats)
+            return True, None, members, None, encode_stats
+        convert_webp_to_jpg(input_path, output_path, options, encode_stats)
+        return True, None, None, None, encode_stats
+    except ConversionCancelled:
+        return False, CANCELLED_ERROR, None, None, encode_stats
+    except Exception as e:
+        return False, str(e), None, None, encode_stats
+
+
+def encode_job(job):
+    """파이프라인 변환 단계 - 미리 읽은 WebP 바이트를 JPG 바이트로 (프로세스 풀 워커에서 호출)
+
+    (convert_job 과 같은 형식의 결과, [(출력 경로, JPG 바이트)]) 반환 - 기록은 쓰기 스레드가 함
+    """
+    data, (kind, input_path, output_path, options) = job
+    encode_stats = EncodeStats()
+    try:
+        outputs = [(output_name(output_path, size, frame, options), jpg_data)
+                   for size, frame, jpg_data in encode_jpg_bytes(data, options, encode_stats)]
+        return (True, None, None, None, encode_stats), outputs
+    except Exception as e:
+        return (False, str(e), None, None, encode_stats), []
+
+
+def failed_result(error):
+    """파이프라인의 읽기/쓰기 단계에서 실패한 작업의 결과"""
+    return False, str(error), None, None, EncodeStats()
+
+
+def init_worker(known_qualities=None, cancel=None):
+    """프로세스 풀 워커 초기화 - Ctrl+C 는 부모가 받아서 중단을 정리하므로 워커는 무시
+
+    known_qualities 를 주면 이전 실행에서 찾은 품질을 미리 등록한다.
+    cancel 은 부모와 함께 쓰는 multiprocessing.Event - 아카이브 멤버 사이에서 확인한다.
+    """
+    global cancel_request
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    cancel_request = cancel
+    if known_qualities is not None:
+        load_known_qualities(known_qualities)
+
+
+class ConversionSummary:
+    """변환 결과 요약"""
+
+    def __init__(self, total_count):
+        self.total_count = total_count
+        self.successful_count = 0
+        self.failed_files = []
+        self.converted_images = 0
+        self.failed_images = 0
+        self.skipped_images = 0
+        self.resumed_images = 0     # 중단된 이전 실행에서 이미 변환한 수
+        self.cancelled = False
+        self.encodes_saved = 0      # 중복 입력이라 인코딩을 생략한 수
+        self.encode_stats = EncodeStats()
+
+
+class ConversionItem:
+    """선택된 항목 하나(폴더/ZIP/WebP)의 변환 계획"""
+
+    def __init__(self, path, kind, index=0):
+        self.path = path
+        self.kind = kind            # 'folder', 'zip', 'tar', 'webp'
+        self.index = index
+        # (입력 경로, 출력 경로, 표시 이름) - 폴더는 스캔하면서 만드는 제너레이터
+        self.jobs = []
+        self.notes = []             # 항목 시작 시 출력할 로그
+        self.found = Counter()      # 스캔에서 발견한 파일 종류별 개수
+        self.output_path = None
+        self.zip_stats = None
+        self.converted_count = 0
+        self.failed_count = 0
+        self.skipped_count = 0      # 증분 변환으로 건너뛴 작업
+        self.resumed_count = 0      # 이전 실행에서 완료해서 건너뛴 작업
+        self.error = None
+        self.cancelled = False      # 아카이브 변환 도중 중단 (결과를 보고하지 않음)
+
+    def note(self, message):
+        """항목 시작 시 출력할 로그 추가"""
+        self.notes.append(message)
+
+
+def skipped_messages(jpg_count, png_count):
+    """JPG/PNG 파일에 대한 패스 메시지"""
+    messages = []
+    if jpg_count:
+        messages.append(f"  📸 {jpg_count}개의 JPG 파일 - 변환 패스")
+    if png_count:
+        messages.append(f"  🖼️ {png_count}개의 PNG 파일 - 변환 패스")
+    return messages
+
+
+class ConversionEngine:
+    """WebP → JPG 변환 엔진 (폴더 / ZIP / 단일 WebP 처리)
+
+    항목을 스캔하면서 이미지 단위 작업을 바로 프로세스 풀에 넣어 병렬 변환하고,
+    결과는 항상 입력 순서대로 보고한다.
+    """
+
+    def __init__(self, output_directory, emit=None, jobs=1, options=None,
+                 incremental=False, hash_check=False, memory_budget=None,
+                 readers=DEFAULT_READERS, writers=DEFAULT_WRITERS, read_ahead=None,
+                 write_behind=None, resume=True, keep_workers=False):
+        self.output_directory = Path(output_directory)
+        # emit(message_type, data) - GUI는 메시지 큐, CLI는 콘솔 출력
+        self.emit = emit or print_emit
+        self.jobs = max(1, int(jobs))
+        # 동시에 변환하는 작업들의 예상 디코딩 메모리 합 상한 (바이트)
+        self.memory_budget = memory_budget or default_memory_budget()
+        self.scheduler = None
+        # 읽기/쓰기 스레드 파이프라인 - readers 가 0이면 워커가 직접 읽고 씀
+        self.readers = readers
+        self.writers = writers
+        self.read_ahead = read_ahead or self.jobs * 2
+        self.write_behind = write_behind or self.jobs * 2
+        self.pipeline = None
+        # 상주 모드 - 변환 워커를 convert_items 호출 사이에도 유지 (close() 로 종료)
+        self.keep_workers = keep_workers
+        self.executor = None
+        # 워커 프로세스와 함께 쓰는 중단 요청 (프로세스 풀을 만들 때 생성)
+        self.worker_cancel = None
+        # 멤버 단위로 병렬 변환 중인 ZIP (워커가 2개 이상일 때)
+        self.zip_jobs = []
+        # 단계별 시간/카운터 - 실행 중에는 summary.encode_stats.metrics 와 같은 객체
+        self.metrics = StageMetrics()
+        # 이미지/바이트 기준 진행률과 처리량
+        self.progress = ProgressTracker(self.emit)
+        self.options = options or ConversionOptions()
+        # 증분 변환 - 이전 실행 이후 바뀌지 않은 입력 건너뛰기
+        self.incremental = incremental
+        self.hash_check = hash_check
+        self.cache = None
+        # 목표 화질 모드에서 찾은 품질 캐시
+        self.qualities = None
+        # 체크포인트 - 중단된 같은 실행을 다시 시작하면 완료한 입력은 건너뜀
+        self.resume = resume
+        self.journal = None
+        # cancel() 을 부르면 새 작업을 넣지 않고, 실행 중인 작업만 마무리하고 멈춤
+        self.cancel_event = threading.Event()
+        # 중복 제거 - 대표 작업 → 복제로 만들 (항목, 작업) 목록
+        self.duplicates = {}
+
+    def log(self, message):
+        """로그 메시지 전달"""
+        self.emit("log", message)
+
+    def cancel(self):
+        """변환 중단 요청 (다른 스레드에서 호출)
+
+        실행 중인 이미지 작업의 출력은 끝까지 기록하고, 아카이브는 다음 멤버로 넘어가기 전에
+        멈추고 쓰던 임시 출력을 지운다 (다음 실행에서 그 아카이브는 처음부터 다시 변환).
+        """
+        self.cancel_event.set()
+        if self.worker_cancel is not None:
+            self.worker_cancel.set()
+
+    def close(self):
+        """keep_workers 로 유지하던 변환 워커 종료"""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def convert_items(self, items, output_directories=None):
+        """선택된 항목들(폴더/ZIP/WebP) 일괄 변환 후 결과 요약 반환
+
+        output_directories 에 입력 경로 → 출력 폴더를 주면 그 항목은 output_directory 대신
+        그 폴더에 저장한다 (감시 폴더의 하위 폴더 구조 유지용).
+        """
+        items = [str(item) for item in items]
+        output_directories = {str(path): Path(directory)
+                              for path, directory in (output_directories or {}).items()}
+        summary = ConversionSummary(len(items))
+        # 워커 결과의 단계별 시간은 encode_stats 에 합쳐지고, 스캔/파이프라인 시간도 같은 곳에 기록
+        self.metrics = summary.encode_stats.metrics
+        self.progress = ProgressTracker(self.emit)
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+
+        if self.incremental:
+            self.cache = ConversionCache(self.output_directory, self.options.cache_key(),
+                                         hash_check=self.hash_check)
+        if self.options.target_ssim:
+            self.qualities = QualityCache(self.output_directory, self.options.cache_key())
+            load_known_qualities(self.qualities.entries)
+        if self.resume:
+            self.journal = CheckpointJournal(self.output_directory,
+                                             run_key(items, self.options.cache_key()))
+            if self.journal.resumed:
+                self.log(f"⏯️ 중단된 실행을 이어서 변환 (이미 완료 {len(self.journal.completed)}개)")
+        completed = False
+        # 같은 프로세스의 워커 (스레드, 직접 실행) 가 아카이브 멤버 사이에서 확인
+        global cancel_request
+        cancel_request = self.cancel_event
+        try:
+            self.convert_plans(items, summary, output_directories)
+            summary.cancelled = self.cancel_event.is_set()
+            completed = not summary.cancelled
+            if completed and self.cache is not None:
+                # 스캔한 폴더에서 사라진 원본의 기록 정리
+                folders = [item for item in items if Path(item).is_dir()]
+                evicted = self.cache.evict_missing(folders)
+                if evicted:
+                    self.log(f"🧹 사라진 원본 {evicted}개의 캐시 기록 삭제")
+        finally:
+            cancel_request = None
+            if self.cache is not None:
+                self.cache.close()
+                self.cache = None
+            if self.qualities is not None:
+                self.qualities.close()
+                self.qualities = None
+            if self.journal is not None:
+                # 끝까지 완료했으면 기록 삭제, 중단/오류면 다음 실행을 위해 남김
+                if completed:
+                    self.journal.finish()
+                else:
+                    self.journal.close()
+                self.journal = None
+
+        # 결과 요약
+        self.emit("rate", self.progress.snapshot())
+        if summary.cancelled:
+            self.log(f"\n=== 변환 중단 ===")
+            self.log("⏹️ 같은 입력과 설정으로 다시 실행하면 이어서 변환합니다")
+        else:
+            self.emit("progress", 100)
+            self.log(f"\n=== 변환 완료 ===")
+        self.log(f"✅ 성공: {summary.successful_count}개")
+        self.log(f"❌ 실패: {len(summary.failed_files)}개")
+        self.log(f"📁 총 파일: {summary.total_count}개")
+        self.log(f"🖼️ 이미지: {summary.converted_images}개 변환, {summary.failed_images}개 실패")
+        if summary.skipped_images:
+            self.log(f"♻️ 변경 없음: {summary.skipped_images}개 건너뜀")
+        if summary.resumed_images:
+            self.log(f"⏯️ 이전 실행에서 완료: {summary.resumed_images}개 건너뜀")
+        if summary.encodes_saved:
+            self.log(f"🔗 중복 입력: 인코딩 {summary.encodes_saved}회 생략")
+        stats = summary.encode_stats
+        if stats.images:
+            self.log(f"💾 프로필 {self.options.profile}: JPG {stats.images}개, "
+                     f"출력 {stats.output_bytes / (1024 * 1024):.2f} MB, "
+                     f"인코딩 {stats.encode_seconds:.2f}초 "
+                     f"(이미지당 {stats.encode_seconds * 1000 / stats.images:.1f} ms)")
+        if stats.animations:
+            self.log(f"🎞️ 애니메이션 {stats.animations}개에서 프레임 {stats.frames}개 저장")
+        if stats.baseline_bytes:
+            saved = stats.baseline_bytes - stats.targeted_bytes
+            self.log(f"🎯 목표 SSIM {self.options.target_ssim}: 품질 탐색 {stats.searched}개 "
+                     f"(평균 {stats.trials / stats.images:.1f}회 인코딩), 캐시 사용 {stats.cache_hits}개")
+            self.log(f"📉 고정 품질 대비 {stats.baseline_bytes / (1024 * 1024):.2f} MB → "
+                     f"{stats.targeted_bytes / (1024 * 1024):.2f} MB "
+                     f"({saved * 100 / stats.baseline_bytes:.1f}% 절감)")
+        if self.progress.images_done:
+            images_per_second, mb_per_second = self.progress.average()
+            self.log(f"🚀 평균 처리량 - {images_per_second:.1f} img/s, {mb_per_second:.1f} MB/s")
+        if self.metrics.stages:
+            self.log(f"⏱️ 단계별 시간 (워커 합계) - {self.metrics.describe()}")
+            counters = self.metrics.counters
+            self.log(f"📦 입력 {counters.get('bytes_in', 0) / (1024 * 1024):.2f} MB → "
+                     f"출력 {counters.get('bytes_out', 0) / (1024 * 1024):.2f} MB, "
+                     f"디코딩 {counters.get('pixels', 0) / 1e6:.1f} MP")
+
+        if summary.failed_files:
+            self.log(f"\n실패한 파일들:")
+            for failed_file in summary.failed_files:
+                self.log(f"  - {Path(failed_file).name}")
+
+        return summary
+
+    def convert_plans(self, items, summary, output_directories=None):
+        """항목별 계획 → 병렬 변환 → 마무리"""
+        plans = self.iter_plans(items, output_directories or {})
+
+        # 중복 제거는 전체 입력을 알아야 하므로 스캔을 먼저 끝냄
+        self.duplicates = {}
+        if self.options.dedup:
+            plans = list(plans)
+            for item in plans:
+                with self.metrics.time('scan'):
+                    item.jobs = list(item.jobs)
+            self.find_duplicates(plans)
+
+        if self.jobs > 1:
+            self.log(f"\n>>> 변환 시작 (워커 {self.jobs}개, "
+                     f"메모리 예산 {self.memory_budget / (1024 * 1024):.0f} MB) <<<")
+        else:
+            self.log(f"\n>>> 변환 시작 (워커 {self.jobs}개) <<<")
+        self.run_entries(self.iter_entries(plans), summary)
+
+    def iter_plans(self, items, output_directories):
+        """항목별 변환 계획 - 폴더는 실제 스캔을 작업을 꺼낼 때까지 미룸"""
+        for index, file_path in enumerate(items):
+            try:
+                with self.metrics.time('scan'):
+                    item = self.plan_item(file_path, output_directories.get(file_path))
+            except Exception as e:
+                item = ConversionItem(file_path, None)
+                item.error = e
+            item.index = index
+            yield item
+
+    def iter_entries(self, plans):
+        """실행 흐름 - ('start', 항목), ('job', 항목, 작업)..., ('end', 항목) 순서"""
+        for item in plans:
+            yield ('start', item)
+            if item.error is None:
+                try:
+                    # 폴더 스캔은 작업을 꺼낼 때 진행되므로 꺼내는 시간을 스캔 시간으로 기록
+                    jobs = iter(item.jobs)
+                    while True:
+                        with self.metrics.time('scan'):
+                            job = next(jobs, None)
+                        if job is None:
+                            break
+                        yield ('job', item, job)
+                except Exception as e:
+                    item.error = e
+            yield ('end', item)
+
+    def run_entries(self, entries, summary):
+        """스캔과 변환을 겹쳐서 실행하고 결과는 입력 순서대로 보고
+
+        작업은 나오는 즉시 파이프라인(또는 스케줄러)에 넣고, 보고는 맨 앞 작업이
+        끝날 때마다 한다. 대기 중인 작업이 너무 많으면 넣기를 잠시 멈춘다.
+        스캔은 진행률의 전체 작업 수를 위해 변환보다 앞서 조금씩 (SCAN_AHEAD_STEP 개씩) 진행한다.
+        """
+        window = deque()
+        lookahead = deque()     # 스캔했지만 아직 넣지 않은 항목 (진행률 전체 수에는 포함)
+        entries = iter(entries)
+        pending = 0
+        limit = self.jobs * 4
+        if self.readers:
+            limit = max(limit, self.read_ahead + self.jobs + self.write_behind)
+        try:
+            while not self.cancel_event.is_set():
+                self.scan_ahead(entries, lookahead)
+                if not lookahead:
+                    break
+                entry = lookahead.popleft()
+                if entry[0] == 'job':
+                    item, job, task, size = entry[1], entry[2], entry[3], entry[4]
+                    if self.readers or self.jobs > 1:
+                        task = self.submit(task)
+                    entry = ('job', item, job, task, size)
+                    pending += 1
+                window.append(entry)
+
+                # 맨 앞이 표시이거나 끝난 작업이면 바로 보고, 대기 작업이 많으면 기다림
+                while window and (window[0][0] != 'job' or pending > limit
+                                  or self.is_ready(window[0][3])):
+                    if not self.wait_entry(window[0]):
+                        break
+                    pending -= self.handle_entry(window.popleft(), summary)
+
+            while window and not self.cancel_event.is_set() and self.wait_entry(window[0]):
+                pending -= self.handle_entry(window.popleft(), summary)
+
+            if self.cancel_event.is_set():
+                # 이미 끝난 작업의 결과만 보고하고 나머지는 버림 (다음 실행에서 다시 변환)
+                while window and (window[0][0] != 'job' or (
+                        isinstance(window[0][3], (PipelineJob, ScheduledJob, ParallelZipJob))
+                        and self.is_ready(window[0][3]))):
+                    pending -= self.handle_entry(window.popleft(), summary)
+                if pending:
+                    self.log(f"\n⏹️ 대기 중이던 작업 {pending}개 취소")
+        finally:
+            self.close_workers()
+
+    def scan_ahead(self, entries, lookahead):
+        """스캔을 SCAN_AHEAD_STEP 개만큼 더 진행해서 발견한 작업을 진행률 전체 수에 더함"""
+        if not self.progress.scanning:
+            return
+        for _ in range(SCAN_AHEAD_STEP):
+            if len(lookahead) >= SCAN_AHEAD_LIMIT:
+                return
+            entry = next(entries, None)
+            if entry is None:
+                self.progress.finish_scan()
+                return
+            if entry[0] == 'job':
+                item, job = entry[1], entry[2]
+                task = self.make_task(item, job)
+                # 진행률 단위 - (이미지 수, 입력 바이트)
+                size = self.measure_task(task)
+                self.progress.discover(*size)
+                entry = ('job', item, job, task, size)
+            lookahead.append(entry)
+
+    def measure_task(self, task):
+        """작업의 (이미지 수, 입력 바이트) - ZIP 은 중앙 디렉토리의 WebP 멤버 기준
+
+        tar 는 끝까지 읽기 전에는 멤버를 알 수 없어서 이미지 수 없이 파일 크기만 센다.
+        """
+        try:
+            if task[0] == 'zip':
+                with zipfile.ZipFile(task[1]) as zin:
+                    members = [info for info in zin.infolist() if is_webp_member(info)]
+                return len(members), sum(info.file_size for info in members)
+            if task[0] == 'tar':
+                return 0, os.path.getsize(task[1])
+            return 1, os.path.getsize(task[1])
+        except (OSError, zipfile.BadZipFile):
+            return 1, 0
+
+    def submit(self, task):
+        """작업의 디코딩 메모리를 헤더로 추정해서 파이프라인 또는 스케줄러에 추가"""
+        if self.scheduler is None:
+            self.scheduler = MemoryScheduler(self.worker_executor(), convert_job,
+                                             self.memory_budget, max_running=self.jobs,
+                                             owns_executor=not self.keep_workers)
+            if self.readers:
+                self.pipeline = ConversionPipeline(
+                    self.scheduler, encode_job, failed_result, readers=self.readers,
+                    writers=self.writers, read_ahead=self.read_ahead,
+                    write_behind=self.write_behind, metrics=self.metrics)
+
+        kind, input_path = task[0], task[1]
+        if kind == 'zip' and self.jobs > 1:
+            # 멤버를 여러 워커가 나눠 변환 - 예산은 멤버 묶음마다 따로 잡음
+            job = ParallelZipJob(task, self.scheduler, self.jobs * ZIP_WINDOW_PER_JOB)
+            self.zip_jobs.append(job)
+            return job
+        if kind == 'zip':
+            cost = estimate_zip_memory(input_path, is_webp_member, self.options)
+        elif kind == 'tar':
+            # 멤버를 미리 볼 수 없으므로 워커 하나 몫의 예산으로 잡음
+            cost = self.memory_budget // self.jobs
+        elif self.pipeline is not None:
+            # 읽기 스레드가 읽은 바이트의 헤더로 추정
+            return self.pipeline.add(task)
+        else:
+            cost = estimate_file_memory(input_path, self.options)
+        if self.pipeline is not None:
+            return self.pipeline.add(task, cost)
+        return self.scheduler.add(task, cost)
+
+    def worker_executor(self):
+        """이번 실행의 변환 워커 - keep_workers 면 이전 실행의 워커를 그대로 사용"""
+        if not self.keep_workers:
+            return self.create_executor()
+        if self.executor is not None and getattr(self.executor, '_broken', False):
+            # 워커 프로세스가 죽은 풀은 다시 쓸 수 없음 - 새로 만듦
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        if self.executor is None:
+            self.executor = self.create_executor()
+        return self.executor
+
+    def create_executor(self):
+        """변환 워커 생성 - 워커 1개면 스레드 하나, 아니면 프로세스 풀
+
+        프로세스 풀은 워커마다 이전 실행에서 찾은 품질을 미리 등록한다.
+        """
+        if self.jobs == 1:
+            return ThreadPoolExecutor(max_workers=1)
+        # multiprocessing 은 워커가 여러 개일 때만 불러옴
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+        entries = self.qualities.entries if self.qualities is not None else None
+        self.worker_cancel = multiprocessing.Event()
+        if self.cancel_event.is_set():
+            self.worker_cancel.set()
+        return ProcessPoolExecutor(max_workers=self.jobs, initializer=init_worker,
+                                   initargs=(entries, self.worker_cancel))
+
+    def close_workers(self):
+        """파이프라인/스케줄러 종료 및 단계별 사용량 보고"""
+        if self.scheduler is None:
+            return
+        if self.scheduler.peak > self.memory_budget:
+            self.log(f"📐 예산보다 큰 작업은 단독 실행 "
+                     f"(최대 예상 메모리 {self.scheduler.peak / (1024 * 1024):.0f} MB)")
+        for job in self.zip_jobs:
+            # 중단 - 쓰다 만 ZIP 은 지움 (다음 실행에서 다시 변환)
+            job.abort()
+        self.zip_jobs = []
+        if self.pipeline is not None:
+            names = {'read': "읽기", 'encode': "변환", 'write': "쓰기"}
+            self.log("📊 파이프라인 평균 점유 - " + ", ".join(
+                f"{names[stage]} {average:.1f}/{capacity} (최대 {peak})"
+                for stage, (average, peak, capacity) in self.pipeline.report().items()))
+            self.pipeline.shutdown()
+        else:
+            self.scheduler.shutdown()
+        self.scheduler = None
+        self.pipeline = None
+
+    def is_ready(self, task):
+        """작업 결과를 바로 받을 수 있는지 (직접 실행하는 작업은 항상 바로 실행)
+
+        확인할 때마다 병렬 변환 중인 ZIP 들을 모두 진행시켜서 여러 ZIP 이 함께 변환되게 한다.
+        """
+        self.pump_zips()
+        if isinstance(task, ParallelZipJob):
+            return task.result is not None
+        if isinstance(task, PipelineJob):
+            return self.pipeline.ready(task)
+        if isinstance(task, ScheduledJob):
+            return self.scheduler.ready(task)
+        return True
+
+    def pump_zips(self):
+        """병렬 변환 중인 ZIP 들을 진행시키고 끝난 작업은 목록에서 뺌"""
+        for job in list(self.zip_jobs):
+            job.pump()
+            if job.result is not None:
+                self.zip_jobs.remove(job)
+
+    def wait_entry(self, entry):
+        """보고할 항목이 아카이브 작업이면 끝날 때까지 기다림 - 중간에 중단 요청이 오면 False
+
+        아카이브 하나가 오래 걸리므로 끝까지 기다리지 않고 멈출 수 있게 한다. 기다리는 동안
+        다른 ZIP 과 파이프라인도 계속 진행한다. (워커는 멤버 사이에서 중단 요청을 보고 멈춤)
+        """
+        if entry[0] != 'job' or not isinstance(entry[3], (ParallelZipJob, ScheduledJob,
+                                                          PipelineJob)):
+            return True
+        if not isinstance(entry[3], ParallelZipJob) and archive_kind(entry[2][0]) is None:
+            return True
+        job = entry[3]
+        while not self.is_ready(job):
+            if self.cancel_event.is_set():
+                return False
+            if self.pipeline is not None:
+                self.pipeline.pump()
+            futures = [running.future for running in self.scheduler.running]
+            for zip_job in self.zip_jobs:
+                futures += zip_job.futures()
+            wait([future for future in futures if not future.done()],
+                 timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+        return True
+
+    def make_task(self, item, job):
+        """워커로 보낼 작업 (종류, 입력, 출력, 설정)"""
+        kind = archive_kind(job[0]) or 'image'
+        return (kind, str(job[0]), str(job[1]), self.options)
+
+    def handle_entry(self, entry, summary):
+        """실행 흐름의 항목 하나 처리 - 작업이면 1 반환"""
+        if entry[0] == 'start':
+            self.start_item(entry[1], summary)
+            return 0
+        if entry[0] == 'end':
+            self.end_item(entry[1], summary)
+            return 0
+
+        item, job, task, size = entry[1], entry[2], entry[3], entry[4]
+        if isinstance(task, PipelineJob):
+            result = self.pipeline.result(task)
+        elif isinstance(task, ScheduledJob):
+            result = self.scheduler.result(task)
+        elif isinstance(task, ParallelZipJob):
+            result = task.result
+        else:
+            result = convert_job(task)
+        if not result[0] and result[1] == CANCELLED_ERROR:
+            # 중단으로 멈춘 아카이브 - 임시 출력은 워커가 지웠고 결과는 남기지 않음
+            item.cancelled = True
+            self.progress.complete(*size)
+            return 1
+        self.handle_result(item, job, result, summary)
+        self.progress.complete(*size)
+        return 1
+
+    def start_item(self, item, summary):
+        """항목 처리 시작 로그"""
+        self.log(f"\n[{item.index+1}/{summary.total_count}] 처리 중: {Path(item.path).name}")
+        for message in item.notes:
+            self.log(message)
+
+    def end_item(self, item, summary):
+        """항목 마무리 및 결과 집계"""
+        if item.cancelled:
+            self.log(f"⏹️ 중단: {Path(item.path).name} - 다음 실행에서 다시 변환")
+            return
+        summary.skipped_images += item.skipped_count
+        summary.resumed_images += item.resumed_count
+        try:
+            success = item.error is None and self.finish_item(item)
+        except Exception as e:
+            item.error = e
+            success = False
+
+        if item.error is not None:
+            summary.failed_files.append(item.path)
+            self.log(f"❌ 오류: {Path(item.path).name} - {str(item.error)}")
+        elif success:
+            summary.successful_count += 1
+            self.log(f"✅ 완료: {Path(item.path).name}")
+        else:
+            summary.failed_files.append(item.path)
+            self.log(f"❌ 실패: {Path(item.path).name}")
+
+    def handle_result(self, item, job, result, summary):
+        """작업 하나의 결과 보고"""
+        success, error, members, zip_stats, encode_stats = result
+        input_path, output_path, label = job
+        summary.encode_stats.add(encode_stats)
+        if self.qualities is not None:
+            self.qualities.record(encode_stats.qualities)
+        item.zip_stats = zip_stats
+        if zip_stats is not None:
+            summary.encodes_saved += zip_stats.reused_count
+        if members is not None:
+            for name, member_success, member_error in members:
+                self.record_result(item, summary, f"{label}:{name}", member_success, member_error)
+            if self.cache is not None and all(member[1] for member in members):
+                self.cache.record(input_path, self.primary_output(item, output_path))
+            if self.journal is not None:
+                self.journal.record(input_path)
+        elif item.kind in ARCHIVE_KINDS:
+            item.error = error
+        else:
+            self.record_result(item, summary, label, success, error)
+            if success and self.cache is not None:
+                self.cache.record(input_path, self.primary_output(item, output_path))
+            if success and self.journal is not None:
+                self.journal.record(input_path)
+            if job in self.duplicates:
+                self.write_duplicates(job, success, error, summary, encode_stats.frames)
+
+    def find_duplicates(self, plans):
+        """폴더/WebP 항목에서 내용이 같은 입력을 찾아 대표 작업 하나만 남김"""
+        by_input = {}
+        for item in plans:
+            if item.kind in ('folder', 'webp'):
+                for job in item.jobs:
+                    if archive_kind(job[0]) is not None:
+                        # 폴더 안의 아카이브는 멤버 단위로 따로 변환
+                        continue
+                    by_input.setdefault(os.path.abspath(job[0]), []).append((item, job))
+        if not by_input:
+            return
+
+        # 같은 파일이 여러 번 선택된 경우 + 내용이 같은 다른 파일
+        groups = [[path] for path, entries in by_input.items() if len(entries) > 1]
+        grouped = {path for group in groups for path in group}
+        groups.extend(group for group in group_duplicates(list(by_input))
+                      if not grouped.intersection(group))
+
+        removed = set()
+        for group in groups:
+            entries = [entry for path in group for entry in by_input[path]]
+            primary_item, primary_job = entries[0]
+            self.duplicates[primary_job] = entries[1:]
+            removed.update(id(job) for item, job in entries[1:])
+
+        if removed:
+            for item in plans:
+                item.jobs = [job for job in item.jobs if id(job) not in removed]
+            self.log(f"\n🔗 중복 입력 {len(removed)}개 발견 - 한 번만 인코딩하고 복제")
+
+    def write_duplicates(self, job, success, error, summary, frame_count=0):
+        """대표 작업의 결과로 중복 입력의 출력 만들기"""
+        for item, duplicate in self.duplicates.pop(job):
+            input_path, output_path, label = duplicate
+            if not success:
+                self.record_result(item, summary, label, False, error)
+                continue
+            try:
+                method = 'same'
+                if Path(output_path) != Path(job[1]):
+                    # 크기별/프레임별 출력도 모두 복제
+                    for source, target in zip(
+                            output_names(str(job[1]), self.options, frame_count),
+                            output_names(str(output_path), self.options, frame_count)):
+                        method = clone_file(source, target, self.options.dedup_link)
+            except Exception as e:
+                self.record_result(item, summary, label, False, str(e))
+                continue
+            self.record_result(item, summary, f"{label} (🔗 {method})", True, None)
+            summary.encodes_saved += 1
+            if self.cache is not None:
+                self.cache.record(input_path, self.primary_output(item, output_path))
+            if self.journal is not None:
+                self.journal.record(input_path)
+
+    def record_result(self, item, summary, label, success, error):
+        """이미지 하나의 변환 결과 기록"""
+        if success:
+            item.converted_count += 1
+            summary.converted_images += 1
+            self.log(f"    ✅ {label}")
+        else:
+            item.failed_count += 1
+            summary.failed_images += 1
+            self.log(f"    ❌ {label} 변환 실패: {error}")
+
+    def plan_item(self, file_path, output_directory=None):
+        """파일/폴더 타입에 따라 변환 계획 생성 (output_directory 가 없으면 엔진의 출력 폴더)"""
+        output_directory = output_directory or self.output_directory
+        if not Path(file_path).exists():
+            item = ConversionItem(file_path, None)
+            item.note(f"  ⚠️ 경로를 찾을 수 없습니다: {file_path}")
+            return item
+        if Path(file_path).is_dir():
+            item = self.plan_folder(file_path, output_directory)
+        elif archive_kind(file_path) == 'zip':
+            item = self.plan_zip_file(file_path, output_directory)
+        elif archive_kind(file_path) == 'tar':
+            item = self.plan_tar_file(file_path, output_directory)
+        elif file_path.lower().endswith('.webp'):
+            item = self.plan_webp_file(file_path, output_directory)
+        else:
+            return ConversionItem(file_path, None)
+
+        if self.cache is not None:
+            item.jobs = self.skip_unchanged(item, item.jobs)
+        if self.journal is not None and self.journal.resumed:
+            item.jobs = self.skip_completed(item, item.jobs)
+        return item
+
+    def primary_output(self, item, output_path):
+        """증분 변환에서 존재 여부를 확인할 대표 출력 경로 (크기별 출력 중 첫 번째)"""
+        if archive_kind(output_path) is not None:
+            return str(output_path)
+        return output_names(str(output_path), self.options)[0]
+
+    def skip_unchanged(self, item, jobs):
+        """증분 변환 - 이전 실행 이후 바뀌지 않은 작업 제외"""
+        for job in jobs:
+            if self.cache.is_fresh(job[0], self.primary_output(item, job[1])):
+                item.skipped_count += 1
+            else:
+                yield job
+
+    def skip_completed(self, item, jobs):
+        """이어서 변환 - 중단된 이전 실행에서 이미 완료한 작업 제외"""
+        for job in jobs:
+            if self.journal.is_done(job[0], self.primary_output(item, job[1])):
+                item.resumed_count += 1
+            else:
+                yield job
+
+    def finish_item(self, item):
+        """변환이 끝난 항목 마무리 - 성공 여부 반환"""
+        if item.kind is None:
+            return False
+        if item.kind == 'folder':
+            # 폴더는 스캔이 끝나야 개수를 알 수 있음
+            archives = sum(item.found[kind] for kind in ARCHIVE_KINDS)
+            if not item.found['webp'] and not archives:
+                self.log("  ⚠️ 폴더 내에 WebP 파일을 찾을 수 없습니다")
+                return False
+            self.log(f"  📄 {item.found['webp']}개의 WebP 파일 발견"
+                     + (f", 아카이브 {archives}개" if archives else ""))
+            for message in skipped_messages(item.found['jpg'], item.found['png']):
+                self.log(message)
+        if item.skipped_count:
+            self.log(f"  ♻️ {item.skipped_count}개 변경 없음 - 건너뜀")
+        if item.resumed_count:
+            self.log(f"  ⏯️ {item.resumed_count}개 이전 실행에서 완료 - 건너뜀")
+        if (item.converted_count == 0 and (item.skipped_count or item.resumed_count)
+                and not item.failed_count):
+            # 모든 작업이 이전 실행 결과 그대로 - 성공으로 처리
+            return True
+        if item.converted_count == 0:
+            if item.kind in ARCHIVE_KINDS and item.output_path is not None:
+                # 변환된 이미지가 없는 아카이브는 결과를 남기지 않음
+                item.output_path.unlink(missing_ok=True)
+                if item.kind == 'tar' and not item.failed_count:
+                    self.log("  ⚠️ WebP 파일을 찾을 수 없습니다")
+            return False
+        if item.kind == 'folder':
+            self.log(f"  ✨ {Path(item.path).name}: {item.converted_count}개 성공, {item.failed_count}개 실패")
+            self.log(f"  📂 결과 저장됨: {item.output_path}")
+        elif item.kind in ARCHIVE_KINDS:
+            self.log(f"  ✨ {Path(item.path).name}: {item.converted_count}개 파일 변환 완료")
+            if item.zip_stats is not None:
+                self.log(f"  🗜️ {item.zip_stats.describe()}")
+            self.log(f"  📦 결과 저장됨: {item.output_path}")
+        else:
+            self.log(f"  💾 저장 완료: {item.output_path.name}")
+        return True
+
+    def plan_folder(self, folder_path, output_directory):
+        """폴더 내 WebP 파일들 변환 계획 (폴더 구조 유지)"""
+        item = ConversionItem(folder_path, 'folder')
+
+        # 출력 폴더에 원본 폴더 이름으로 새 폴더 생성
+        item.output_path = output_directory / Path(folder_path).name
+        item.note(f"  📂 출력 폴더: {item.output_path.name}")
+        item.jobs = self.scan_folder(item, Path(folder_path))
+        return item
+
+    def scan_folder(self, item, folder):
+        """폴더를 한 번만 순회하면서 WebP 변환 작업을 바로 반환 (하위 폴더 포함)
+
+        폴더 안의 ZIP / tar 는 같은 상대 경로에 같은 이름의 아카이브로 변환한다.
+        """
+        for path, kind in scan_tree(folder):
+            item.found[kind] += 1
+            if kind in ARCHIVE_KINDS:
+                relative_path = Path(path).relative_to(folder)
+                yield (Path(path), item.output_path / relative_path,
+                       f"{folder.name}/{relative_path}")
+                continue
+            if kind != 'webp':
+                continue
+            # 원본 폴더 기준 상대 경로 유지해서 출력 경로 생성
+            webp_file = Path(path)
+            relative_path = webp_file.relative_to(folder)
+            output_path = item.output_path / relative_path.with_suffix('.jpg')
+            label = f"{folder.name}/{relative_path} → {relative_path.with_suffix('.jpg')}"
+            yield (webp_file, output_path, label)
+
+    def plan_webp_file(self, input_webp_path, output_directory):
+        """단일 WebP 파일 변환 계획"""
+        input_path = Path(input_webp_path)
+        item = ConversionItem(input_webp_path, 'webp')
+        item.output_path = output_directory / input_path.with_suffix('.jpg').name
+        item.jobs.append((input_path, item.output_path, f"{input_path.name} → {item.output_path.name}"))
+        return item
+
+    def plan_zip_file(self, input_zip_path, output_directory):
+        """ZIP 파일 변환 계획 (압축 해제 없이 멤버 목록만 확인)"""
+        input_path = Path(input_zip_path)
+        item = ConversionItem(input_zip_path, 'zip')
+        item.output_path = output_directory / input_path.name
+
+        with zipfile.ZipFile(input_zip_path, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                if not info.is_dir():
+                    item.found[classify(info.filename)] += 1
+
+        # 안쪽 ZIP / tar 만 있는 ZIP 도 변환 (폴더와 같은 기준)
+        archives = sum(item.found[kind] for kind in ARCHIVE_KINDS)
+        if not item.found['webp'] and not archives:
+            item.note("  ⚠️ WebP 파일을 찾을 수 없습니다")
+            return item
+
+        item.note(f"  📁 {item.found['webp']}개의 WebP 파일 발견"
+                  + (f", 아카이브 {archives}개" if archives else ""))
+        for message in skipped_messages(item.found['jpg'], item.found['png']):
+            item.note(message)
+
+        # ZIP 하나가 작업 하나 - 멤버는 스트리밍으로 변환
+        item.jobs.append((input_path, item.output_path, input_path.name))
+        return item
+
+    def plan_tar_file(self, input_tar_path, output_directory):
+        """tar 파일 변환 계획 - 순서대로만 읽을 수 있어서 멤버는 변환하면서 확인"""
+        input_path = Path(input_tar_path)
+        item = ConversionItem(input_tar_path, 'tar')
+        item.output_path = output_directory / input_path.name
+        item.note("  📦 tar 아카이브 - 멤버를 순서대로 읽으면서 변환")
+        item.jobs.append((input_path, item.output_path, input_path.name))
+        return item
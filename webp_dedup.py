@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Deduplication
+내용이 같은 WebP 입력을 찾아서 한 번만 인코딩하고, 나머지 출력은 복제로 만든다
+
+1. 파일 크기로 묶고 (stat 만 사용)
+2. 크기가 같은 파일은 앞/뒤 일부만 읽는 빠른 해시로 다시 묶고
+3. 빠른 해시까지 같은 파일만 전체 내용 해시로 확인한다
+"""
+
+import hashlib
+import os
+import shutil
+from collections import defaultdict
+from pathlib import Path
+
+from webp_cache import file_digest
+
+# 빠른 해시에 사용하는 파일 앞/뒤 바이트 수
+QUICK_HASH_BYTES = 64 * 1024
+
+# Linux FICLONE ioctl (btrfs, XFS 등에서 reflink 복사)
+FICLONE = 0x40049409
+
+# 출력 복제 방식
+LINK_MODES = ('auto', 'reflink', 'hardlink', 'copy')
+
+
+def quick_digest(path, size):
+    """파일 앞/뒤 일부만 읽는 빠른 해시"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        digest.update(f.read(QUICK_HASH_BYTES))
+        if size > QUICK_HASH_BYTES * 2:
+            f.seek(-QUICK_HASH_BYTES, os.SEEK_END)
+            digest.update(f.read(QUICK_HASH_BYTES))
+    return digest.hexdigest()
+
+
+def group_duplicates(paths):
+    """내용이 같은 파일끼리 묶기 - 2개 이상인 그룹만 입력 순서대로 반환"""
+    by_size = defaultdict(list)
+    for path in paths:
+        try:
+            by_size[os.stat(path).st_size].append(path)
+        except OSError:
+            continue
+
+    groups = []
+    for size, same_size in by_size.items():
+        if len(same_size) < 2:
+            continue
+        by_quick = defaultdict(list)
+        for path in same_size:
+            by_quick[quick_digest(path, size)].append(path)
+        for candidates in by_quick.values():
+            if len(candidates) < 2:
+                continue
+            # 빠른 해시가 충돌한 경우에만 전체 해시
+            by_full = defaultdict(list)
+            for path in candidates:
+                by_full[file_digest(path)].append(path)
+            groups.extend(group for group in by_full.values() if len(group) > 1)
+    return groups
+
+
+def reflink_file(source, target):
+    """reflink(copy-on-write) 복사 - 지원하지 않는 파일시스템이면 OSError"""
+    import fcntl
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            Path(target).unlink(missing_ok=True)
+            raise
+
+
+def clone_file(source, target, mode='auto'):
+    """이미 변환된 출력을 다른 위치로 복제 - 실제 사용한 방식 반환
+
+    auto: reflink → copy, hardlink: hardlink → copy, reflink: reflink → copy
+    """
+    Path(target).parent.mkdir(parents=True, exist_ok=True)
+    Path(target).unlink(missing_ok=True)
+
+    if mode in ('auto', 'reflink'):
+        try:
+            reflink_file(source, target)
+            return 'reflink'
+        except (ImportError, OSError):
+            pass
+    elif mode == 'hardlink':
+        try:
+            os.link(source, target)
+            return 'hardlink'
+        except OSError:
+            pass
+
+    shutil.copyfile(source, target)
+    return 'copy'
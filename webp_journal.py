@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Checkpoint Journal
+중단된 실행을 이어서 변환하기 위한 완료 기록
+
+출력 폴더의 JSON lines 파일 첫 줄에 실행 키(입력 목록 + 변환 설정)를, 이후 줄에
+완료한 입력 경로를 하나씩 추가한다. 같은 실행을 다시 시작하면 기록된 입력은 건너뛰고,
+실행이 끝까지 완료되면 파일을 지운다. 쓰다 만 마지막 줄은 무시한다.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# 출력 폴더에 생성되는 체크포인트 파일 이름
+JOURNAL_NAME = ".webp2jpg-journal.jsonl"
+
+# 이 개수만큼 기록할 때마다 디스크에 동기화 (전원이 나가도 그 이전까지는 남음)
+JOURNAL_SYNC_INTERVAL = 100
+
+
+def run_key(sources, settings_key):
+    """실행 키 - 입력 목록(절대 경로)과 변환 설정이 같으면 같은 실행"""
+    data = json.dumps([[os.path.abspath(source) for source in sources], settings_key])
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class CheckpointJournal:
+    """완료한 입력 기록 (입력 경로 → 완료 여부)"""
+
+    def __init__(self, output_directory, key):
+        self.path = Path(output_directory) / JOURNAL_NAME
+        self.key = key
+        self.completed = self.load()
+        # 같은 실행의 기록이 남아 있었으면 이어서 변환
+        self.resumed = self.completed is not None
+        if not self.resumed:
+            self.completed = set()
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'run': key}) + "\n")
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.unsynced = 0
+
+    def load(self):
+        """이전 기록 읽기 - 없거나 다른 실행의 기록이면 None"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        completed = set()
+        for index, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue    # 중단되면서 쓰다 만 줄
+            if index == 0:
+                if record.get('run') != self.key:
+                    return None
+            elif 'done' in record:
+                completed.add(record['done'])
+        return completed if lines else None
+
+    def is_done(self, source, output):
+        """이전 실행에서 완료했고 출력도 남아 있는지"""
+        return os.path.abspath(source) in self.completed and os.path.exists(output)
+
+    def record(self, source):
+        """입력 하나 완료"""
+        key = os.path.abspath(source)
+        if key in self.completed:
+            return
+        self.completed.add(key)
+        self.file.write(json.dumps({'done': key}, ensure_ascii=False) + "\n")
+        self.unsynced += 1
+        if self.unsynced >= JOURNAL_SYNC_INTERVAL:
+            self.sync()
+
+    def sync(self):
+        """쌓인 기록을 디스크에 반영"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+
+    def close(self):
+        """중단 - 다음 실행에서 이어서 변환하도록 기록 유지"""
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+
+    def finish(self):
+        """실행 완료 - 기록 삭제"""
+        self.file.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Log Buffer
+변환 스레드의 로그를 UI 스레드로 모아서 넘기는 링 버퍼
+
+변환 스레드는 줄을 버퍼에 넣기만 하고 (UI 를 기다리지 않음), UI 스레드는 정해진
+주기마다 쌓인 줄을 한 번에 가져가서 그린다. 메모리에는 최근 N줄만 남기고,
+전체 로그가 필요하면 파일로 함께 기록한다.
+"""
+
+import threading
+from collections import deque
+
+# 메모리/화면에 유지하는 로그 줄 수
+DEFAULT_LOG_LINES = 5000
+
+# 로그 파일 이름 (출력 폴더에 생성)
+LOG_FILE_NAME = "webp2jpg.log"
+
+
+class LogBuffer:
+    """최근 로그 N줄 링 버퍼 - append 는 어느 스레드에서나, drain 은 UI 스레드에서"""
+
+    def __init__(self, max_lines=DEFAULT_LOG_LINES):
+        self.max_lines = max_lines
+        self.lines = deque(maxlen=max_lines)      # 최근 N줄
+        self.pending = deque(maxlen=max_lines)    # 아직 화면에 그리지 않은 줄
+        self.dropped = 0                          # 그리기 전에 밀려난 줄 수
+        self.spill = None                         # 전체 로그 파일
+        self.lock = threading.Lock()
+
+    def append(self, message):
+        """로그 한 줄 추가"""
+        with self.lock:
+            if len(self.pending) == self.max_lines:
+                self.dropped += 1
+            self.lines.append(message)
+            self.pending.append(message)
+            if self.spill is not None:
+                self.spill.write(message + "\n")
+
+    def drain(self):
+        """그릴 줄 가져오기 - (줄 목록, 그 앞에서 밀려난 줄 수)"""
+        with self.lock:
+            lines = list(self.pending)
+            self.pending.clear()
+            dropped, self.dropped = self.dropped, 0
+        return lines, dropped
+
+    def clear(self):
+        """메모리의 로그 비우기 (로그 파일은 그대로)"""
+        with self.lock:
+            self.lines.clear()
+            self.pending.clear()
+            self.dropped = 0
+
+    def open_spill(self, path):
+        """이후 로그를 파일에도 기록 (이어 쓰기)"""
+        self.close_spill()
+        spill = open(path, 'a', encoding='utf-8', buffering=1024 * 1024)
+        with self.lock:
+            self.spill = spill
+
+    def close_spill(self):
+        """로그 파일 닫기"""
+        with self.lock:
+            spill, self.spill = self.spill, None
+        if spill is not None:
+            spill.close()
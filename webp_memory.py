@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Memory Scheduler
+디코딩 메모리 예산 안에서만 작업을 프로세스 풀에 넣기
+
+WebP 헤더(앞 30바이트)만 읽어서 이미지 크기로 디코딩 메모리를 추정하고,
+실행 중인 작업의 추정치 합이 예산을 넘지 않을 때만 다음 작업을 시작한다.
+작은 이미지는 워커 수만큼 동시에, 예산보다 큰 이미지는 혼자 실행된다.
+"""
+
+import io
+import os
+import struct
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from PIL import Image
+
+# 메모리 정보를 알 수 없을 때의 예산
+DEFAULT_MEMORY_BUDGET = 2 * 1024 ** 3
+
+# 크기 판별에 필요한 WebP 헤더 길이
+WEBP_HEADER_SIZE = 30
+
+
+def default_memory_budget():
+    """기본 메모리 예산 - 현재 사용 가능한 물리 메모리의 절반"""
+    try:
+        available = os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):  # Windows 등
+        return DEFAULT_MEMORY_BUDGET
+    return max(available // 2, 256 * 1024 ** 2)
+
+
+def webp_dimensions(header):
+    """WebP 헤더에서 (너비, 높이, 알파 여부, 애니메이션 여부) 읽기 - WebP가 아니면 None"""
+    if len(header) < WEBP_HEADER_SIZE or header[:4] != b'RIFF' or header[8:12] != b'WEBP':
+        return None
+    chunk = header[12:16]
+    if chunk == b'VP8X':
+        # 확장 형식 - 플래그와 캔버스 크기 (24비트, 1을 뺀 값)
+        has_alpha = bool(header[20] & 0x10)
+        animated = bool(header[20] & 0x02)
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+        return width, height, has_alpha, animated
+    if chunk == b'VP8 ':
+        # 손실 압축 - 키 프레임 시작 코드 뒤 14비트 크기
+        if header[23:26] != b'\x9d\x01\x2a':
+            return None
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3fff, height & 0x3fff, False, False
+    if chunk == b'VP8L':
+        # 무손실 압축 - 서명 뒤 14비트 크기 2개 + 알파 비트
+        if header[20] != 0x2f:
+            return None
+        bits = int.from_bytes(header[21:25], 'little')
+        return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1, bool(bits >> 28 & 1), False
+    return None
+
+
+def estimate_image_memory(width, height, has_alpha, animated=False, options=None):
+    """이미지 하나를 변환할 때의 최대 메모리 추정 (바이트)
+
+    디코딩 버퍼 + RGB 합성/변환 사본 + JPEG 출력 버퍼,
+    목표 화질 모드면 시험 인코딩 결과를 디코딩한 사본이 하나 더 있다.
+    애니메이션의 모든 프레임을 저장할 때는 인코딩을 기다리는 프레임 사본도 포함한다.
+    """
+    pixels = width * height
+    estimate = pixels * (4 if has_alpha else 3) + pixels * 3 + pixels
+    if options is not None and options.target_ssim:
+        estimate += pixels * 3
+    if animated and options is not None and options.frames == 'all':
+        estimate += pixels * 4 * options.frame_threads * 2
+    return estimate
+
+
+def pillow_dimensions(img):
+    """Pillow 로 연 이미지의 (너비, 높이, 알파 여부, 애니메이션 여부) - 디코딩하지 않음"""
+    return img.size + ('A' in img.getbands(), getattr(img, 'n_frames', 1) > 1)
+
+
+def estimate_file_memory(path, options=None):
+    """WebP 파일 하나의 변환 메모리 추정 - 헤더를 읽을 수 없으면 0"""
+    try:
+        with open(path, 'rb') as f:
+            dimensions = webp_dimensions(f.read(WEBP_HEADER_SIZE))
+        if dimensions is None:
+            # 표준 헤더가 아니면 Pillow로 크기만 확인 (디코딩하지 않음)
+            with Image.open(path) as img:
+                dimensions = pillow_dimensions(img)
+    except Exception:
+        return 0
+    return estimate_image_memory(*dimensions, options=options)
+
+
+def estimate_data_memory(data, options=None):
+    """메모리에 읽어 둔 WebP 바이트의 변환 메모리 추정 (원본 바이트 포함)"""
+    dimensions = webp_dimensions(bytes(data[:WEBP_HEADER_SIZE]))
+    if dimensions is None:
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                dimensions = pillow_dimensions(img)
+        except Exception:
+            return len(data)
+    return estimate_image_memory(*dimensions, options=options) + len(data)
+
+
+def estimate_member_memory(zin, info, options=None):
+    """열린 ZIP 의 WebP 멤버 하나의 변환 메모리 추정 - 헤더를 읽을 수 없으면 원본 크기"""
+    with zin.open(info) as member:
+        dimensions = webp_dimensions(member.read(WEBP_HEADER_SIZE))
+    if dimensions is None:
+        return info.file_size
+    # ZIP 멤버는 압축된 원본 바이트도 메모리에 함께 올라감
+    return estimate_image_memory(*dimensions, options=options) + info.file_size
+
+
+def estimate_zip_memory(path, is_webp_member, options=None):
+    """ZIP 변환 메모리 추정 - 멤버는 하나씩 변환하므로 가장 큰 WebP 멤버 기준"""
+    largest = 0
+    try:
+        with zipfile.ZipFile(path) as zin:
+            for info in zin.infolist():
+                if is_webp_member(info):
+                    largest = max(largest, estimate_member_memory(zin, info, options))
+    except Exception:
+        return 0
+    return largest
+
+
+class ScheduledJob:
+    """예산을 기다리거나 실행 중인 작업 하나"""
+
+    def __init__(self, task, cost, function):
+        self.task = task
+        self.cost = cost
+        self.function = function
+        self.future = None      # 프로세스 풀에 넣으면 Future
+
+
+class MemoryScheduler:
+    """메모리 예산과 워커 수 안에서만 작업을 프로세스 풀에 넣는 스케줄러
+
+    작업은 들어온 순서대로 시작한다. 실행 중인 작업이 없으면 예산보다 큰 작업도
+    시작하므로 (혼자 실행) 멈추지 않는다.
+    """
+
+    def __init__(self, executor, function, budget, max_running, owns_executor=True):
+        self.executor = executor
+        # False 면 shutdown 에서 풀을 닫지 않음 (엔진이 여러 실행에 걸쳐 재사용)
+        self.owns_executor = owns_executor
+        self.function = function
+        self.budget = budget
+        self.max_running = max_running
+        self.waiting = deque()
+        self.running = set()
+        self.used = 0
+        self.peak = 0
+
+    def add(self, task, cost, function=None):
+        """작업 추가 - 예산이 있으면 바로 시작 (function 을 주면 기본 함수 대신 실행)"""
+        job = ScheduledJob(task, cost, function or self.function)
+        self.waiting.append(job)
+        self.admit()
+        return job
+
+    def admit(self):
+        """끝난 작업의 예산을 돌려받고 기다리는 작업 시작"""
+        for job in [job for job in self.running if job.future.done()]:
+            self.running.discard(job)
+            self.used -= job.cost
+
+        while self.waiting and len(self.running) < self.max_running:
+            job = self.waiting[0]
+            if self.running and self.used + job.cost > self.budget:
+                break
+            self.waiting.popleft()
+            job.future = self.executor.submit(job.function, job.task)
+            self.running.add(job)
+            self.used += job.cost
+            self.peak = max(self.peak, self.used)
+
+    def ready(self, job):
+        """작업 결과를 바로 받을 수 있는지"""
+        self.admit()
+        return job.future is not None and job.future.done()
+
+    def result(self, job):
+        """작업 결과 - 기다리는 동안 끝나는 작업 자리에 다음 작업을 채움"""
+        while not self.ready(job):
+            wait([running.future for running in self.running], return_when=FIRST_COMPLETED)
+        return job.future.result()
+
+    def cancel(self, job):
+        """작업 취소 - 기다리는 중이면 빼고, 실행 중이면 결과를 버림 (예산은 끝날 때 돌려받음)"""
+        if job.future is None:
+            try:
+                self.waiting.remove(job)
+            except ValueError:
+                pass
+        else:
+            job.future.cancel()
+
+    def shutdown(self):
+        """프로세스 풀 종료 (시작하지 않은 작업은 취소)"""
+        self.waiting.clear()
+        if self.owns_executor:
+            self.executor.shutdown(cancel_futures=True)
+            return
+        # 풀은 그대로 두고 이 스케줄러가 넣은 작업 중 시작 전인 것만 취소
+        for job in self.running:
+            job.future.cancel()
+        self.running.clear()
+        self.used = 0
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Metrics
+변환 단계별 시간/카운터 수집과 내보내기 (JSON lines, Prometheus 텍스트 파일)
+
+단계: scan(스캔), read(읽기), decode(디코딩), resize(축소), flatten(알파 합성),
+encode(JPEG 인코딩), write(파일 기록), zip(ZIP / tar 멤버 기록)
+워커 프로세스에서 모은 값은 결과와 함께 돌아와서 엔진에서 합친다.
+"""
+
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# 단계별 시간 히스토그램 구간 (초, 누적 아님 - 내보낼 때 누적으로 변환)
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 로그/내보내기 순서
+STAGES = ('scan', 'read', 'decode', 'resize', 'flatten', 'encode', 'write', 'zip')
+
+# 로그에 표시할 단계 이름
+STAGE_NAMES = {
+    'scan': "스캔", 'read': "읽기", 'decode': "디코딩", 'resize': "축소",
+    'flatten': "합성", 'encode': "인코딩", 'write': "쓰기", 'zip': "아카이브 기록",
+}
+
+# Prometheus 메트릭 이름 앞부분
+METRIC_PREFIX = "webp2jpg"
+
+
+class StageMetrics:
+    """단계별 시간 히스토그램과 카운터 (프로세스 사이로 그대로 전달됨)"""
+
+    def __init__(self):
+        # 단계 → [횟수, 합계(초), 구간별 횟수 (마지막은 +Inf)]
+        self.stages = {}
+        # bytes_in, bytes_out, pixels 등
+        self.counters = {}
+
+    def observe(self, stage, seconds):
+        """단계 실행 한 번 기록"""
+        entry = self.stages.get(stage)
+        if entry is None:
+            entry = self.stages[stage] = [0, 0.0, [0] * (len(HISTOGRAM_BUCKETS) + 1)]
+        entry[0] += 1
+        entry[1] += seconds
+        for index, bound in enumerate(HISTOGRAM_BUCKETS):
+            if seconds <= bound:
+                entry[2][index] += 1
+                break
+        else:
+            entry[2][-1] += 1
+
+    @contextmanager
+    def time(self, stage):
+        """with 블록 실행 시간을 단계 시간으로 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def count(self, name, value=1):
+        """카운터 증가"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other):
+        """다른 수집 결과 합치기"""
+        for stage, (count, seconds, buckets) in other.stages.items():
+            entry = self.stages.get(stage)
+            if entry is None:
+                self.stages[stage] = [count, seconds, list(buckets)]
+                continue
+            entry[0] += count
+            entry[1] += seconds
+            entry[2] = [a + b for a, b in zip(entry[2], buckets)]
+        for name, value in other.counters.items():
+            self.count(name, value)
+
+    def ordered_stages(self):
+        """(단계, 횟수, 합계, 구간별 횟수) - STAGES 순서, 그 밖의 단계는 뒤에"""
+        names = [stage for stage in STAGES if stage in self.stages]
+        names += sorted(stage for stage in self.stages if stage not in STAGES)
+        return [(stage,) + tuple(self.stages[stage]) for stage in names]
+
+    def describe(self):
+        """로그용 한 줄 요약 - 단계별 합계 시간"""
+        return ", ".join(f"{STAGE_NAMES.get(stage, stage)} {seconds:.2f}초"
+                         for stage, count, seconds, buckets in self.ordered_stages())
+
+
+def bucket_label(index):
+    """히스토그램 구간 상한 표시"""
+    return "+Inf" if index == len(HISTOGRAM_BUCKETS) else repr(HISTOGRAM_BUCKETS[index])
+
+
+def metrics_records(metrics, run):
+    """JSON lines 로 기록할 레코드 목록 - 실행 정보 1줄 + 단계별 + 카운터별"""
+    timestamp = run.get('timestamp', time.time())
+    records = [dict({'type': 'run'}, **dict(run, timestamp=timestamp))]
+    for stage, count, seconds, buckets in metrics.ordered_stages():
+        records.append({
+            'type': 'stage', 'timestamp': timestamp, 'stage': stage, 'count': count,
+            'seconds': round(seconds, 6),
+            'buckets': {bucket_label(index): value for index, value in enumerate(buckets)},
+        })
+    for name in sorted(metrics.counters):
+        records.append({'type': 'counter', 'timestamp': timestamp, 'name': name,
+                        'value': metrics.counters[name]})
+    return records
+
+
+def prometheus_text(metrics, run):
+    """Prometheus 텍스트 형식 (node_exporter textfile collector 용)"""
+    name = f"{METRIC_PREFIX}_stage_seconds"
+    lines = [f"# HELP {name} Time spent per conversion stage.",
+             f"# TYPE {name} histogram"]
+    for stage, count, seconds, buckets in metrics.ordered_stages():
+        cumulative = 0
+        for index, value in enumerate(buckets):
+            cumulative += value
+            lines.append(f'{name}_bucket{{stage="{stage}",le="{bucket_label(index)}"}} {cumulative}')
+        lines.append(f'{name}_sum{{stage="{stage}"}} {seconds:.6f}')
+        lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+
+    for counter in sorted(metrics.counters):
+        counter_name = f"{METRIC_PREFIX}_{counter}_total"
+        lines.append(f"# TYPE {counter_name} counter")
+        lines.append(f"{counter_name} {metrics.counters[counter]}")
+
+    # 실행 정보 중 숫자 값은 gauge 로
+    for key in sorted(run):
+        value = run[key]
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            gauge = f"{METRIC_PREFIX}_run_{key}"
+            lines.append(f"# TYPE {gauge} gauge")
+            lines.append(f"{gauge} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path, metrics, run, metrics_format=None):
+    """수집 결과 내보내기 - jsonl 은 파일 끝에 추가, prometheus 는 임시 파일에 쓰고 교체
+
+    metrics_format 이 없으면 확장자로 판단 (.prom → prometheus, 그 밖에는 jsonl)
+    """
+    if metrics_format is None:
+        metrics_format = 'prometheus' if str(path).endswith('.prom') else 'jsonl'
+
+    if metrics_format == 'prometheus':
+        # textfile collector 가 쓰다 만 파일을 읽지 않도록 교체
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(prometheus_text(metrics, run))
+        os.replace(temporary, path)
+        return
+
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in metrics_records(metrics, run):
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+@contextmanager
+def profiled(emit, cprofile_path=None, tracemalloc_top=0):
+    """실행 구간을 cProfile / tracemalloc 으로 감싸기 (현재 프로세스만 측정)
+
+    cprofile_path 에 pstats 파일을 저장하고, tracemalloc_top 개의 최대 할당 위치를 로그로 출력
+    """
+    # 측정 모듈은 켠 경우에만 불러옴 (시작 시간)
+    profiler = None
+    if cprofile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+    if tracemalloc_top:
+        import tracemalloc
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(cprofile_path)
+            import pstats
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(10)
+            emit("log", f"\n🔬 cProfile 저장: {cprofile_path}\n{summary.getvalue().rstrip()}")
+        if tracemalloc_top:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            emit("log", f"\n🔬 tracemalloc: 현재 {current / (1024 * 1024):.1f} MB, "
+                        f"최대 {peak / (1024 * 1024):.1f} MB")
+            for stat in snapshot.statistics('lineno')[:tracemalloc_top]:
+                emit("log", f"  {stat}")
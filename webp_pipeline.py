@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Conversion Pipeline
+읽기 → 변환 → 쓰기 단계를 겹쳐서 실행하는 파이프라인
+
+읽기 스레드가 다음 입력을 미리 메모리로 읽어 두고, 변환 단계(프로세스 풀)는
+메모리의 바이트만 변환하고, 쓰기 스레드가 결과를 디스크에 기록한다.
+단계 사이의 대기열은 깊이가 정해져 있어서 느린 단계가 있으면 앞 단계가 멈춘다.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from webp_memory import estimate_data_memory
+from webp_metrics import StageMetrics
+
+# 기본 읽기/쓰기 스레드 수
+DEFAULT_READERS = 2
+DEFAULT_WRITERS = 2
+
+
+def read_input(path):
+    """입력 파일 전체를 메모리로 읽기 (읽기 스레드)"""
+    return Path(path).read_bytes()
+
+
+def temporary_path(path):
+    """출력과 같은 폴더의 임시 파일 경로 - 다 쓴 뒤 os.replace 로 출력 이름으로 바꿈"""
+    path = Path(path)
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def write_atomic(path, data):
+    """임시 파일에 쓰고 이름 바꾸기 - 중간에 멈춰도 쓰다 만 출력이 남지 않음"""
+    temporary = temporary_path(path)
+    try:
+        with open(temporary, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+
+
+def write_outputs(outputs):
+    """[(출력 경로, 바이트)] 기록 (쓰기 스레드)"""
+    for path, data in outputs:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, data)
+
+
+def timed(function, *args):
+    """(결과, 걸린 시간) - 스레드에서 잰 시간은 메인 스레드에서 한꺼번에 기록"""
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+class PipelineJob:
+    """파이프라인을 지나는 작업 하나"""
+
+    def __init__(self, task):
+        self.task = task            # (종류, 입력, 출력, 설정)
+        self.read = None            # 읽기 Future
+        self.encode = None          # 변환 단계 ScheduledJob
+        self.write = None           # 쓰기 Future
+        self.encoded = None         # 쓰기를 기다리는 변환 결과
+        self.result = None
+
+
+class ConversionPipeline:
+    """읽기 스레드 → 변환(스케줄러) → 쓰기 스레드
+
+    encode_function((바이트, 작업))은 (결과, [(출력 경로, 바이트)])를 반환하고,
+    failure(예외)는 읽기/쓰기에 실패했을 때의 결과를 만든다.
+    읽기/쓰기 시간은 metrics 의 read/write 단계로 기록한다.
+    아카이브(ZIP / tar) 작업은 워커 안에서 스트리밍 변환하므로 읽기/쓰기 단계 없이 바로
+    변환 단계로 간다.
+    """
+
+    STAGES = ('read', 'encode', 'write')
+
+    def __init__(self, scheduler, encode_function, failure, readers=DEFAULT_READERS,
+                 writers=DEFAULT_WRITERS, read_ahead=8, write_behind=8, metrics=None):
+        self.scheduler = scheduler
+        self.metrics = metrics if metrics is not None else StageMetrics()
+        self.encode_function = encode_function
+        self.failure = failure
+        self.read_ahead = max(1, read_ahead)
+        self.write_behind = max(1, write_behind)
+        self.reader = ThreadPoolExecutor(max_workers=max(1, readers),
+                                         thread_name_prefix="webp-reader")
+        self.writer = ThreadPoolExecutor(max_workers=max(1, writers),
+                                         thread_name_prefix="webp-writer")
+        self.queued = deque()       # 아직 읽지 않은 작업
+        self.reading = deque()      # 읽는 중이거나 읽고 변환을 기다리는 작업 (read_ahead 개까지)
+        self.encoding = []          # 변환 단계 (예산 대기 + 실행 중)
+        self.writing = []           # 쓰기 대기/실행 중 (write_behind 개가 차면 변환 투입 중지)
+
+        # 단계별 점유 - 시간 가중 합과 최대값
+        self.occupancy = {stage: [0.0, 0] for stage in self.STAGES}
+        self.started = self.sampled = time.perf_counter()
+
+    def add(self, task, cost=None):
+        """작업 추가 - 아카이브면 cost(예상 메모리)로 바로 변환 단계에 넣음"""
+        job = PipelineJob(task)
+        if task[0] != 'image':
+            job.encode = self.scheduler.add(task, cost or 0)
+            self.encoding.append(job)
+        else:
+            self.queued.append(job)
+        self.pump()
+        return job
+
+    def pump(self):
+        """끝난 단계의 작업을 다음 단계로 넘기기 (뒤 단계부터 비움)"""
+        self.sample()
+
+        # 쓰기 완료
+        for job in [job for job in self.writing if job.write.done()]:
+            self.writing.remove(job)
+            try:
+                self.metrics.observe('write', job.write.result()[1])
+                job.result = job.encoded
+            except Exception as e:
+                job.result = self.failure(e)
+            job.encoded = None
+
+        # 변환 완료 → 쓰기
+        self.scheduler.admit()
+        for job in [job for job in self.encoding
+                    if job.encode.future is not None and job.encode.future.done()]:
+            self.encoding.remove(job)
+            try:
+                result = job.encode.future.result()
+            except Exception as e:
+                job.result = self.failure(e)
+                continue
+            if job.task[0] != 'image':
+                job.result = result
+                continue
+            result, outputs = result
+            if not outputs:
+                job.result = result
+                continue
+            job.encoded = result
+            job.write = self.writer.submit(timed, write_outputs, outputs)
+            self.writing.append(job)
+
+        # 미리 읽기
+        while self.queued and len(self.reading) < self.read_ahead:
+            job = self.queued.popleft()
+            job.read = self.reader.submit(timed, read_input, job.task[1])
+            self.reading.append(job)
+
+        # 읽은 작업 → 변환 (쓰기가 밀려 있으면 멈춤)
+        while (self.reading and self.reading[0].read.done()
+               and len(self.writing) < self.write_behind):
+            job = self.reading.popleft()
+            try:
+                data, seconds = job.read.result()
+            except Exception as e:
+                job.result = self.failure(e)
+                continue
+            self.metrics.observe('read', seconds)
+            cost = estimate_data_memory(data, job.task[3])
+            job.encode = self.scheduler.add((data, job.task), cost, self.encode_function)
+            self.encoding.append(job)
+
+    def ready(self, job):
+        """작업이 모든 단계를 지났는지"""
+        self.pump()
+        return job.result is not None
+
+    def result(self, job):
+        """작업 결과 - 기다리는 동안 다른 작업도 계속 다음 단계로 넘김"""
+        while not self.ready(job):
+            futures = [reading.read for reading in self.reading]
+            futures += [running.future for running in self.scheduler.running]
+            futures += [writing.write for writing in self.writing]
+            wait([future for future in futures if not future.done()],
+                 return_when=FIRST_COMPLETED)
+        return job.result
+
+    def sample(self):
+        """현재 단계별 작업 수를 점유 통계에 반영"""
+        now = time.perf_counter()
+        elapsed = now - self.sampled
+        self.sampled = now
+        counts = {'read': len(self.reading), 'encode': len(self.scheduler.running),
+                  'write': len(self.writing)}
+        for stage, count in counts.items():
+            self.occupancy[stage][0] += count * elapsed
+            self.occupancy[stage][1] = max(self.occupancy[stage][1], count)
+
+    def report(self):
+        """단계별 (평균 점유, 최대 점유, 용량)"""
+        self.sample()
+        elapsed = (self.sampled - self.started) or 1.0
+        capacity = {'read': self.read_ahead, 'encode': self.scheduler.max_running,
+                    'write': self.write_behind}
+        return {stage: (self.occupancy[stage][0] / elapsed, self.occupancy[stage][1],
+                        capacity[stage])
+                for stage in self.STAGES}
+
+    def shutdown(self):
+        """스레드와 변환 워커 종료 - 이미 시작한 쓰기는 끝까지 기록"""
+        self.queued.clear()
+        self.reader.shutdown(cancel_futures=True)
+        self.scheduler.shutdown()
+        self.writer.shutdown(wait=True)
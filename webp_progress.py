@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Progress Tracker
+이미지 수와 바이트 기준 진행률, 처리량(images/s, MB/s), 남은 시간 계산
+
+스캔하면서 발견한 작업을 전체에 더하고, 결과가 나올 때마다 완료에 더한다.
+처리량은 지수 이동 평균이라 잠깐 느려지거나 빨라져도 남은 시간이 크게 흔들리지 않는다.
+"""
+
+import time
+
+# progress/rate 메시지 최소 간격 (초)
+PROGRESS_INTERVAL = 0.25
+
+# 처리량 이동 평균 가중치 (새 구간의 비중)
+RATE_SMOOTHING = 0.2
+
+
+def format_duration(seconds):
+    """남은 시간 표시 (mm:ss, 한 시간 이상이면 h:mm:ss)"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def describe_rate(rate):
+    """rate 메시지 한 줄 요약 (상태바 / 콘솔용)"""
+    total = f"{rate['images_total']}{'+' if rate['scanning'] else ''}"
+    text = (f"이미지 {rate['images_done']}/{total} · "
+            f"{rate['images_per_second']:.1f} img/s · {rate['mb_per_second']:.1f} MB/s")
+    if rate['eta'] is not None:
+        text += f" · 남은 시간 {format_duration(rate['eta'])}"
+    return text
+
+
+class ProgressTracker:
+    """발견/완료한 이미지 수와 입력 바이트로 진행률과 처리량 계산
+
+    emit("progress", 퍼센트)와 emit("rate", 딕셔너리)를 PROGRESS_INTERVAL 마다 보낸다.
+    진행률은 입력 바이트 기준이고 (큰 이미지가 오래 걸림), 바이트를 모르면 이미지 수 기준이다.
+    """
+
+    def __init__(self, emit, interval=PROGRESS_INTERVAL):
+        self.emit = emit
+        self.interval = interval
+        self.images_total = 0
+        self.bytes_total = 0
+        self.images_done = 0
+        self.bytes_done = 0
+        self.scanning = True            # 아직 전체 작업 수를 모름
+        self.started = self.reported = self.sampled = time.perf_counter()
+        self.sampled_images = 0
+        self.sampled_bytes = 0
+        self.image_rate = None          # 이동 평균 (images/s)
+        self.byte_rate = None           # 이동 평균 (bytes/s)
+
+    def discover(self, images, size):
+        """스캔에서 작업 하나 발견"""
+        self.images_total += images
+        self.bytes_total += size
+
+    def finish_scan(self):
+        """스캔 완료 - 이제 전체 작업 수가 확정됨"""
+        self.scanning = False
+        self.report(force=True)
+
+    def complete(self, images, size):
+        """작업 하나 완료 (성공/실패 모두)"""
+        self.images_done += images
+        self.bytes_done += size
+        self.report()
+
+    def percent(self):
+        """진행률 (%) - 스캔 중에는 지금까지 발견한 작업 기준"""
+        if self.bytes_total:
+            return self.bytes_done * 100 / self.bytes_total
+        if self.images_total:
+            return self.images_done * 100 / self.images_total
+        return 0.0
+
+    def sample(self, now):
+        """직전 표본 이후 처리량을 이동 평균에 반영"""
+        elapsed = now - self.sampled
+        if elapsed <= 0 or (self.image_rate is None and self.images_done == self.sampled_images):
+            # 첫 작업이 끝나기 전의 0 을 평균의 시작값으로 쓰지 않음
+            return
+        image_rate = (self.images_done - self.sampled_images) / elapsed
+        byte_rate = (self.bytes_done - self.sampled_bytes) / elapsed
+        if self.image_rate is None:
+            self.image_rate, self.byte_rate = image_rate, byte_rate
+        else:
+            self.image_rate += RATE_SMOOTHING * (image_rate - self.image_rate)
+            self.byte_rate += RATE_SMOOTHING * (byte_rate - self.byte_rate)
+        self.sampled = now
+        self.sampled_images = self.images_done
+        self.sampled_bytes = self.bytes_done
+
+    def snapshot(self):
+        """현재 진행 상태 딕셔너리 (rate 메시지 내용)"""
+        eta = None
+        if self.byte_rate and self.bytes_total:
+            eta = (self.bytes_total - self.bytes_done) / self.byte_rate
+        elif self.image_rate and self.images_total:
+            eta = (self.images_total - self.images_done) / self.image_rate
+        return {
+            'images_done': self.images_done, 'images_total': self.images_total,
+            'bytes_done': self.bytes_done, 'bytes_total': self.bytes_total,
+            'scanning': self.scanning,
+            'images_per_second': self.image_rate or 0.0,
+            'mb_per_second': (self.byte_rate or 0.0) / (1024 * 1024),
+            'eta': eta, 'elapsed': time.perf_counter() - self.started,
+        }
+
+    def report(self, force=False):
+        """간격이 지났으면 진행률과 처리량 전달"""
+        now = time.perf_counter()
+        if not force and now - self.reported < self.interval:
+            return
+        self.sample(now)
+        self.reported = now
+        self.emit("progress", self.percent())
+        self.emit("rate", self.snapshot())
+
+    def average(self):
+        """전체 평균 (images/s, MB/s)"""
+        elapsed = (time.perf_counter() - self.started) or 1.0
+        return self.images_done / elapsed, self.bytes_done / elapsed / (1024 * 1024)
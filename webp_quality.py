@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Quality Search
+목표 화질(SSIM)을 만족하는 가장 낮은 JPEG 품질을 이진 탐색으로 찾기
+
+단순한 이미지는 고정 품질(95)보다 훨씬 낮은 품질로도 원본과 구분이 안 되고,
+복잡한 이미지는 높은 품질이 필요하다. 후보 품질로 인코딩 → 디코딩한 결과를
+축소한 흑백 사본에서 원본과 SSIM으로 비교한다 (NumPy 필요).
+찾은 품질은 입력 내용 해시별로 출력 폴더에 저장해서 다음 실행에서는 한 번만 인코딩한다.
+"""
+
+import io
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+
+from PIL import Image
+
+from webp_cache import COMMIT_INTERVAL
+
+# NumPy - 목표 화질 모드에서만 필요해서 처음 쓸 때 불러옴 (load_numpy)
+np = None
+
+# 출력 폴더에 생성되는 품질 캐시 파일 이름
+QUALITY_CACHE_NAME = ".webp2jpg-quality.sqlite"
+
+# 탐색 범위 하한 (상한은 프로필 품질)
+MIN_QUALITY = 40
+
+# 이미지 하나당 최대 인코딩 횟수 (프로필 품질 확인 1회 포함)
+DEFAULT_MAX_TRIALS = 7
+
+# SSIM 비교용 사본의 최대 크기(px)와 비교 블록 크기
+METRIC_SIZE = 512
+SSIM_BLOCK = 8
+
+# 프로세스가 기억하는 품질 수 상한 - 서버처럼 오래 도는 프로세스에서도 일정 크기 이상 늘지 않음
+MAX_KNOWN_QUALITIES = 8192
+
+# 워커 프로세스가 이미 알고 있는 품질 - {키: (품질, 고정 품질 출력 크기)}, 오래 안 쓴 것부터 버림
+KNOWN_QUALITIES = OrderedDict()
+
+
+def load_numpy():
+    """NumPy 불러오기 (처음 한 번) - 설치되어 있지 않으면 None"""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+
+def load_known_qualities(entries):
+    """이전 실행에서 찾은 품질 등록 (프로세스 풀 initializer) - 상한을 넘는 만큼은 앞쪽부터 버림"""
+    KNOWN_QUALITIES.clear()
+    for key, value in entries.items():
+        remember_quality(key, value)
+
+
+def remember_quality(key, value):
+    """찾은 품질 기억 - 상한을 넘으면 가장 오래 안 쓴 품질부터 버림"""
+    KNOWN_QUALITIES[key] = value
+    KNOWN_QUALITIES.move_to_end(key)
+    while len(KNOWN_QUALITIES) > MAX_KNOWN_QUALITIES:
+        KNOWN_QUALITIES.popitem(last=False)
+
+
+def metric_array(img):
+    """SSIM 비교용 흑백 축소 사본 (float 배열, 블록 크기의 배수로 자름)"""
+    gray = img.convert('L')
+    scale = METRIC_SIZE / max(gray.size)
+    if scale < 1:
+        gray = gray.resize((max(SSIM_BLOCK, round(gray.width * scale)),
+                            max(SSIM_BLOCK, round(gray.height * scale))), Image.BOX)
+    array = np.asarray(gray, dtype=np.float64)
+    height = array.shape[0] // SSIM_BLOCK * SSIM_BLOCK
+    width = array.shape[1] // SSIM_BLOCK * SSIM_BLOCK
+    return array[:height, :width]
+
+
+def ssim(reference, candidate):
+    """블록 단위 평균 SSIM (1.0 이면 동일)"""
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    height, width = reference.shape
+    if not height or not width:
+        return 1.0
+
+    # (블록 행, 블록 열, 블록 내부 픽셀) 형태로 바꿔서 블록별 통계를 한 번에 계산
+    def blocks(array):
+        return array.reshape(height // SSIM_BLOCK, SSIM_BLOCK,
+                             width // SSIM_BLOCK, SSIM_BLOCK).swapaxes(1, 2).reshape(
+                                 height // SSIM_BLOCK, width // SSIM_BLOCK, -1)
+
+    x = blocks(reference)
+    y = blocks(candidate)
+    mean_x = x.mean(axis=2)
+    mean_y = y.mean(axis=2)
+    var_x = x.var(axis=2)
+    var_y = y.var(axis=2)
+    covariance = ((x - mean_x[..., None]) * (y - mean_y[..., None])).mean(axis=2)
+    numerator = (2 * mean_x * mean_y + c1) * (2 * covariance + c2)
+    denominator = (mean_x ** 2 + mean_y ** 2 + c1) * (var_x + var_y + c2)
+    return float((numerator / denominator).mean())
+
+
+class QualitySearch:
+    """품질 탐색 결과"""
+
+    def __init__(self, quality, data, baseline_bytes, trials, cached=False):
+        self.quality = quality
+        self.data = data                        # 선택한 품질의 JPG 바이트
+        self.baseline_bytes = baseline_bytes    # 프로필 고정 품질일 때의 출력 크기
+        self.trials = trials
+        self.cached = cached
+
+
+def encode(img, save_kwargs, quality):
+    """지정한 품질로 메모리에 JPEG 인코딩"""
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', **dict(save_kwargs, quality=quality))
+    return buffer.getvalue()
+
+
+def search_quality(img, save_kwargs, target, max_trials=DEFAULT_MAX_TRIALS, key=None):
+    """target SSIM 이상인 가장 낮은 품질 찾기 - QualitySearch 반환
+
+    프로필 품질로 먼저 인코딩해서 기준 크기를 구하고, 그 품질로도 목표에 못 미치면
+    그대로 사용한다. 이후 [MIN_QUALITY, 프로필 품질) 범위를 이진 탐색한다.
+    key 가 KNOWN_QUALITIES 에 있으면 탐색 없이 한 번만 인코딩한다.
+    """
+    if key is not None and key in KNOWN_QUALITIES:
+        KNOWN_QUALITIES.move_to_end(key)
+        quality, baseline_bytes = KNOWN_QUALITIES[key]
+        return QualitySearch(quality, encode(img, save_kwargs, quality), baseline_bytes,
+                             trials=1, cached=True)
+    if load_numpy() is None:
+        raise RuntimeError("목표 화질 모드에는 NumPy가 필요합니다 (pip install numpy)")
+
+    reference = metric_array(img)
+
+    def trial(quality):
+        data = encode(img, save_kwargs, quality)
+        with Image.open(io.BytesIO(data)) as decoded:
+            return data, ssim(reference, metric_array(decoded))
+
+    high = save_kwargs['quality']
+    best_data, score = trial(high)
+    best_quality = high
+    baseline_bytes = len(best_data)
+    trials = 1
+
+    if score >= target:
+        low, high = MIN_QUALITY, high - 1
+        while low <= high and trials < max_trials:
+            middle = (low + high) // 2
+            data, score = trial(middle)
+            trials += 1
+            if score >= target:
+                best_quality, best_data = middle, data
+                high = middle - 1
+            else:
+                low = middle + 1
+
+    if key is not None:
+        remember_quality(key, (best_quality, baseline_bytes))
+    return QualitySearch(best_quality, best_data, baseline_bytes, trials)
+
+
+class QualityCache:
+    """입력 내용 해시별로 찾은 품질 (출력 폴더의 SQLite 파일)"""
+
+    def __init__(self, output_directory, settings_key):
+        self.path = Path(output_directory) / QUALITY_CACHE_NAME
+        self.settings_key = settings_key
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS qualities ("
+            " key TEXT NOT NULL,"
+            " settings TEXT NOT NULL,"
+            " quality INTEGER NOT NULL,"
+            " baseline_bytes INTEGER NOT NULL,"
+            " PRIMARY KEY (key, settings))")
+        self.entries = {
+            row[0]: (row[1], row[2])
+            for row in self.connection.execute(
+                "SELECT key, quality, baseline_bytes FROM qualities WHERE settings = ?",
+                (settings_key,))
+        }
+        self.pending = []
+
+    def record(self, entries):
+        """새로 찾은 품질 기록"""
+        for key, value in entries.items():
+            if self.entries.get(key) != value:
+                self.entries[key] = value
+                self.pending.append((key, self.settings_key) + tuple(value))
+        if len(self.pending) >= COMMIT_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """쌓인 기록을 디스크에 반영"""
+        if self.pending:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO qualities (key, settings, quality, baseline_bytes)"
+                " VALUES (?, ?, ?, ?)", self.pending)
+            self.connection.commit()
+            self.pending = []
+
+    def close(self):
+        """저장 후 닫기"""
+        self.flush()
+        self.connection.close()
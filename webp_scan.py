@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Folder Scanner
+os.scandir 기반 폴더 순회 - 폴더 전체를 한 번만 돌면서 확장자별로 분류
+
+확장자는 대소문자를 구분하지 않으며 (.WEBP 포함), 발견하는 즉시 반환하는
+제너레이터라서 스캔이 끝나기 전에 변환을 시작할 수 있다.
+"""
+
+import os
+
+# 확장자 → 종류
+EXTENSION_KINDS = {
+    '.webp': 'webp',
+    '.jpg': 'jpg',
+    '.jpeg': 'jpg',
+    '.png': 'png',
+    '.zip': 'zip',
+}
+
+# tar 아카이브 확장자 (압축 방식 포함 - splitext 로는 .gz 만 보이므로 따로 확인)
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+
+def classify(name):
+    """파일 이름으로 종류 판별 ('webp', 'jpg', 'png', 'zip', 'tar', 'other')"""
+    if name.lower().endswith(TAR_SUFFIXES):
+        return 'tar'
+    return EXTENSION_KINDS.get(os.path.splitext(name)[1].lower(), 'other')
+
+
+def scan_tree(root):
+    """폴더를 한 번 순회하면서 (파일 경로, 종류)를 발견 순서대로 반환
+
+    폴더마다 이름순으로 정렬해서 실행할 때마다 순서가 같다.
+    심볼릭 링크 폴더도 따라가지만 같은 폴더를 두 번 방문하지는 않는다.
+    """
+    stack = [os.fspath(root)]
+    visited = set()
+    while stack:
+        directory = stack.pop()
+        try:
+            stat = os.stat(directory)
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        # 심볼릭 링크 순환 방지
+        key = (stat.st_dev, stat.st_ino)
+        if key in visited:
+            continue
+        visited.add(key)
+
+        subdirectories = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                subdirectories.append(entry.path)
+            else:
+                yield entry.path, classify(entry.name)
+
+        # 이름순으로 방문하도록 역순으로 쌓기
+        stack.extend(reversed(subdirectories))
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG HTTP Server
+로컬 HTTP 변환 서비스 (webp2jpg.py serve) - 표준 라이브러리만 사용
+
+    POST /convert   WebP 본문 → JPG (쿼리: profile, quality, size)
+    POST /batch     ZIP / tar 본문 → 같은 형식의 아카이브 (쿼리: name 으로 형식 지정 가능)
+    GET  /metrics   단계별 시간 / 요청 카운터 (Prometheus 텍스트 형식)
+    GET  /health    상태 확인
+
+요청 스레드는 본문을 받고 응답을 보내기만 하고, 변환은 모든 요청이 함께 쓰는 워커 풀에서
+실행한다. 처리 중인 요청과 워커를 기다리는 요청 수의 합이 상한에 닿으면 변환하지 않고
+바로 503 으로 거절한다 (본문은 읽어서 버림). 아카이브는 메모리에 모으지 않고 임시 파일로 나눠 받아서 변환한 뒤
+나눠서 보낸다 (ZIP 은 중앙 디렉토리가 끝에 있어서 다 받아야 변환을 시작할 수 있음).
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import BrokenExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from webp_archive import TAR_COMPRESSION, archive_kind
+from webp_converter import (PROFILES, ConversionOptions, EncodeStats, convert_bytes,
+                            convert_job, init_worker, print_emit)
+from webp_metrics import StageMetrics, prometheus_text
+from webp_scan import TAR_SUFFIXES
+from webp_settings import DEFAULT_HOST, DEFAULT_MAX_BODY, DEFAULT_PORT, DEFAULT_QUEUE_PER_JOB
+
+# 아카이브 본문 / 응답을 나눠서 읽고 쓰는 크기
+BODY_CHUNK = 1024 * 1024
+
+# 503 응답의 Retry-After (초)
+RETRY_AFTER = 1
+
+# 연결 하나가 본문 없이 기다리는 시간 (초)
+REQUEST_TIMEOUT = 60
+
+# Content-Type → 아카이브 확장자 (?name= 이 없을 때)
+ARCHIVE_TYPES = {
+    'application/zip': '.zip',
+    'application/x-zip-compressed': '.zip',
+    'application/x-tar': '.tar',
+    'application/gzip': '.tar.gz',
+    'application/x-gzip': '.tar.gz',
+    'application/x-bzip2': '.tar.bz2',
+    'application/x-xz': '.tar.xz',
+}
+
+# tar 압축 방식 → 응답 Content-Type
+TAR_TYPES = {'gz': 'application/gzip', 'bz2': 'application/x-bzip2', 'xz': 'application/x-xz',
+             None: 'application/x-tar'}
+
+
+class RequestError(Exception):
+    """HTTP 오류 응답으로 돌려줄 요청 오류"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def convert_request(data, options):
+    """POST /convert 변환 (워커에서 호출) - (JPG 바이트, 오류 메시지, 인코딩 통계)"""
+    encode_stats = EncodeStats()
+    try:
+        return convert_bytes(data, options=options, stats=encode_stats), None, encode_stats
+    except Exception as e:
+        return None, str(e), encode_stats
+
+
+def request_options(base, query):
+    """서버 변환 설정에 요청 쿼리(profile, quality, size) 반영 - 잘못된 값은 400"""
+    settings = dict(vars(base))
+    if 'profile' in query:
+        profile = query['profile'][-1]
+        if profile not in PROFILES:
+            raise RequestError(400, f"알 수 없는 프로필: {profile}")
+        # size 를 따로 주지 않으면 새 프로필의 기본 크기 사용
+        settings.update(profile=profile, sizes=())
+    try:
+        if 'quality' in query:
+            settings['quality'] = int(query['quality'][-1])
+            if not 1 <= settings['quality'] <= 100:
+                raise ValueError
+        if 'size' in query:
+            settings['sizes'] = tuple(int(value) for value in query['size'])
+            if min(settings['sizes']) < 1:
+                raise ValueError
+    except ValueError:
+        raise RequestError(400, "quality 는 1-100, size 는 1 이상의 정수여야 합니다")
+    return ConversionOptions(**settings)
+
+
+def archive_suffix(name, content_type):
+    """요청 본문의 아카이브 확장자 - 파일 이름이 우선, 없으면 Content-Type (모르면 None)"""
+    if name and archive_kind(name):
+        lower = name.lower()
+        return next(suffix for suffix in ('.zip',) + TAR_SUFFIXES if lower.endswith(suffix))
+    return ARCHIVE_TYPES.get(content_type)
+
+
+def archive_content_type(suffix):
+    """아카이브 확장자 → 응답 Content-Type (입력과 같은 형식)"""
+    if suffix == '.zip':
+        return 'application/zip'
+    return TAR_TYPES[TAR_COMPRESSION.get(suffix)]
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """변환 HTTP 서버 - 연결마다 요청 스레드, 변환은 공유 워커 풀"""
+
+    daemon_threads = True
+
+    def __init__(self, address, options, jobs=1, queue=None, max_body=DEFAULT_MAX_BODY,
+                 spool_directory=None, emit=None):
+        super().__init__(address, ConversionHandler)
+        self.options = options
+        self.jobs = max(1, jobs)
+        if queue is None:
+            queue = self.jobs * DEFAULT_QUEUE_PER_JOB
+        self.capacity = self.jobs + max(0, queue)
+        self.max_body = max_body
+        self.spool_directory = spool_directory
+        self.emit = emit or print_emit
+        self.executor = self.create_executor()
+        self.started = time.time()
+        # 처리 중인 요청 수와 누적 통계 (요청 스레드들이 함께 사용)
+        self.condition = threading.Condition()
+        self.active = 0
+        self.metrics = StageMetrics()
+
+    def create_executor(self):
+        """워커 1개면 스레드 하나, 아니면 프로세스 풀 (엔진과 같은 기준)"""
+        if self.jobs == 1:
+            return ThreadPoolExecutor(max_workers=1)
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=self.jobs, initializer=init_worker)
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def admit(self):
+        """요청 하나 받기 - 동시 요청 상한이면 False (503)"""
+        with self.condition:
+            if self.active >= self.capacity:
+                self.metrics.count('http_rejected')
+                return False
+            self.active += 1
+            return True
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def count(self, name):
+        with self.condition:
+            self.metrics.count(name)
+
+    def run(self, function, *args):
+        """워커 풀에서 변환 실행 - 결과의 마지막 값(인코딩 통계)은 서버 통계에 합침
+
+        워커가 죽는 등 풀에서 난 오류는 500 으로 돌려주고, 망가진 풀은 새로 만든다.
+        """
+        executor = self.executor
+        try:
+            result = executor.submit(function, *args).result()
+        except Exception as e:
+            self.emit("log", f"❌ 변환 워커 오류: {e!r}")
+            if isinstance(e, BrokenExecutor):
+                self.replace_executor(executor)
+            raise RequestError(500, f"변환 워커 오류: {e}")
+        encode_stats = result[-1]
+        with self.condition:
+            self.metrics.merge(encode_stats.metrics)
+            self.metrics.count('images', encode_stats.images)
+        return result
+
+    def replace_executor(self, broken):
+        """망가진 풀을 새 풀로 바꾸기 - 여러 요청이 동시에 실패해도 한 번만"""
+        with self.condition:
+            if self.executor is not broken:
+                return
+            self.executor = self.create_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.emit("log", "🔁 변환 워커 풀을 다시 시작했습니다")
+
+    def metrics_text(self):
+        """GET /metrics 응답 - 단계별 히스토그램, 카운터, 서버 상태 gauge"""
+        with self.condition:
+            state = {'uptime': round(time.time() - self.started, 3), 'jobs': self.jobs,
+                     'capacity': self.capacity, 'in_flight': self.active}
+            return prometheus_text(self.metrics, state)
+
+    def server_close(self):
+        """처리 중인 요청을 마무리하고 (최대 REQUEST_TIMEOUT 초) 워커 종료"""
+        super().server_close()
+        with self.condition:
+            self.condition.wait_for(lambda: self.active == 0, timeout=REQUEST_TIMEOUT)
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ConversionHandler(BaseHTTPRequestHandler):
+    """요청 하나 처리 - 본문 받기, 워커 풀에 변환 맡기기, 응답 보내기"""
+
+    server_version = "webp2jpg"
+    protocol_version = "HTTP/1.1"
+    timeout = REQUEST_TIMEOUT
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/metrics':
+            self.send_body(200, self.server.metrics_text().encode('utf-8'),
+                           'text/plain; version=0.0.4; charset=utf-8')
+        elif path == '/health':
+            self.send_json(200, {'status': 'ok', 'in_flight': self.server.active,
+                                 'capacity': self.server.capacity})
+        else:
+            self.send_json(404, {'error': f"없는 경로: {path}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        handlers = {'/convert': self.handle_convert, '/batch': self.handle_batch}
+        handler = handlers.get(url.path)
+        if handler is None:
+            self.discard_body()
+            self.send_json(404, {'error': f"없는 경로: {url.path}"})
+            return
+        if not self.server.admit():
+            self.discard_body()
+            self.send_json(503, {'error': "변환 요청이 많아서 지금은 받을 수 없습니다"},
+                           {'Retry-After': str(RETRY_AFTER)})
+            return
+        self.server.count('http_requests')
+        try:
+            handler(parse_qs(url.query))
+        except RequestError as e:
+            self.server.count('http_errors')
+            # 본문을 끝까지 읽지 않았을 수 있으므로 연결을 닫음
+            self.close_connection = True
+            self.send_json(e.status, {'error': str(e)})
+        finally:
+            self.server.release()
+
+    def handle_convert(self, query):
+        """POST /convert - WebP 본문 → JPG"""
+        options = request_options(self.server.options, query)
+        data = b''.join(self.iter_body(self.server.max_body))
+        jpg_data, error, _ = self.server.run(convert_request, data, options)
+        if error:
+            raise RequestError(422, f"변환 실패: {error}")
+        self.send_body(200, jpg_data, 'image/jpeg')
+
+    def handle_batch(self, query):
+        """POST /batch - ZIP / tar 본문 → 같은 형식의 아카이브 (멤버별 결과는 응답 헤더)"""
+        suffix = archive_suffix(query.get('name', [''])[-1], self.headers.get_content_type())
+        if suffix is None:
+            raise RequestError(415, "ZIP 또는 tar 본문이 필요합니다 (Content-Type 또는 ?name=파일 이름)")
+        options = request_options(self.server.options, query)
+
+        with tempfile.TemporaryDirectory(prefix='webp2jpg-', dir=self.server.spool_directory) as spool:
+            source = os.path.join(spool, 'input' + suffix)
+            target = os.path.join(spool, 'output' + suffix)
+            with open(source, 'wb') as f:
+                for chunk in self.iter_body(BODY_CHUNK):
+                    f.write(chunk)
+            job = (archive_kind(source), source, target, options)
+            success, error, members, _, _ = self.server.run(convert_job, job)
+            if not success:
+                raise RequestError(422, f"변환 실패: {error}")
+
+            converted = sum(1 for _, ok, _ in members if ok)
+            self.send_response(200)
+            self.send_header('Content-Type', archive_content_type(suffix))
+            self.send_header('Content-Length', str(os.path.getsize(target)))
+            self.send_header('X-Converted', str(converted))
+            self.send_header('X-Failed', str(len(members) - converted))
+            self.end_headers()
+            with open(target, 'rb') as f:
+                shutil.copyfileobj(f, self.wfile, BODY_CHUNK)
+
+    def discard_body(self):
+        """변환하지 않는 요청의 본문은 읽어서 버림 - 클라이언트가 보내는 도중에 연결을 끊으면
+        응답을 읽지 못하고 전송 오류가 남 (본문이 잘못되었으면 응답 후 연결을 닫음)"""
+        try:
+            for _ in self.iter_body(BODY_CHUNK):
+                pass
+        except RequestError:
+            self.close_connection = True
+
+    def iter_body(self, chunk_size):
+        """요청 본문을 chunk_size 이하로 나눠서 - Content-Length 또는 chunked, 상한을 넘으면 413"""
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = self.iter_chunked(chunk_size)
+        else:
+            try:
+                length = int(self.headers['Content-Length'])
+            except (TypeError, ValueError):
+                raise RequestError(411, "Content-Length 또는 chunked 본문이 필요합니다")
+            if length > self.server.max_body:
+                raise RequestError(413, f"본문이 상한({self.server.max_body}바이트)보다 큽니다")
+            chunks = self.iter_exact(length, chunk_size)
+
+        received = 0
+        for chunk in chunks:
+            received += len(chunk)
+            if received > self.server.max_body:
+                raise RequestError(413, f"본문이 상한({self.server.max_body}바이트)보다 큽니다")
+            yield chunk
+
+    def iter_exact(self, length, chunk_size):
+        """본문에서 정확히 length 바이트"""
+        while length:
+            chunk = self.rfile.read(min(length, chunk_size))
+            if not chunk:
+                raise RequestError(400, "본문이 중간에 끊겼습니다")
+            length -= len(chunk)
+            yield chunk
+
+    def iter_chunked(self, chunk_size):
+        """Transfer-Encoding: chunked 본문"""
+        while True:
+            line = self.rfile.readline(1024)
+            try:
+                size = int(line.split(b';')[0], 16)
+            except ValueError:
+                raise RequestError(400, "chunked 본문 형식이 잘못되었습니다")
+            if size == 0:
+                # 트레일러 건너뛰기
+                while self.rfile.readline(1024) not in (b'\r\n', b'\n', b''):
+                    pass
+                return
+            yield from self.iter_exact(size, chunk_size)
+            self.rfile.readline(1024)
+
+    def send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_body(status, body, 'application/json; charset=utf-8', headers)
+
+    def log_message(self, format, *args):
+        self.server.emit("log", f"🌐 {self.address_string()} - {format % args}")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Settings
+인코딩 프로필, 프레임 처리 방식, 기본 워커 수 - GUI 화면 구성에 필요한 설정 값
++ 감시 / 서버 모드 기본값 (CLI 도움말용)
+
+Pillow 나 변환 엔진을 불러오지 않으므로 GUI 가 첫 화면을 그리기 전에 import 해도 빠르다.
+(webp_converter, webp_watch, webp_server 에서도 그대로 다시 내보냄)
+"""
+
+import os
+
+# 애니메이션 WebP 프레임 처리 - first: 첫 프레임, all: 모든 프레임, sheet: 프레임 격자 한 장
+# (숫자를 지정하면 그 프레임만, 1부터)
+FRAME_MODES = ('first', 'all', 'sheet')
+
+
+# JPEG APP1 의 EXIF 머리 - WebP 의 EXIF 청크에는 없어서 JPEG 에 쓸 때 붙임
+EXIF_HEADER = b'Exif\x00\x00'
+
+
+class EncodeProfile:
+    """JPEG 인코딩 프로필"""
+
+    # 크로마 서브샘플링 표기 → Pillow 값
+    SUBSAMPLING = {'4:4:4': 0, '4:2:2': 1, '4:2:0': 2}
+
+    def __init__(self, name, quality, subsampling='4:2:0', progressive=False, optimize=False,
+                 keep_exif=False, keep_icc=False, max_size=None, description=''):
+        self.name = name
+        self.quality = quality
+        self.subsampling = subsampling
+        self.progressive = progressive
+        self.optimize = optimize            # 허프만 테이블 최적화
+        self.keep_exif = keep_exif
+        self.keep_icc = keep_icc
+        self.max_size = max_size            # 크기 설정이 없을 때 적용할 최대 크기
+        self.description = description
+
+    def save_kwargs(self, quality=None, exif=None, icc_profile=None):
+        """Image.save(..., 'JPEG', **kwargs) 인자"""
+        kwargs = {
+            'quality': quality or self.quality,
+            'subsampling': self.SUBSAMPLING[self.subsampling],
+            'progressive': self.progressive,
+            'optimize': self.optimize,
+        }
+        if self.keep_exif and exif:
+            kwargs['exif'] = exif if exif.startswith(EXIF_HEADER) else EXIF_HEADER + exif
+        if self.keep_icc and icc_profile:
+            kwargs['icc_profile'] = icc_profile
+        return kwargs
+
+
+# 인코딩 프로필 - standard 는 이전 버전과 같은 설정 (quality=95)
+PROFILES = {
+    'standard': EncodeProfile('standard', 95, description="기본 (이전 버전과 동일)"),
+    'archive': EncodeProfile('archive', 95, subsampling='4:4:4', optimize=True,
+                             keep_exif=True, keep_icc=True,
+                             description="보관용 - 고화질, 색 정보/메타데이터 유지"),
+    'web': EncodeProfile('web', 82, subsampling='4:2:0', progressive=True, optimize=True,
+                         keep_icc=True, description="웹/CDN 용 - 작은 용량, 점진적 로딩"),
+    'thumbnail': EncodeProfile('thumbnail', 75, subsampling='4:2:0', optimize=True,
+                               max_size=320, description="썸네일 - 최대 320px, 메타데이터 제거"),
+}
+
+DEFAULT_PROFILE = 'standard'
+
+
+# 감시 모드 기본값 - 파일이 그대로인지 확인하는 시간, 폴링 간격, 한 번에 변환하는 파일 수
+DEFAULT_SETTLE = 2.0
+DEFAULT_INTERVAL = 1.0
+DEFAULT_BATCH = 500
+
+# 서버 모드 기본값
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+# 워커 하나당 기다릴 수 있는 요청 수 (동시 요청 상한 = 워커 수 + 대기열)
+DEFAULT_QUEUE_PER_JOB = 2
+
+# 요청 본문 크기 상한
+DEFAULT_MAX_BODY = 1024 ** 3
+
+
+def default_jobs():
+    """기본 워커 수 (CPU 코어 수)"""
+    return os.cpu_count() or 1
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Startup Timer
+시작 시간 측정 - 프로그램 시작부터 각 단계 (import, 창 생성, 첫 화면, 사용 가능) 까지
+걸린 시간을 기록해서 --startup-time 리포트로 출력
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """시작 단계별 경과 시간 기록 (started 는 프로세스에서 가장 먼저 잰 perf_counter 값)"""
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.stages = {}
+        self.imports = {}
+
+    def mark(self, stage):
+        """단계 도달 시각 기록 - 같은 단계는 처음 도달한 시각만 남김"""
+        self.stages.setdefault(stage, time.perf_counter() - self.started)
+
+    @contextmanager
+    def measure(self, name):
+        """블록 실행 시간 (모듈 import 등) 기록"""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.imports[name] = time.perf_counter() - begin
+
+    def report(self):
+        """ms 단위 리포트 (단계는 시작 시점 기준 누적, import 는 각자 걸린 시간)"""
+        return {
+            "stages_ms": {stage: round(value * 1000, 1) for stage, value in self.stages.items()},
+            "imports_ms": {name: round(value * 1000, 1) for name, value in self.imports.items()},
+        }
+
+    def write(self, path):
+        """리포트를 JSON 으로 저장 ('-' 이면 표준 출력)"""
+        import json  # 측정할 때만 필요해서 여기서 불러옴
+        text = json.dumps(self.report(), ensure_ascii=False, indent=2)
+        if path == "-":
+            sys.stdout.write(text + "\n")
+            sys.stdout.flush()
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
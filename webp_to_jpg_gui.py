@@ -5,6 +5,11 @@ WebP to JPG Converter GUI
 GUI 버전의 WebP to JPG 변환기 - 드래그 앤 드롭 및 파일 선택 지원
 """
 
+import time
+
+# 시작 시간 측정 기준 - 다른 import 보다 먼저 재야 import 비용까지 --startup-time 에 잡힘
+STARTED = time.perf_counter()
+
 import os
 import sys
 import tkinter as tk
@@ -12,22 +17,49 @@ from tkinter import ttk, filedialog, messagebox
 import threading
 import queue
 from pathlib import Path
-import tempfile
-import zipfile
-from PIL import Image
+# 변환 엔진 (Pillow 등) 과 tkinterdnd2 는 창이 뜬 뒤에 불러옴 - 화면 구성에는 설정 값만 필요
+from webp_settings import DEFAULT_PROFILE, FRAME_MODES, PROFILES, default_jobs
+from webp_log import DEFAULT_LOG_LINES, LOG_FILE_NAME, LogBuffer
+from webp_progress import describe_rate
+from webp_scan import TAR_SUFFIXES
+from webp_startup import StartupTimer
+
+# 로그/진행률 화면 갱신 주기 (ms) - 변환 스레드는 이 주기와 상관없이 계속 진행
+UI_FRAME_MS = 100
+
+STARTUP = StartupTimer(STARTED)
+STARTUP.mark("imports")
 
-try:
-    from tkinterdnd2 import DND_FILES, TkinterDnD
-    DND_AVAILABLE = True
-    print("✅ tkinterdnd2 라이브러리가 로드되었습니다.")
-except ImportError:
-    DND_AVAILABLE = False
-    print("⚠️ 경고: tkinterdnd2가 설치되지 않아 드래그 앤 드롭 기능을 사용할 수 없습니다.")
-    print("설치하려면: pip install tkinterdnd2")
-except Exception as e:
-    DND_AVAILABLE = False
-    print(f"⚠️ 드래그 앤 드롭 라이브러리 로딩 오류: {e}")
-    print("대신 '파일 선택' 버튼을 사용해주세요.")
+
+def load_dnd(root):
+    """tkinterdnd2 로딩 후 root 에 tkdnd 연결 - (DND_FILES, 실패 이유) 반환
+
+    root 는 창을 먼저 띄우려고 일반 tk.Tk 로 만들기 때문에 TkinterDnD.Tk 를 쓸 수 없어서
+    tkinterdnd2 의 _require 로 연결한다. 이 함수가 없는 버전이면 Tcl 에서 tkdnd 패키지를
+    직접 불러온다 (시스템에 설치된 tkdnd 사용).
+    """
+    try:
+        with STARTUP.measure("tkinterdnd2"):
+            from tkinterdnd2 import DND_FILES, TkinterDnD
+            require = getattr(TkinterDnD, '_require', None)
+            if require is not None:
+                require(root)
+            else:
+                root.tk.call('package', 'require', 'tkdnd')
+        return DND_FILES, None
+    except ImportError:
+        return None, "tkinterdnd2가 설치되지 않았습니다 (pip install tkinterdnd2)"
+    except Exception as e:
+        return None, f"드래그 앤 드롭 라이브러리 로딩 오류: {e}"
+
+
+def preload_engine():
+    """변환 엔진을 미리 불러옴 (백그라운드 스레드) - 첫 변환 시작이 import 를 기다리지 않게"""
+    try:
+        with STARTUP.measure("webp_converter"):
+            import webp_converter  # noqa: F401
+    except Exception:
+        pass  # 변환을 시작할 때 다시 import 하면서 오류가 드러남
 
 
 class WebPConverterGUI:
@@ -45,11 +77,9 @@ class WebPConverterGUI:
             'entry_bg': '#001100',  # 입력창 배경
         }
         
-        # 메인 윈도우 설정
-        if DND_AVAILABLE:
-            self.root = TkinterDnD.Tk()
-        else:
-            self.root = tk.Tk()
+        # 메인 윈도우 설정 (드래그 앤 드롭은 첫 화면 뒤에 같은 root 에 연결)
+        self.root = tk.Tk()
+        STARTUP.mark("window")
         
         self.root.title("🔥 WebP >> JPG Converter [ By noName_Come] 🔥")
         self.root.geometry("850x900")  # 높이를 800에서 900으로 증가
@@ -68,15 +98,32 @@ class WebPConverterGUI:
         # 변수 초기화
         self.selected_files = []
         self.output_directory = tk.StringVar()
+        self.worker_count = tk.IntVar(value=default_jobs())
+        self.encode_profile = tk.StringVar(value=DEFAULT_PROFILE)
+        self.frame_mode = tk.StringVar(value=FRAME_MODES[0])
+        self.save_log = tk.BooleanVar(value=False)
         self.is_processing = False
         self.message_queue = queue.Queue()
+        # 로그는 링 버퍼에, 진행률은 최신 값만 두고 UI_FRAME_MS 마다 한꺼번에 그림
+        self.log_buffer = LogBuffer(DEFAULT_LOG_LINES)
+        self.latest_progress = None
+        self.latest_rate = None
+        # 실행 중인 변환 엔진 (중단 요청용)과 창 닫기 대기 여부
+        self.engine = None
+        self.closing = False
+        
+        # --startup-time 리포트 경로 (None 이면 측정 모드 아님)
+        self.startup_report = None
         
         # GUI 구성 요소 생성
         self.create_widgets()
-        self.setup_drag_drop()
+        STARTUP.mark("widgets")
+        
+        # 드래그 앤 드롭, 엔진 로딩은 창이 처음 그려진 뒤에 (<Map> 한 번만)
+        self.root.bind("<Map>", self.on_first_map)
         
         # 메시지 큐 처리를 위한 타이머 설정
-        self.root.after(100, self.process_queue)
+        self.root.after(UI_FRAME_MS, self.process_queue)
     
     def setup_hacker_style(self):
         """해커 스타일 테마 설정"""
@@ -156,14 +203,9 @@ class WebPConverterGUI:
         file_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 15))
         file_frame.columnconfigure(1, weight=1)
         
-        # 드래그 앤 드롭 영역
-        if DND_AVAILABLE:
-            drop_text = ">>> DRAG & DROP HERE <<<\n[ZIP, WEBP FILES + FOLDERS SUPPORTED]\n🎯 OR USE BUTTONS BELOW 🎯"
-        else:
-            drop_text = ">>> CLICK BUTTONS BELOW <<<\n[ZIP, WEBP FILES + FOLDERS SUPPORTED]\n🎯 DRAG & DROP NOT AVAILABLE 🎯"
-        
+        # 드래그 앤 드롭 영역 (안내 문구는 setup_drag_drop 에서 사용 가능 여부에 맞게 바꿈)
         self.drop_label = tk.Label(file_frame, 
-                                  text=drop_text,
+                                  text=">>> LOADING DRAG & DROP <<<\n[ZIP, WEBP FILES + FOLDERS SUPPORTED]\n🎯 OR USE BUTTONS BELOW 🎯",
                                   relief="solid", 
                                   borderwidth=2,
                                   bg=self.colors['entry_bg'],
@@ -267,6 +309,59 @@ class WebPConverterGUI:
                                   style="Hacker.TButton")
         output_button.grid(row=0, column=2)
         
+        # 병렬 변환 워커 수
+        workers_label = tk.Label(output_frame, text="WORKERS:", 
+                                bg=self.colors['bg'], fg=self.colors['fg'],
+                                font=("Consolas", 9, "bold"))
+        workers_label.grid(row=1, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        
+        self.workers_spinbox = tk.Spinbox(output_frame, from_=1, to=max(64, default_jobs()),
+                                         textvariable=self.worker_count, width=6,
+                                         bg=self.colors['entry_bg'],
+                                         fg=self.colors['fg'],
+                                         buttonbackground=self.colors['button_bg'],
+                                         insertbackground=self.colors['fg'],
+                                         font=("Consolas", 9))
+        self.workers_spinbox.grid(row=1, column=1, sticky=tk.W, pady=(10, 0))
+        
+        # JPG 인코딩 프로필
+        profile_label = tk.Label(output_frame, text="PROFILE:", 
+                                bg=self.colors['bg'], fg=self.colors['fg'],
+                                font=("Consolas", 9, "bold"))
+        profile_label.grid(row=2, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        
+        self.profile_combobox = ttk.Combobox(output_frame, textvariable=self.encode_profile,
+                                            values=list(PROFILES), state="readonly",
+                                            width=12, font=("Consolas", 9))
+        self.profile_combobox.grid(row=2, column=1, sticky=tk.W, pady=(10, 0))
+        self.profile_combobox.bind("<<ComboboxSelected>>", self.update_profile_hint)
+        
+        self.profile_hint = tk.Label(output_frame, text=PROFILES[DEFAULT_PROFILE].description,
+                                    bg=self.colors['bg'], fg=self.colors['fg'],
+                                    font=("Consolas", 8))
+        self.profile_hint.grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        
+        # 애니메이션 WebP 프레임 처리 (first: 첫 프레임, all: 모든 프레임, sheet: 격자 한 장)
+        frames_label = tk.Label(output_frame, text="FRAMES:", 
+                               bg=self.colors['bg'], fg=self.colors['fg'],
+                               font=("Consolas", 9, "bold"))
+        frames_label.grid(row=4, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        
+        self.frames_combobox = ttk.Combobox(output_frame, textvariable=self.frame_mode,
+                                           values=list(FRAME_MODES), state="readonly",
+                                           width=12, font=("Consolas", 9))
+        self.frames_combobox.grid(row=4, column=1, sticky=tk.W, pady=(10, 0))
+        
+        # 전체 로그를 출력 폴더의 파일에도 기록 (화면에는 최근 줄만 유지)
+        self.save_log_check = tk.Checkbutton(output_frame, variable=self.save_log,
+                                            text=f"SAVE LOG → {LOG_FILE_NAME}",
+                                            bg=self.colors['bg'], fg=self.colors['fg'],
+                                            selectcolor=self.colors['entry_bg'],
+                                            activebackground=self.colors['bg'],
+                                            activeforeground=self.colors['success'],
+                                            font=("Consolas", 9, "bold"))
+        self.save_log_check.grid(row=5, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+        
         # 기본 출력 폴더 설정 (현재 폴더)
         self.output_directory.set(str(Path.cwd()))
         
@@ -333,18 +428,43 @@ class WebPConverterGUI:
                              bd=1)
         status_bar.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(15, 0), ipady=5)
     
+    def on_first_map(self, event):
+        """창이 처음 화면에 나타남 - 한 프레임 그린 뒤 나머지 초기화"""
+        if event.widget is not self.root:
+            return
+        self.root.unbind("<Map>")
+        STARTUP.mark("first_frame")
+        self.root.after_idle(self.finish_startup)
+    
+    def finish_startup(self):
+        """첫 화면 이후 초기화 - 드래그 앤 드롭 연결, 변환 엔진 미리 불러오기"""
+        self.setup_drag_drop()
+        STARTUP.mark("dnd")
+        engine_thread = threading.Thread(target=preload_engine, daemon=True)
+        engine_thread.start()
+        STARTUP.mark("interactive")
+        if self.startup_report is not None:
+            # 측정 모드: 엔진 로딩까지 기다려 기록하고 종료
+            engine_thread.join()
+            STARTUP.mark("engine_ready")
+            STARTUP.write(self.startup_report)
+            self.root.destroy()
+    
     def setup_drag_drop(self):
         """드래그 앤 드롭 기능 설정"""
-        if DND_AVAILABLE:
-            try:
-                self.drop_label.drop_target_register(DND_FILES)
-                self.drop_label.dnd_bind('<<Drop>>', self.on_drop)
-                self.log_message("✅ 드래그 앤 드롭 기능이 활성화되었습니다.")
-            except Exception as e:
-                print(f"❌ 드래그 앤 드롭 설정 실패: {e}")
-                self.log_message("⚠️ 드래그 앤 드롭 설정에 실패했습니다. '파일 선택' 버튼을 사용해주세요.")
-        else:
-            self.log_message("📌 참고: 드래그 앤 드롭을 사용하려면 'pip install tkinterdnd2'를 실행하세요.")
+        dnd_files, reason = load_dnd(self.root)
+        if dnd_files is None:
+            self.drop_label.config(text=">>> CLICK BUTTONS BELOW <<<\n[ZIP, WEBP FILES + FOLDERS SUPPORTED]\n🎯 DRAG & DROP NOT AVAILABLE 🎯")
+            self.log_message(f"📌 참고: {reason}")
+            self.log_message("📌 드래그 앤 드롭 대신 '파일 선택' 버튼을 사용해주세요.")
+            return
+        try:
+            self.drop_label.drop_target_register(dnd_files)
+            self.drop_label.dnd_bind('<<Drop>>', self.on_drop)
+            self.drop_label.config(text=">>> DRAG & DROP HERE <<<\n[ZIP, WEBP FILES + FOLDERS SUPPORTED]\n🎯 OR USE BUTTONS BELOW 🎯")
+            self.log_message("✅ 드래그 앤 드롭 기능이 활성화되었습니다.")
+        except Exception as e:
+            self.log_message(f"⚠️ 드래그 앤 드롭 설정에 실패했습니다 ({e}). '파일 선택' 버튼을 사용해주세요.")
     
     def on_drop(self, event):
         """드래그 앤 드롭 이벤트 처리"""
@@ -390,7 +510,7 @@ class WebPConverterGUI:
                         # 폴더이거나 지원하는 파일 확장자인 경우
                         if path_obj.is_dir():
                             valid_items.append(clean_path)
-                        elif clean_path.lower().endswith(('.zip', '.webp')):
+                        elif clean_path.lower().endswith(('.zip', '.webp') + TAR_SUFFIXES):
                             valid_items.append(clean_path)
                         elif clean_path.lower().endswith(('.jpg', '.jpeg')):
                             skipped_items.append((clean_path, 'JPG'))
@@ -463,8 +583,9 @@ class WebPConverterGUI:
     def select_files(self):
         """파일 선택 대화상자"""
         files = filedialog.askopenfilenames(
-            title="ZIP 또는 WebP 파일 선택",
-            filetypes=[("Supported files", "*.zip;*.webp"), ("ZIP files", "*.zip"), ("WebP files", "*.webp"), ("All files", "*.*")]
+            title="ZIP, tar 또는 WebP 파일 선택",
+            filetypes=[("Supported files", "*.zip;*.webp;*.tar;*.tar.gz;*.tgz;*.tar.bz2;*.tar.xz"), ("ZIP files", "*.zip"),
+                       ("tar files", "*.tar;*.tar.gz;*.tgz;*.tar.bz2;*.tar.xz"), ("WebP files", "*.webp"), ("All files", "*.*")]
         )
         
         if files:
@@ -476,7 +597,7 @@ class WebPConverterGUI:
             for file_path in files:
                 if file_path not in existing_files:
                     # 파일 타입 검증
-                    if file_path.lower().endswith(('.zip', '.webp')):
+                    if file_path.lower().endswith(('.zip', '.webp') + TAR_SUFFIXES):
                         self.selected_files.append(file_path)
                         new_files.append(file_path)
                     elif file_path.lower().endswith(('.jpg', '.jpeg')):
@@ -571,7 +692,7 @@ class WebPConverterGUI:
                 item_path = Path(file_path)
                 item_type = "📁" if item_path.is_dir() else "📄"
                 # 파일 확장자에 따른 추가 아이콘
-                if file_path.lower().endswith('.zip'):
+                if file_path.lower().endswith(('.zip',) + TAR_SUFFIXES):
                     item_type = "📦"
                 elif file_path.lower().endswith('.webp'):
                     item_type = "🖼️"
@@ -586,10 +707,21 @@ class WebPConverterGUI:
             )
     
     def log_message(self, message):
-        """로그 메시지 출력"""
-        self.log_text.insert(tk.END, message + "\n")
+        """로그 메시지 출력 (다음 화면 갱신 때 그려짐)"""
+        self.log_buffer.append(message)
+
+    def flush_log(self):
+        """쌓인 로그를 한 번에 그리고 화면에는 최근 DEFAULT_LOG_LINES 줄만 유지"""
+        lines, dropped = self.log_buffer.drain()
+        if not lines:
+            return
+        if dropped:
+            lines.insert(0, f"... {dropped}줄 생략 ...")
+        self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+        line_count = int(self.log_text.index("end-1c").split(".")[0])
+        if line_count > DEFAULT_LOG_LINES:
+            self.log_text.delete("1.0", f"{line_count - DEFAULT_LOG_LINES}.0")
         self.log_text.see(tk.END)
-        self.root.update_idletasks()
     
     def start_conversion(self):
         """변환 시작"""
@@ -610,14 +742,35 @@ class WebPConverterGUI:
                 messagebox.showerror("오류", f"출력 폴더를 생성할 수 없습니다: {e}")
                 return
         
-        # 변환 시작
+        # 워커 수 확인 (잘못된 값이면 CPU 코어 수 사용)
+        try:
+            self.conversion_jobs = max(1, self.worker_count.get())
+        except tk.TclError:
+            self.conversion_jobs = default_jobs()
+            self.worker_count.set(self.conversion_jobs)
+        # 보통은 finish_startup 에서 미리 불러와 둔 모듈을 그대로 사용
+        from webp_converter import ConversionEngine, ConversionOptions
+        self.conversion_options = ConversionOptions(profile=self.encode_profile.get(),
+                                                    frames=self.frame_mode.get())
+        self.engine = ConversionEngine(output_dir, emit=self.post_message,
+                                       jobs=self.conversion_jobs,
+                                       options=self.conversion_options)
+        
+        # 변환 시작 - 실행 중에는 버튼이 중단 버튼이 됨
         self.is_processing = True
-        self.convert_button.config(state="disabled", text="🔄 [PROCESSING] CONVERSION IN PROGRESS 🔄")
+        self.convert_button.config(text="⏹️ [ABORT] STOP CONVERSION ⏹️",
+                                   command=self.cancel_conversion)
         self.status_var.set(">>> STATUS: CONVERSION IN PROGRESS <<<")
         self.progress_var.set(0)
         
         # 로그 초기화
         self.log_text.delete(1.0, tk.END)
+        self.log_buffer.clear()
+        if self.save_log.get():
+            try:
+                self.log_buffer.open_spill(output_dir / LOG_FILE_NAME)
+            except OSError as e:
+                self.log_message(f"⚠️ 로그 파일을 열 수 없습니다: {e}")
         self.log_message(">>> OPERATION INITIATED <<<")
         self.log_message(">>> LOADING CONVERSION PROTOCOLS <<<")
         self.log_message(">>> SCANNING TARGET FILES <<<")
@@ -626,54 +779,40 @@ class WebPConverterGUI:
         thread = threading.Thread(target=self.conversion_worker, daemon=True)
         thread.start()
     
+    def cancel_conversion(self):
+        """변환 중단 - 실행 중인 작업의 출력까지 기록하고 멈춤 (다시 실행하면 이어서 변환)"""
+        if not self.is_processing or self.engine is None:
+            return
+        self.engine.cancel()
+        self.convert_button.config(state="disabled", text="🔄 [ABORTING] FINISHING RUNNING JOBS 🔄")
+        self.status_var.set(">>> STATUS: STOPPING - FINISHING RUNNING JOBS <<<")
+
+    def update_profile_hint(self, event=None):
+        """선택한 프로필 설명 표시"""
+        self.profile_hint.config(text=PROFILES[self.encode_profile.get()].description)
+
+    def post_message(self, message_type, data):
+        """변환 엔진 메시지 전달 - 로그는 링 버퍼, 진행률은 최신 값만 (UI 를 기다리지 않음)"""
+        if message_type == "log":
+            self.log_buffer.append(data)
+        elif message_type == "progress":
+            self.latest_progress = data
+        elif message_type == "rate":
+            self.latest_rate = data
+        else:
+            self.message_queue.put((message_type, data))
+
     def conversion_worker(self):
         """백그라운드에서 변환 작업 수행"""
         try:
-            total_files = len(self.selected_files)
-            successful_count = 0
-            failed_files = []
-            
-            for i, file_path in enumerate(self.selected_files):
-                # 메시지 큐를 통한 UI 업데이트
-                self.message_queue.put(("progress", (i / total_files) * 100))
-                self.message_queue.put(("log", f"\n[{i+1}/{total_files}] 처리 중: {Path(file_path).name}"))
-                
-                try:
-                    # 파일/폴더 타입에 따라 처리 방법 결정
-                    if Path(file_path).is_dir():
-                        success = self.process_folder(file_path)
-                    elif file_path.lower().endswith('.zip'):
-                        success = self.process_zip_file(file_path)
-                    elif file_path.lower().endswith('.webp'):
-                        success = self.process_webp_file(file_path)
-                    else:
-                        success = False
-                        
-                    if success:
-                        successful_count += 1
-                        self.message_queue.put(("log", f"✅ 완료: {Path(file_path).name}"))
-                    else:
-                        failed_files.append(file_path)
-                        self.message_queue.put(("log", f"❌ 실패: {Path(file_path).name}"))
-                        
-                except Exception as e:
-                    failed_files.append(file_path)
-                    self.message_queue.put(("log", f"❌ 오류: {Path(file_path).name} - {str(e)}"))
-            
-            # 결과 요약
-            self.message_queue.put(("progress", 100))
-            self.message_queue.put(("log", f"\n=== 변환 완료 ==="))
-            self.message_queue.put(("log", f"✅ 성공: {successful_count}개"))
-            self.message_queue.put(("log", f"❌ 실패: {len(failed_files)}개"))
-            self.message_queue.put(("log", f"📁 총 파일: {total_files}개"))
-            
-            if failed_files:
-                self.message_queue.put(("log", f"\n실패한 파일들:"))
-                for failed_file in failed_files:
-                    self.message_queue.put(("log", f"  - {Path(failed_file).name}"))
+            summary = self.engine.convert_items(self.selected_files)
+            successful_count = summary.successful_count
+            failed_files = summary.failed_files
             
             # 완료 상태 업데이트
-            if successful_count > 0:
+            if summary.cancelled:
+                self.message_queue.put(("status", "중단됨: 다시 실행하면 이어서 변환합니다"))
+            elif successful_count > 0:
                 self.message_queue.put(("status", f"완료: {successful_count}개 파일 변환됨"))
                 if failed_files:
                     self.message_queue.put(("show_warning", f"{successful_count}개 파일이 변환되었지만, {len(failed_files)}개 파일에서 오류가 발생했습니다."))
@@ -690,197 +829,25 @@ class WebPConverterGUI:
         
         finally:
             # UI 상태 복원
+            self.log_buffer.close_spill()
             self.message_queue.put(("finish", None))
     
-    def process_folder(self, folder_path):
-        """폴더 내 WebP 파일들 처리 (폴더 구조 유지)"""
-        folder = Path(folder_path)
-        output_dir = Path(self.output_directory.get())
-        
-        # 출력 폴더에 원본 폴더 이름으로 새 폴더 생성
-        output_folder = output_dir / folder.name
-        
-        try:
-            self.message_queue.put(("log", "  📁 폴더 스캔 중..."))
-            
-            # 폴더 내 모든 이미지 파일 찾기 (하위 폴더 포함)
-            webp_files = list(folder.rglob("*.webp"))
-            jpg_files = list(folder.rglob("*.jpg")) + list(folder.rglob("*.jpeg"))
-            png_files = list(folder.rglob("*.png"))
-            
-            if not webp_files:
-                self.message_queue.put(("log", "  ⚠️ 폴더 내에 WebP 파일을 찾을 수 없습니다"))
-                return False
-            
-            self.message_queue.put(("log", f"  📄 {len(webp_files)}개의 WebP 파일 발견"))
-            
-            # JPG/PNG 파일에 대한 패스 메시지
-            if jpg_files:
-                self.message_queue.put(("log", f"  📸 {len(jpg_files)}개의 JPG 파일 - 변환 패스"))
-            if png_files:
-                self.message_queue.put(("log", f"  🖼️ {len(png_files)}개의 PNG 파일 - 변환 패스"))
-            
-            self.message_queue.put(("log", f"  📂 출력 폴더: {output_folder.name}"))
-            
-            converted_count = 0
-            failed_count = 0
-            
-            for webp_file in webp_files:
-                try:
-                    # 원본 폴더 기준 상대 경로 유지해서 출력 경로 생성
-                    relative_path = webp_file.relative_to(folder)
-                    output_path = output_folder / relative_path.with_suffix('.jpg')
-                    
-                    # 출력 디렉토리 생성 (하위 폴더 구조 유지)
-                    output_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # WebP를 JPG로 변환
-                    with Image.open(webp_file) as img:
-                        if img.mode in ('RGBA', 'LA'):
-                            background = Image.new('RGB', img.size, (255, 255, 255))
-                            if img.mode == 'RGBA':
-                                background.paste(img, mask=img.split()[-1])
-                            else:
-                                background.paste(img)
-                            img = background
-                        elif img.mode != 'RGB':
-                            img = img.convert('RGB')
-                        
-                        img.save(output_path, 'JPEG', quality=95)
-                    
-                    converted_count += 1
-                    # 상대 경로로 표시해서 폴더 구조 확인 가능
-                    self.message_queue.put(("log", f"    ✅ {relative_path} → {relative_path.with_suffix('.jpg')}"))
-                    
-                except Exception as e:
-                    failed_count += 1
-                    self.message_queue.put(("log", f"    ❌ {relative_path} 변환 실패: {str(e)}"))
-            
-            if converted_count == 0:
-                return False
-            
-            self.message_queue.put(("log", f"  ✨ 폴더 처리 완료: {converted_count}개 성공, {failed_count}개 실패"))
-            self.message_queue.put(("log", f"  📂 결과 저장됨: {output_folder}"))
-            return True
-            
-        except Exception as e:
-            self.message_queue.put(("log", f"  💥 폴더 처리 중 오류: {str(e)}"))
-            return False
-
-    def process_webp_file(self, input_webp_path):
-        """단일 WebP 파일 처리"""
-        input_path = Path(input_webp_path)
-        output_dir = Path(self.output_directory.get())
-        output_path = output_dir / input_path.with_suffix('.jpg').name
-        
-        try:
-            self.message_queue.put(("log", "  🖼️ WebP 이미지 로딩 중..."))
-            
-            # WebP를 JPG로 변환
-            with Image.open(input_webp_path) as img:
-                if img.mode in ('RGBA', 'LA'):
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'RGBA':
-                        background.paste(img, mask=img.split()[-1])
-                    else:
-                        background.paste(img)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                self.message_queue.put(("log", "  ✨ JPG로 변환 중..."))
-                img.save(output_path, 'JPEG', quality=95)
-            
-            self.message_queue.put(("log", f"  💾 저장 완료: {output_path.name}"))
-            return True
-            
-        except Exception as e:
-            self.message_queue.put(("log", f"  💥 처리 중 오류: {str(e)}"))
-            return False
-    
-    def process_zip_file(self, input_zip_path):
-        """단일 ZIP 파일 처리"""
-        input_path = Path(input_zip_path)
-        output_path = Path(self.output_directory.get()) / input_path.name
-        
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                extract_dir = Path(temp_dir) / "extracted"
-                extract_dir.mkdir()
-                
-                # 1. ZIP 파일 압축 해제
-                self.message_queue.put(("log", "  📦 압축 해제 중..."))
-                with zipfile.ZipFile(input_zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_dir)
-                
-                # 2. 이미지 파일 찾기 및 변환
-                webp_files = list(extract_dir.rglob("*.webp"))
-                jpg_files = list(extract_dir.rglob("*.jpg")) + list(extract_dir.rglob("*.jpeg"))
-                png_files = list(extract_dir.rglob("*.png"))
-                
-                if not webp_files:
-                    self.message_queue.put(("log", "  ⚠️ WebP 파일을 찾을 수 없습니다"))
-                    return False
-                
-                self.message_queue.put(("log", f"  📁 {len(webp_files)}개의 WebP 파일 발견"))
-                
-                # JPG/PNG 파일에 대한 패스 메시지
-                if jpg_files:
-                    self.message_queue.put(("log", f"  📸 {len(jpg_files)}개의 JPG 파일 - 변환 패스"))
-                if png_files:
-                    self.message_queue.put(("log", f"  🖼️ {len(png_files)}개의 PNG 파일 - 변환 패스"))
-                
-                converted_count = 0
-                for webp_file in webp_files:
-                    try:
-                        # WebP를 JPG로 변환
-                        with Image.open(webp_file) as img:
-                            if img.mode in ('RGBA', 'LA'):
-                                background = Image.new('RGB', img.size, (255, 255, 255))
-                                if img.mode == 'RGBA':
-                                    background.paste(img, mask=img.split()[-1])
-                                else:
-                                    background.paste(img)
-                                img = background
-                            elif img.mode != 'RGB':
-                                img = img.convert('RGB')
-                            
-                            jpg_path = webp_file.with_suffix('.jpg')
-                            img.save(jpg_path, 'JPEG', quality=95)
-                        
-                        webp_file.unlink()
-                        converted_count += 1
-                        
-                    except Exception as e:
-                        self.message_queue.put(("log", f"    ❌ {webp_file.name} 변환 실패: {str(e)}"))
-                
-                if converted_count == 0:
-                    return False
-                
-                self.message_queue.put(("log", f"  ✨ {converted_count}개 파일 변환 완료"))
-                
-                # 3. 재압축
-                self.message_queue.put(("log", "  📦 재압축 중..."))
-                with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for file_path in extract_dir.rglob("*"):
-                        if file_path.is_file():
-                            arcname = file_path.relative_to(extract_dir)
-                            zipf.write(file_path, arcname)
-                
-                return True
-                
-        except Exception as e:
-            self.message_queue.put(("log", f"  💥 처리 중 오류: {str(e)}"))
-            return False
-    
     def process_queue(self):
-        """메시지 큐 처리"""
+        """메시지 큐 처리 - 로그와 진행률은 화면 갱신 주기마다 한 번씩만 그림"""
+        self.flush_log()
+        progress, self.latest_progress = self.latest_progress, None
+        if progress is not None:
+            self.progress_var.set(progress)
+        rate, self.latest_rate = self.latest_rate, None
+        if rate is not None:
+            self.status_var.set(f">>> {describe_rate(rate)} <<<")
         try:
             while True:
                 message_type, data = self.message_queue.get_nowait()
                 
                 if message_type == "log":
                     self.log_message(data)
+                    self.flush_log()
                 elif message_type == "progress":
                     self.progress_var.set(data)
                 elif message_type == "status":
@@ -893,13 +860,18 @@ class WebPConverterGUI:
                     messagebox.showerror("오류", data)
                 elif message_type == "finish":
                     self.is_processing = False
-                    self.convert_button.config(state="normal", text="🚀 [EXECUTE] START CONVERSION 🚀")
+                    self.engine = None
+                    self.convert_button.config(state="normal", text="🚀 [EXECUTE] START CONVERSION 🚀",
+                                               command=self.start_conversion)
+                    if self.closing:
+                        self.root.destroy()
+                        return
                     
         except queue.Empty:
             pass
         
         # 다음 처리를 위해 타이머 재설정
-        self.root.after(100, self.process_queue)
+        self.root.after(UI_FRAME_MS, self.process_queue)
     
     def run(self):
         """GUI 실행"""
@@ -930,24 +902,36 @@ Awaiting user input..."""
     def on_closing(self):
         """창 닫기 이벤트"""
         if self.is_processing:
-            if messagebox.askokcancel("종료", "변환 작업이 진행 중입니다. 정말 종료하시겠습니까?"):
-                self.root.destroy()
+            if messagebox.askokcancel("종료", "변환 작업이 진행 중입니다. 정말 종료하시겠습니까?\n"
+                                              "(실행 중인 작업을 마무리한 뒤 닫히고, 다시 실행하면 이어서 변환합니다)"):
+                # 쓰다 만 출력이 남지 않도록 변환 스레드가 끝난 뒤 닫음 (finish 메시지)
+                self.closing = True
+                self.cancel_conversion()
         else:
             self.root.destroy()
 
 
+def startup_report_path(argv):
+    """--startup-time [FILE] 옵션 확인 (argparse 없이) - 리포트 경로, 없으면 None ('-' 는 표준 출력)"""
+    if "--startup-time" not in argv:
+        return None
+    index = argv.index("--startup-time")
+    if index + 1 < len(argv) and not argv[index + 1].startswith("-"):
+        return argv[index + 1]
+    return "-"
+
+
 def main():
     """메인 함수"""
-    # DnD 라이브러리 확인
-    if not DND_AVAILABLE:
-        print("\n📌 참고: 더 나은 사용자 경험을 위해 다음 명령으로 드래그 앤 드롭 라이브러리를 설치하세요:")
-        print("pip install tkinterdnd2\n")
-    
     # GUI 실행
     app = WebPConverterGUI()
+    app.startup_report = startup_report_path(sys.argv[1:])
     app.run()
 
 
 if __name__ == "__main__":
+    # PyInstaller 로 묶었을 때 워커 프로세스용 - 창을 만들기 전에 호출
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
 
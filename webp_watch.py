@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP to JPG Watch Folder
+감시 폴더에 들어오는 WebP / ZIP / tar 파일을 계속 변환하는 상주 모드
+
+Linux 에서는 inotify 로 변경 알림을 받고, 그 밖의 환경(또는 --polling)에서는 주기적으로
+폴더를 다시 훑는다. 파일은 크기와 수정 시간이 settle 초 동안 바뀌지 않아야 (복사가 끝나야)
+변환하고, 한 번에 batch 개까지만 변환 엔진에 넘긴다. 변환하는 동안 쌓인 알림은 커널 대기열에
+남아 있다가 다음 차례에 처리되고, 대기열이 넘치면 폴더 전체를 다시 훑는다.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import shutil
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+from webp_scan import TAR_SUFFIXES, scan_tree
+from webp_settings import DEFAULT_BATCH, DEFAULT_INTERVAL, DEFAULT_SETTLE
+
+# 변환 대상 확장자
+WATCH_EXTENSIONS = ('.webp', '.zip') + TAR_SUFFIXES
+
+# 복사 중인 파일로 보고 무시하는 확장자
+PARTIAL_EXTENSIONS = ('.tmp', '.part', '.crdownload', '.partial')
+
+# inotify 이벤트 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def is_watch_target(path):
+    """변환할 파일인지 (숨김 파일, 복사 중인 임시 파일 제외)"""
+    name = os.path.basename(path)
+    lower = name.lower()
+    return (not name.startswith('.') and lower.endswith(WATCH_EXTENSIONS)
+            and not lower.endswith(PARTIAL_EXTENSIONS))
+
+
+def file_signature(path):
+    """(크기, 수정 시간) - 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def iter_targets(directory):
+    """폴더(하위 폴더 포함)의 변환 대상 파일 경로"""
+    for path, kind in scan_tree(directory):
+        if kind in ('webp', 'zip', 'tar') and is_watch_target(path):
+            yield path
+
+
+class PollingWatcher:
+    """주기적으로 폴더를 다시 훑어서 새로 생기거나 바뀐 파일 찾기"""
+
+    name = "폴링"
+
+    def __init__(self, directories, interval=DEFAULT_INTERVAL):
+        self.directories = directories
+        self.interval = interval
+        self.snapshot = {}
+
+    def rescan(self):
+        """전체 다시 훑기 - 지난번과 달라진 파일 경로"""
+        snapshot = {}
+        for directory in self.directories:
+            for path in iter_targets(directory):
+                snapshot[path] = file_signature(path)
+        changed = {path for path, signature in snapshot.items()
+                   if self.snapshot.get(path) != signature}
+        self.snapshot = snapshot
+        return changed
+
+    def poll(self, timeout, stop_event):
+        """timeout 초 기다린 뒤 바뀐 파일 경로"""
+        stop_event.wait(min(timeout, self.interval))
+        return self.rescan()
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify 로 바뀐 파일 알림 받기 (하위 폴더 포함)"""
+
+    name = "inotify"
+
+    def __init__(self, directories):
+        self.directories = directories
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self.watches = {}       # 감시 번호 → 폴더 경로
+        for directory in directories:
+            self.add_tree(directory)
+
+    def add_watch(self, directory):
+        """폴더 하나 감시 시작"""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch 실패: {directory}")
+        self.watches[wd] = directory
+
+    def add_tree(self, directory):
+        """폴더와 하위 폴더 감시 시작 - 감시 전에 이미 있던 대상 파일 경로 반환"""
+        found = set()
+        for root, directories, files in os.walk(directory):
+            self.add_watch(root)
+            found.update(os.path.join(root, name) for name in files if is_watch_target(name))
+        return found
+
+    def rescan(self):
+        """전체 다시 훑기 (시작할 때, 알림 대기열이 넘쳤을 때)"""
+        found = set()
+        for directory in self.directories:
+            found |= self.add_tree(directory)
+        return found
+
+    def poll(self, timeout, stop_event):
+        """알림이 올 때까지 최대 timeout 초 기다린 뒤 바뀐 파일 경로"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # 변환하는 동안 알림이 너무 많이 쌓임 - 전체를 다시 훑음
+                    changed |= self.rescan()
+                    continue
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+                directory = self.watches.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed |= self.add_tree(path)
+                elif is_watch_target(name):
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(directories, polling=False, interval=DEFAULT_INTERVAL):
+    """inotify 를 쓸 수 있으면 InotifyWatcher, 아니면 PollingWatcher"""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directories, interval)
+
+
+class FolderWatch:
+    """감시 폴더 → 변환 엔진 상주 루프
+
+    convert(경로 목록, 경로 → 상대 폴더)는 준비된 파일을 한 번에 변환하고 (출력은 감시 폴더
+    기준 상대 폴더 구조대로) 실패한 경로 목록을 반환한다. exclude 폴더(출력, 처리 완료 폴더) 안의 파일은 무시한다.
+    (감시 폴더가 exclude 폴더 안에 있으면 그 폴더는 제외하지 않음)
+    """
+
+    def __init__(self, directories, convert, emit, settle=DEFAULT_SETTLE,
+                 interval=DEFAULT_INTERVAL, batch=DEFAULT_BATCH, polling=False,
+                 processed_directory=None, exclude=()):
+        self.directories = [os.path.abspath(directory) for directory in directories]
+        # 감시 폴더를 안에 품은 폴더 (기본 출력 폴더 '.' 등) 는 제외하지 않음 - 전부 무시하게 됨
+        self.exclude = [prefix for prefix in (os.path.join(os.path.abspath(directory), '')
+                                              for directory in exclude)
+                        if not any(os.path.join(watched, '').startswith(prefix)
+                                   for watched in self.directories)]
+        self.convert = convert
+        self.emit = emit
+        self.settle = settle
+        self.interval = interval
+        self.batch = max(1, batch)
+        self.polling = polling
+        self.processed_directory = processed_directory
+        self.candidates = {}    # 경로 → (크기/수정 시간, 마지막으로 바뀐 시각)
+        self.done = {}          # 경로 → 변환한 파일의 크기/수정 시간 (같으면 다시 변환하지 않음)
+        self.stop_event = threading.Event()
+
+    def log(self, message):
+        self.emit("log", message)
+
+    def stop(self):
+        """상주 루프 종료 요청 (다른 스레드/시그널 핸들러에서 호출)"""
+        self.stop_event.set()
+
+    def touch(self, paths):
+        """바뀐 파일을 후보에 추가 - 크기/수정 시간이 settle 초 동안 그대로여야 변환"""
+        now = time.monotonic()
+        for path in paths:
+            if any(path.startswith(directory) for directory in self.exclude):
+                continue
+            signature = file_signature(path)
+            if signature is None:
+                # 지워졌거나 옮겨진 파일
+                self.candidates.pop(path, None)
+                self.done.pop(path, None)
+                continue
+            if self.done.get(path) == signature:
+                continue
+            previous = self.candidates.get(path)
+            if previous is None or previous[0] != signature:
+                self.candidates[path] = (signature, now)
+
+    def settled(self):
+        """settle 초 동안 그대로인 후보 (발견 순서대로 batch 개까지)"""
+        now = time.monotonic()
+        ready = []
+        for path, (signature, changed) in list(self.candidates.items()):
+            if now - changed < self.settle:
+                continue
+            current = file_signature(path)
+            if current != signature:
+                # 아직 복사 중 - 다시 기다림
+                self.touch([path])
+                continue
+            ready.append(path)
+            if len(ready) >= self.batch:
+                break
+        return ready
+
+    def run(self):
+        """stop() 할 때까지 감시하면서 변환"""
+        watcher = create_watcher(self.directories, self.polling, self.interval)
+        self.log(f"👀 감시 시작 ({watcher.name}): " + ", ".join(self.directories))
+        self.log(f"   파일이 {self.settle:g}초 동안 그대로면 변환, 한 번에 최대 {self.batch}개")
+        try:
+            self.touch(watcher.rescan())
+            while not self.stop_event.is_set():
+                # 후보가 있으면 settle 이 지날 때쯤 다시 확인
+                timeout = min(self.interval, self.settle) if self.candidates else self.interval
+                self.touch(watcher.poll(timeout, self.stop_event))
+                ready = self.settled()
+                if ready and not self.stop_event.is_set():
+                    self.convert_batch(ready)
+        finally:
+            watcher.close()
+            self.log("👋 감시 종료")
+
+    def convert_batch(self, paths):
+        """준비된 파일 변환 - 성공한 파일은 기록 (processed_directory 가 있으면 옮김)"""
+        signatures = {path: self.candidates.pop(path)[0] for path in paths}
+        waiting = len(self.candidates)
+        self.log(f"\n📥 새 파일 {len(paths)}개 변환" + (f" (대기 {waiting}개)" if waiting else ""))
+        # 하위 폴더가 달라도 한 번에 넘겨서 같은 워커들이 함께 변환
+        relatives = {path: self.relative_parent(path) for path in paths}
+        failed = set(self.convert(paths, relatives))
+        for path in paths:
+            if path in failed:
+                # 같은 파일은 바뀌기 전까지 다시 시도하지 않음 (실패 로그는 엔진이 출력)
+                self.done[path] = signatures[path]
+                continue
+            if self.processed_directory is not None:
+                self.move_processed(path)
+            else:
+                self.done[path] = signatures[path]
+
+    def move_processed(self, path):
+        """변환한 원본을 처리 완료 폴더로 옮기기 (감시 폴더 기준 상대 경로 유지)"""
+        root = next((directory for directory in self.directories
+                     if path.startswith(directory + os.sep)), os.path.dirname(path))
+        target = Path(self.processed_directory) / os.path.relpath(path, root)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(path, target)
+        except OSError as e:
+            self.log(f"⚠️ 원본을 옮기지 못했습니다: {path} - {e}")
+            self.done[path] = file_signature(path)
+
+    def relative_parent(self, path):
+        """감시 폴더 기준 상위 폴더 (출력 폴더 구조 유지용) - 최상위면 ''"""
+        for directory in self.directories:
+            if path.startswith(directory + os.sep):
+                relative = os.path.relpath(os.path.dirname(path), directory)
+                return '' if relative == '.' else relative
+        return ''
@@ -13,6 +13,7 @@ echo ✅ 정리 완료
 echo.
 echo [2/4] PyInstaller로 EXE 빌드 중...
 echo 📦 포함 라이브러리: Pillow, tkinterdnd2, pathlib, tempfile, zipfile
+echo ⚡ 제외 라이브러리: numpy (GUI 에서 쓰지 않음 - 단일 파일 압축 해제 시간 단축)
 echo 🎨 아이콘: icon.ico
 echo 🚀 모드: 단일 파일, 창 모드, 콘솔 숨김
 
@@ -27,6 +28,8 @@ pyinstaller --onefile --windowed --noconsole ^
     --hidden-import zipfile ^
     --hidden-import threading ^
     --hidden-import queue ^
+    --hidden-import webp_converter ^
+    --exclude-module numpy ^
     --add-data "icon.ico;." ^
     webp_to_jpg_gui.py
 